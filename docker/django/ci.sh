@@ -65,7 +65,9 @@ run_ci () {
   python manage.py lintmigrations
 
   # Check production settings for gunicorn:
-  gunicorn --check-config --config python:docker.django.gunicorn_config server.wsgi
+  gunicorn --check-config --config python:docker.django.gunicorn_config
+  GUNICORN_ASGI=1 \
+    gunicorn --check-config --config python:docker.django.gunicorn_config
 
   # Generate a report about the state of dependencies' safety,
   # it is not blocking, because there are too many false positives:
@@ -34,7 +34,7 @@ find /var/www/django/static -type f \
 
 # Start gunicorn:
 # Docs: http://docs.gunicorn.org/en/stable/settings.html
-# Make sure it is in sync with `django/ci.sh` check:
+# Make sure it is in sync with `django/ci.sh` check.
+# The app (`server.wsgi` or `server.asgi`) is selected in the config file:
 /usr/local/bin/gunicorn \
-  --config python:docker.django.gunicorn_config \
-  server.wsgi
+  --config python:docker.django.gunicorn_config
@@ -0,0 +1,8 @@
+#!/usr/bin/env sh
+
+set -o errexit
+set -o nounset
+
+# Runs once on a fresh `db` volume, see `db-replica` in `docker-compose.yml`.
+# The default superuser is allowed to stream WAL to replicas:
+echo "host replication all all scram-sha-256" >> "$PGDATA/pg_hba.conf"
@@ -13,7 +13,10 @@ from server.apps.game.models import (
     ProductRecommendationConditionModel,
     FirstNameModel,
     LastNameModel,
+    ProductAnswerStatsModel,
+    SituationAnswerStatsModel,
 )
+from server.apps.game.services.generation import find_answered_generation
 
 
 class ModelAdmin(admin.ModelAdmin):
@@ -51,6 +54,21 @@ class ProductModelAdmin(ModelAdmin):
     list_display = ["id", "name"]
     inlines = [HintInline, ReviewInline]
 
+    def get_deleted_objects(self, objs, request):
+        """Добавляет к защищённым объектам генерации с продуктом в ответах."""
+        deleted_objects, model_count, perms_needed, protected = (
+            super().get_deleted_objects(objs, request)
+        )
+        # Упакованные ответы генераций не видны сборщику связей:
+        for product in objs:
+            generation = find_answered_generation(product.pk)
+            if generation is not None:
+                protected.append(
+                    f"{generation._meta.verbose_name}: "  # noqa: SLF001
+                    f"{generation.seed}, {generation.iteration}",
+                )
+        return deleted_objects, model_count, perms_needed, protected
+
 
 @admin.register(JobSphereModel)
 class JobSphereModelAdmin(ModelAdmin):
@@ -108,3 +126,52 @@ class FirstNameModelAdmin(ModelAdmin):
 @admin.register(LastNameModel)
 class LastNameModelAdmin(ModelAdmin):
     list_display = ["content"]
+
+
+class AnswerStatsModelAdmin(ModelAdmin):
+    """
+    Статистика ответов только для чтения, её ведёт сама игра.
+
+    Строк за день не больше, чем продуктов или ситуаций в справочниках,
+    поэтому страница дня не зависит от количества игроков.
+    """
+
+    list_filter = ("day",)
+    ordering = ("-day", "-incorrect_but_selected")
+    show_full_result_count = False
+
+    def has_add_permission(self, request):
+        """Строки создаёт только итог дня."""
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        """Счётчики меняет только итог дня."""
+        return False
+
+    def has_delete_permission(self, request, obj=None):
+        """Строки удаляются вместе с продуктом или ситуацией."""
+        return False
+
+
+@admin.register(ProductAnswerStatsModel)
+class ProductAnswerStatsModelAdmin(AnswerStatsModelAdmin):
+    list_display = (
+        "day",
+        "product",
+        "incorrect_but_selected",
+        "correct_but_not_selected",
+        "full_correct",
+    )
+    list_select_related = ("product",)
+
+
+@admin.register(SituationAnswerStatsModel)
+class SituationAnswerStatsModelAdmin(AnswerStatsModelAdmin):
+    list_display = (
+        "day",
+        "situation",
+        "incorrect_but_selected",
+        "correct_but_not_selected",
+        "full_correct",
+    )
+    list_select_related = ("situation",)
@@ -4,3 +4,7 @@ from django.apps import AppConfig
 class GameConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "server.apps.game"
+
+    def ready(self) -> None:
+        """Подключает обработчики сигналов."""
+        from server.apps.game import signals  # noqa: F401, PLC0415
@@ -0,0 +1,226 @@
+import uuid
+from collections.abc import AsyncIterator, Iterator
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.http import (
+    Http404,
+    HttpRequest,
+    HttpResponse,
+    StreamingHttpResponse,
+)
+from ninja import Query, Router
+
+from server.apps.game import caching, renderers, throttling
+from server.apps.game.models import GenerationModel
+from server.apps.game.services import (
+    answer_cache,
+    day_results,
+    day_sessions,
+    generation,
+    leaderboard,
+    pagination,
+    prefetch,
+)
+from server.apps.game.services.dto import (
+    AcknowledgeDayFinish,
+    AcknowledgeDayFinishResponse,
+    GenerateChunkSituation,
+    GenerateHints,
+    GenerateSituationParams,
+    Leaderboard,
+    LeaderboardPeriod,
+    LeaderboardRank,
+    Situation,
+    SituationHint,
+    ValidateSituationAnswer,
+    ValidateStuationAnswerResponse,
+)
+
+router = Router()
+
+
+def _situations(generations: list[GenerationModel]) -> list[Situation]:
+    return [Situation.from_generation_model(_) for _ in generations]
+
+
+@router.post("/generateSituation", response=Situation)
+async def generate_situation(
+    request: HttpRequest, generation_params: GenerateSituationParams
+) -> Situation | HttpResponse:
+    """Ситуация итерации без перехода в поток на пути генерации."""
+    if settings.GAME_DAY_SESSIONS:
+        situation: Situation | HttpResponse = await sync_to_async(
+            day_sessions.generate_situation,
+        )(generation_params)
+    else:
+        # Готовый ответ отдаётся как есть, без повторной валидации:
+        situation = renderers.render_response(
+            request,
+            await generation.agenerate_situation_data(generation_params),
+        )
+    await sync_to_async(prefetch.on_situation_served)(
+        generation_params,
+    )
+    return situation
+
+
+@router.post("/getHint", response=SituationHint)
+async def get_hint(
+    request: HttpRequest, generation_params: GenerateSituationParams
+) -> SituationHint:
+    """Подсказка к ситуации итерации."""
+    if settings.GAME_DAY_SESSIONS:
+        return await sync_to_async(day_sessions.get_hint)(generation_params)
+    hint_instance = await generation.aget_hint(generation_params)
+    return SituationHint.from_hint_model(hint_instance)
+
+
+@router.post("/getHints", response=list[SituationHint])
+async def get_hints(
+    request: HttpRequest, hints_data: GenerateHints
+) -> list[SituationHint]:
+    """Асинхронная версия ``get_hints``."""
+    await throttling.aadmit(
+        request,
+        len(hints_data.iterations),
+        hints_data.seed,
+    )
+    if settings.GAME_DAY_SESSIONS:
+        return await sync_to_async(day_sessions.get_hints)(hints_data)
+    return await generation.aget_hints(hints_data)
+
+
+@router.post("/validateAnswer", response=ValidateStuationAnswerResponse)
+async def validate_answer(
+    request: HttpRequest, data: ValidateSituationAnswer
+) -> ValidateStuationAnswerResponse:
+    """Асинхронная версия ``validate_answer``."""
+    correct_product_ids = await answer_cache.aget_correct_product_ids(
+        data.generation_params,
+    )
+    return ValidateStuationAnswerResponse.model_construct(
+        is_success=data.recommended_product_id in correct_product_ids,
+    )
+
+
+@router.post("/acknowledgeDayFinish", response=AcknowledgeDayFinishResponse)
+async def acknowledge_day_finish(
+    request: HttpRequest, data: AcknowledgeDayFinish
+) -> HttpResponse:
+    """Итог дня по ответам игрока."""
+    await throttling.aadmit(request, len(data.answers), data.seed)
+    return renderers.render_response(
+        request,
+        await day_results.aacknowledge_day_finish(data),
+    )
+
+
+@router.post("/generateChunkSituations", response=list[Situation])
+async def generate_situations_chunked(
+    request: HttpRequest, response: HttpResponse, data: GenerateChunkSituation
+) -> list[Situation]:
+    """Ситуации окна чанка."""
+    await throttling.aadmit(request, len(data.iterations), data.seed)
+    if data.next_cursor is not None:
+        response[pagination.NEXT_CURSOR_HEADER] = data.next_cursor
+    if settings.GAME_DAY_SESSIONS:
+        return await sync_to_async(day_sessions.generate_chunk_situations)(data)
+    generations = await generation.agenerate_chunk_iterations(data)
+    # Ответы берутся из снимка справочников, а сброшенный снимок
+    # загружается синхронным ORM:
+    return await sync_to_async(_situations)(generations)
+
+
+@router.post("/streamChunkSituations", response=list[Situation])
+async def stream_situations_chunked(
+    request: HttpRequest, data: GenerateChunkSituation
+) -> StreamingHttpResponse:
+    """Асинхронная версия ``stream_situations_chunked``."""
+    await throttling.aadmit(request, len(data.iterations), data.seed)
+    if settings.GAME_DAY_SESSIONS:
+        # День читается одной строкой, отдавать по итерациям нечего:
+        lines: Iterator[bytes] | AsyncIterator[bytes] = renderers.ndjson_lines(
+            await sync_to_async(day_sessions.generate_chunk_situations)(data),
+        )
+    else:
+        # Асинхронный итератор нужен ASGI, чтобы не собирать ответ целиком:
+        lines = renderers.andjson_lines(
+            generation.aiter_chunk_situation_data(data),
+        )
+    response = StreamingHttpResponse(
+        lines,
+        content_type=renderers.NDJSON_MEDIA_TYPE,
+    )
+    if data.next_cursor is not None:
+        response[pagination.NEXT_CURSOR_HEADER] = data.next_cursor
+    return response
+
+
+@router.get("/situation/{seed}/{iteration}", response=Situation)
+async def get_situation(
+    request: HttpRequest, seed: uuid.UUID, iteration: int
+) -> HttpResponse:
+    """Кешируемая ситуация итерации."""
+    if not pagination.is_day_iteration(iteration):
+        raise Http404
+    await throttling.aadmit(request, 1, seed)
+    generation_params = GenerateSituationParams(
+        seed=seed,
+        num_iterations=iteration,
+    )
+    # Спрайты перенаправляет маршрут синхронного роутера того же API:
+    sprite_link = caching.sprite_links(request)
+    if settings.GAME_DAY_SESSIONS:
+        situation = (
+            await sync_to_async(day_sessions.generate_situation)(
+                generation_params,
+                sprite_link,
+            )
+        ).model_dump(mode="json")
+    else:
+        situation = await generation.agenerate_situation_data(
+            generation_params,
+            sprite_link,
+        )
+    await sync_to_async(prefetch.on_situation_served)(
+        generation_params,
+    )
+    return caching.cacheable_response(request, situation)
+
+
+@router.get("/hint/{seed}/{iteration}", response=SituationHint)
+async def get_hint_by_iteration(
+    request: HttpRequest, seed: uuid.UUID, iteration: int
+) -> HttpResponse:
+    """Кешируемая подсказка итерации."""
+    if not pagination.is_day_iteration(iteration):
+        raise Http404
+    await throttling.aadmit(request, 1, seed)
+    hint = await get_hint(
+        request,
+        GenerateSituationParams(seed=seed, num_iterations=iteration),
+    )
+    return caching.cacheable_response(request, hint.model_dump(mode="json"))
+
+
+@router.get("/leaderboard/{period}", response=Leaderboard)
+async def get_leaderboard(
+    request: HttpRequest,
+    period: LeaderboardPeriod,
+    limit: int = Query(10, ge=1, le=leaderboard.MAX_TOP_SIZE),
+) -> Leaderboard:
+    """Асинхронная версия ``get_leaderboard``."""
+    return await leaderboard.aget_top(period, limit)
+
+
+@router.get("/leaderboard/{period}/{seed}", response=LeaderboardRank)
+async def get_leaderboard_rank(
+    request: HttpRequest, period: LeaderboardPeriod, seed: uuid.UUID
+) -> LeaderboardRank:
+    """Асинхронная версия ``get_leaderboard_rank``."""
+    rank = await leaderboard.aget_rank(seed, period)
+    if rank is None:
+        # День ещё не завершён через `/acknowledgeDayFinish`:
+        raise Http404
+    return rank
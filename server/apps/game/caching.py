@@ -0,0 +1,75 @@
+"""
+HTTP-кеширование GET-вариантов API игры.
+
+Сид и итерация полностью определяют ситуацию, поэтому её ответ можно
+хранить в CDN и браузере. Ответ получает строгий ``ETag`` по своему
+содержимому, и повторный запрос с ``If-None-Match`` получает ``304``.
+Подписанные ссылки на спрайты меняются при каждом ответе и истекают,
+поэтому спрайт в кешируемом ответе ссылается на постоянный адрес,
+который перенаправляет на свежую ссылку хранилища.
+"""
+
+from collections.abc import Callable
+from typing import Any
+
+from django.conf import settings
+from django.http import HttpRequest, HttpResponse
+from django.urls import reverse
+from django.utils.cache import (
+    get_conditional_response,
+    patch_cache_control,
+    set_response_etag,
+)
+
+from server.apps.game import renderers
+from server.apps.game.models import SpriteModel
+
+SPRITE_URL_NAME = "game_sprite"
+
+
+def cacheable_response(request: HttpRequest, data: Any) -> HttpResponse:
+    """Ответ с ``ETag`` и долгим ``Cache-Control`` или ``304``."""
+    response = renderers.render_response(request, _sorted_keys(data))
+    set_response_etag(response)
+    patch_cache_control(
+        response,
+        public=True,
+        max_age=settings.GAME_CACHE_MAX_AGE,
+        immutable=True,
+    )
+    return get_conditional_response(  # type: ignore[no-any-return]
+        request,
+        etag=response["ETag"],
+        response=response,
+    )
+
+
+def _sorted_keys(data: Any) -> Any:
+    # `jsonb` хранит ключи готового ответа в своём порядке, а байты ответа
+    # не должны зависеть от того, собран он заново или прочитан из бд:
+    if isinstance(data, dict):
+        return {key: _sorted_keys(data[key]) for key in sorted(data)}
+    if isinstance(data, list):
+        return [_sorted_keys(item) for item in data]
+    return data
+
+
+def sprite_links(request: HttpRequest) -> Callable[[str], str]:
+    """Постоянные ссылки на спрайты в пространстве имён текущего API."""
+    namespace = request.resolver_match.namespace  # type: ignore[union-attr]
+
+    def sprite_link(name: str) -> str:
+        return request.build_absolute_uri(
+            reverse(f"{namespace}:{SPRITE_URL_NAME}", kwargs={"name": name}),
+        )
+
+    return sprite_link
+
+
+def sprite_max_age() -> int:
+    """Сколько можно кешировать перенаправление на спрайт."""
+    # Перенаправление не должно пережить подписанную ссылку:
+    storage = SpriteModel._meta.get_field("image").storage  # noqa: SLF001
+    if getattr(storage, "querystring_auth", False):
+        return int(storage.querystring_expire) // 2
+    return int(settings.GAME_CACHE_MAX_AGE)
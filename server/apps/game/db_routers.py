@@ -0,0 +1,119 @@
+"""
+Маршрутизация запросов игры между основной базой и репликами.
+
+Чтения уходят на случайную реплику из ``settings.DATABASE_REPLICAS``,
+запись всегда идёт в ``default``. После первой записи в рамках запроса
+все следующие чтения этого запроса тоже идут в ``default``:
+только что созданная генерация могла ещё не доехать до реплики.
+"""
+
+import contextvars
+import random
+from collections.abc import Awaitable, Callable
+from typing import Any, Final
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS
+from django.db.models import Model
+from django.http import HttpRequest, HttpResponse
+
+_APP_LABEL: Final = "game"
+
+_pinned_to_primary: contextvars.ContextVar[bool] = contextvars.ContextVar(
+    "game_pinned_to_primary",
+    default=False,
+)
+
+
+def _is_game_model(model: type[Model]) -> bool:
+    return model._meta.app_label == _APP_LABEL  # noqa: SLF001
+
+
+class GameReplicaRouter:
+    """Отправляет чтения игры на реплики, а запись в основную базу."""
+
+    def db_for_read(self, model: type[Model], **hints: Any) -> str | None:
+        """Реплика для чтения или ``None``, если читать с основной."""
+        if (
+            not _is_game_model(model)
+            or not settings.DATABASE_REPLICAS
+            or _pinned_to_primary.get()
+        ):
+            return None
+        # Связанные объекты читаем из той же базы, что и сам объект:
+        if hints.get("instance") is not None:
+            return None
+        return random.choice(settings.DATABASE_REPLICAS)  # noqa: S311
+
+    def db_for_write(self, model: type[Model], **hints: Any) -> str | None:
+        """Основная база, до конца запроса читаем тоже из неё."""
+        if not _is_game_model(model):
+            return None
+        _pinned_to_primary.set(True)
+        # Явно, иначе django возьмёт базу объекта, прочитанного с реплики:
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(
+        self,
+        obj1: Model,
+        obj2: Model,
+        **hints: Any,
+    ) -> bool | None:
+        """Разрешает связи между основной базой и её репликами."""
+        databases = {DEFAULT_DB_ALIAS, *settings.DATABASE_REPLICAS}
+        if {obj1._state.db, obj2._state.db} <= databases:  # noqa: SLF001
+            return True
+        return None
+
+    def allow_migrate(
+        self,
+        db: str,
+        app_label: str,
+        **hints: Any,
+    ) -> bool | None:
+        """Запрещает миграции на репликах."""
+        # Схема попадает на реплики через репликацию:
+        if db in settings.DATABASE_REPLICAS:
+            return False
+        return None
+
+
+class PrimaryPinningMiddleware:
+    """Сбрасывает привязку к основной базе между запросами одного потока."""
+
+    # Под ASGI асинхронные views не должны уходить в поток из-за этого слоя:
+    sync_capable = True
+    async_capable = True
+
+    def __init__(
+        self,
+        get_response: Callable[[HttpRequest], Any],
+    ) -> None:
+        """Повторяет синхронность следующего слоя."""
+        self.get_response = get_response
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+
+    def __call__(
+        self,
+        request: HttpRequest,
+    ) -> HttpResponse | Awaitable[HttpResponse]:
+        """Обрабатывает запрос без привязки к основной базе."""
+        if self.async_mode:
+            return self._acall(request)
+        token = _pinned_to_primary.set(False)
+        try:
+            response: HttpResponse = self.get_response(request)
+            return response
+        finally:
+            _pinned_to_primary.reset(token)
+
+    async def _acall(self, request: HttpRequest) -> HttpResponse:
+        token = _pinned_to_primary.set(False)
+        try:
+            response: HttpResponse = await self.get_response(request)
+            return response
+        finally:
+            _pinned_to_primary.reset(token)
@@ -0,0 +1,64 @@
+import base64
+import struct
+from collections.abc import Sequence
+from typing import Any, override
+
+from django.db import models
+from django.db.backends.base.base import BaseDatabaseWrapper
+from django.db.models.expressions import Expression
+
+_ID_FORMAT = "<i"
+_ID_SIZE = struct.calcsize(_ID_FORMAT)
+
+
+def pack_ids(ids: Sequence[int]) -> bytes:
+    """Упаковывает идентификаторы в байты ``PackedIdsField``."""
+    return struct.pack(f"<{len(ids)}i", *ids)
+
+
+def unpack_ids(packed: bytes) -> tuple[int, ...]:
+    """Распаковывает байты ``PackedIdsField`` в идентификаторы."""
+    return struct.unpack(f"<{len(packed) // _ID_SIZE}i", packed)
+
+
+class PackedIdsField(models.BinaryField):
+    """
+    Кортеж целых идентификаторов, упакованный в ``int32`` little-endian.
+
+    Так ответы генераций хранились до миграции
+    ``0015_generation_product_id_arrays``, поле осталось для прошлых миграций.
+    """
+
+    description = "Packed integer ids"
+
+    def from_db_value(
+        self,
+        value: Any,
+        expression: Expression,
+        connection: BaseDatabaseWrapper,
+    ) -> tuple[int, ...] | None:
+        """Распаковывает значение, прочитанное из бд."""
+        if value is None:
+            return None
+        return unpack_ids(bytes(value))
+
+    @override
+    def to_python(self, value: Any) -> tuple[int, ...] | None:
+        if value is None or isinstance(value, tuple):
+            return value
+        if isinstance(value, list):
+            return tuple(value)
+        # Строка base64 из фикстур или упакованные байты:
+        return unpack_ids(bytes(super().to_python(value)))
+
+    @override
+    def get_prep_value(self, value: Any) -> Any:
+        if value is None or isinstance(value, bytes | memoryview):
+            return value
+        return pack_ids(value)
+
+    @override
+    def value_to_string(self, obj: models.Model) -> str:
+        return base64.b64encode(
+            pack_ids(self.value_from_object(obj)),
+        ).decode("ascii")
@@ -0,0 +1,149 @@
+import asyncio
+import time
+import uuid
+from typing import Any, Final, override
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandParser
+from django.db import connections
+from django.test import AsyncClient, Client
+
+from server.apps.game.services import metrics, prefetch
+
+_SYNC_PREFIX: Final = "/api/game"
+_ASYNC_PREFIX: Final = "/api/game/async"
+
+
+class Command(BaseCommand):
+    help = (
+        "Simulates game days against sync and async endpoints in one process "
+        "and reports throughput and the number of requests in flight. "
+        "Writes generations for fresh seeds, do not run against production."
+    )
+
+    @override
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument("--players", type=int, default=20)
+        parser.add_argument("--iterations", type=int, default=10)
+        parser.add_argument(
+            "--repeat",
+            action="store_true",
+            help="Replay the same seeds a second time to measure cache hits.",
+        )
+
+    @override
+    def handle(self, *args: Any, **options: Any) -> None:
+        players: int = options["players"]
+        iterations: int = options["iterations"]
+        rounds = 2 if options["repeat"] else 1
+
+        for mode in ("sync", "async"):
+            seeds = [uuid.uuid4() for _ in range(players)]
+            for round_number in range(rounds):
+                started = time.perf_counter()
+                if mode == "sync":
+                    requests, max_in_flight = self._run_sync(seeds, iterations)
+                else:
+                    requests, max_in_flight = asyncio.run(
+                        self._run_async(seeds, iterations)
+                    )
+                elapsed = time.perf_counter() - started
+                self.stdout.write(
+                    f"{mode:>5} round={round_number} players={players} "
+                    f"requests={requests} elapsed={elapsed:.2f}s "
+                    f"rps={requests / elapsed:.1f} "
+                    f"max_in_flight={max_in_flight}"
+                )
+                if settings.GAME_PREFETCH_AHEAD:
+                    self._report_prefetch()
+
+    def _report_prefetch(self) -> None:
+        prefetch.shutdown_prefetcher()
+        counters = metrics.get_counters()
+        metrics.reset_counters()
+        hit_rate = metrics.prefetch_hit_rate(counters) or 0
+        self.stdout.write(
+            f"      prefetch generated={counters[metrics.PREFETCH_GENERATED]} "
+            f"skipped={counters[metrics.PREFETCH_SKIPPED]} "
+            f"hit_rate={hit_rate:.1%}"
+        )
+
+    def _run_sync(
+        self,
+        seeds: list[uuid.UUID],
+        iterations: int,
+    ) -> tuple[int, int]:
+        client = Client()
+        requests = 0
+        for seed in seeds:
+            answers = []
+            for iteration in range(iterations):
+                situation = client.post(
+                    f"{_SYNC_PREFIX}/generateSituation",
+                    {"seed": str(seed), "num_iterations": iteration},
+                    content_type="application/json",
+                    secure=True,
+                ).json()
+                answers.append(_choose_answer(iteration, situation))
+            client.post(
+                f"{_SYNC_PREFIX}/acknowledgeDayFinish",
+                {"seed": str(seed), "answers": answers},
+                content_type="application/json",
+                secure=True,
+            )
+            requests += iterations + 1
+        # A sync worker always serves exactly one request at a time:
+        return requests, 1
+
+    async def _run_async(
+        self,
+        seeds: list[uuid.UUID],
+        iterations: int,
+    ) -> tuple[int, int]:
+        client = AsyncClient()
+        in_flight = 0
+        max_in_flight = 0
+
+        async def _post(path: str, data: dict[str, Any]) -> Any:
+            nonlocal in_flight, max_in_flight
+            in_flight += 1
+            max_in_flight = max(max_in_flight, in_flight)
+            try:
+                response = await client.post(
+                    f"{_ASYNC_PREFIX}{path}",
+                    data,
+                    content_type="application/json",
+                    secure=True,
+                )
+            finally:
+                in_flight -= 1
+            return response.json()
+
+        async def _play_day(seed: uuid.UUID) -> None:
+            answers = []
+            for iteration in range(iterations):
+                situation = await _post(
+                    "/generateSituation",
+                    {"seed": str(seed), "num_iterations": iteration},
+                )
+                answers.append(_choose_answer(iteration, situation))
+            await _post(
+                "/acknowledgeDayFinish",
+                {"seed": str(seed), "answers": answers},
+            )
+
+        await asyncio.gather(*(_play_day(seed) for seed in seeds))
+        # Test client does not fire `close_old_connections`, servers do,
+        # and the thread of sync ORM calls outlives the event loop:
+        await sync_to_async(connections.close_all)()
+        return len(seeds) * (iterations + 1), max_in_flight
+
+
+def _choose_answer(iteration: int, situation: dict[str, Any]) -> dict[str, Any]:
+    return {
+        "iteration": iteration,
+        "recommended_product_ids": [
+            answer["product"]["id"] for answer in situation["answers"][:2]
+        ],
+    }
@@ -0,0 +1,139 @@
+import datetime
+import random
+import statistics
+import time
+import uuid
+from collections import Counter
+from collections.abc import Callable
+from typing import Any, override
+
+from django.core.management.base import BaseCommand, CommandParser
+from django.db import connections, router, transaction
+from django.utils import timezone
+
+from server.apps.game.models import (
+    LeaderboardBucketModel,
+    LeaderboardEntryModel,
+)
+from server.apps.game.services import leaderboard
+from server.apps.game.services.dto import LeaderboardPeriod
+from server.apps.game.services.partitions import week_start
+
+
+class Command(BaseCommand):
+    help = (
+        "Fills the leaderboard with synthetic day ratings in one transaction, "
+        "measures rank and top queries for every period and rolls back. "
+        "Loads the database heavily, do not run against production."
+    )
+
+    @override
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument("--results", type=int, default=1_000_000)
+        parser.add_argument(
+            "--days",
+            type=int,
+            default=28,
+            help="Spread synthetic results over this many recent days.",
+        )
+        parser.add_argument("--max-rating", type=int, default=100)
+        parser.add_argument("--batch-size", type=int, default=10_000)
+        parser.add_argument(
+            "--queries",
+            type=int,
+            default=200,
+            help="Number of rank and top queries per period.",
+        )
+
+    @override
+    def handle(self, *args: Any, **options: Any) -> None:
+        using = router.db_for_write(LeaderboardEntryModel)
+        with transaction.atomic(using=using):
+            seeds = self._fill(using, options)
+            for period in LeaderboardPeriod:
+                self._measure(period, seeds, options["queries"])
+            transaction.set_rollback(True, using=using)
+
+    def _fill(self, using: str, options: dict[str, Any]) -> list[uuid.UUID]:
+        random_instance = random.Random(0)  # noqa: S311
+        today = timezone.localdate()
+        seeds = []
+        # Buckets are written once: repeated updates of the same rows inside
+        # one transaction leave dead versions that no vacuum can remove.
+        buckets: Counter[leaderboard.BucketKey] = Counter()
+        started = time.perf_counter()
+        for offset in range(0, options["results"], options["batch_size"]):
+            size = min(options["batch_size"], options["results"] - offset)
+            entries = []
+            for _ in range(size):
+                day = today - datetime.timedelta(
+                    days=random_instance.randrange(options["days"]),
+                )
+                rating = random_instance.randint(0, options["max_rating"])
+                entries.append(
+                    LeaderboardEntryModel(
+                        seed=uuid.uuid4(),
+                        rating=rating,
+                        day=day,
+                        week=week_start(day),
+                    ),
+                )
+                buckets.update(leaderboard.bucket_keys(rating, day))
+            LeaderboardEntryModel.objects.using(using).bulk_create(entries)
+            # Sample seeds from every batch, so ranks cover all days:
+            step = max(1, size // 100)
+            seeds.extend(entry.seed for entry in entries[::step])
+        leaderboard.increment_buckets(using, buckets)
+        _analyze(using)
+        elapsed = time.perf_counter() - started
+        self.stdout.write(
+            f"filled results={options['results']} elapsed={elapsed:.1f}s "
+            f"rate={options['results'] / elapsed:.0f}/s",
+        )
+        return seeds
+
+    def _measure(
+        self,
+        period: LeaderboardPeriod,
+        seeds: list[uuid.UUID],
+        queries: int,
+    ) -> None:
+        random_instance = random.Random(1)  # noqa: S311
+        rank_ms = _timings(
+            queries,
+            lambda: leaderboard.get_rank(random_instance.choice(seeds), period),
+        )
+        top_ms = _timings(
+            queries,
+            lambda: leaderboard.get_top(period, leaderboard.MAX_TOP_SIZE),
+        )
+        top_size = leaderboard.MAX_TOP_SIZE
+        self.stdout.write(
+            f"{period:>4} rank p50={_percentile(rank_ms, 50):.2f}ms "
+            f"p99={_percentile(rank_ms, 99):.2f}ms "
+            f"top{top_size} p50={_percentile(top_ms, 50):.2f}ms "
+            f"p99={_percentile(top_ms, 99):.2f}ms",
+        )
+
+
+def _analyze(using: str) -> None:
+    # Fresh rows have no planner statistics until autovacuum gets to them:
+    connection = connections[using]
+    with connection.cursor() as cursor:
+        for model in (LeaderboardEntryModel, LeaderboardBucketModel):
+            table = model._meta.db_table  # noqa: SLF001
+            cursor.execute(f"ANALYZE {connection.ops.quote_name(table)}")
+
+
+def _timings(queries: int, query: Callable[[], object]) -> list[float]:
+    timings = []
+    for _ in range(queries):
+        started = time.perf_counter()
+        query()
+        timings.append((time.perf_counter() - started) * 1000)
+    return timings
+
+
+def _percentile(timings: list[float], percentile: int) -> float:
+    quantiles = statistics.quantiles(timings, n=100, method="inclusive")
+    return quantiles[percentile - 1]
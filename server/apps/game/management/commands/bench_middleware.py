@@ -0,0 +1,108 @@
+import statistics
+import time
+from collections.abc import Callable, Sequence
+from typing import Any, override
+
+from django.conf import settings
+from django.core.handlers.base import BaseHandler
+from django.core.management.base import BaseCommand, CommandParser
+from django.http import HttpRequest, HttpResponse
+from django.test import RequestFactory, override_settings
+from django.utils.module_loading import import_string
+
+from server.apps.game import renderers
+from server.apps.game.middleware import StatelessPathsMixin
+
+# What a browser sends along with a game request:
+_BROWSER_HEADERS = {
+    "HTTP_ACCEPT_LANGUAGE": "ru-RU,ru;q=0.9,en-US;q=0.8",
+    "HTTP_COOKIE": f"sessionid=abc; csrftoken={'a' * 32}",
+}
+
+
+class _ViewlessHandler(BaseHandler):
+    """Runs the middleware chain around a prebuilt response."""
+
+    @override
+    def _get_response(self, request: HttpRequest) -> HttpResponse:
+        return HttpResponse(b"{}", content_type=renderers.JSON_MEDIA_TYPE)
+
+
+class Command(BaseCommand):
+    help = (
+        "Measures the time a game request spends in the middleware chain "
+        "with the stock django middleware and with the stateless paths "
+        "skipping sessions, locale, auth and messages."
+    )
+
+    @override
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument(
+            "--path",
+            default="/api/game/generateChunkSituations",
+        )
+        parser.add_argument("--requests", type=int, default=20_000)
+
+    @override
+    def handle(self, *args: Any, **options: Any) -> None:
+        factory = RequestFactory(**_BROWSER_HEADERS)
+        chains = {
+            "stock": _stock_middleware(settings.MIDDLEWARE),
+            "lean": settings.MIDDLEWARE,
+        }
+        timings = {}
+        for name, middleware in chains.items():
+            with override_settings(MIDDLEWARE=middleware):
+                handler = _ViewlessHandler()
+                handler.load_middleware()
+                timings[name] = _timings(
+                    handler,
+                    lambda: factory.post(options["path"], secure=True),
+                    options["requests"],
+                )
+            self.stdout.write(
+                f"{name:>5} p50={_percentile(timings[name], 50):.1f}us "
+                f"p99={_percentile(timings[name], 99):.1f}us",
+            )
+        saved = statistics.median(timings["stock"]) - statistics.median(
+            timings["lean"],
+        )
+        self.stdout.write(f"saved p50={saved:.1f}us per request")
+
+
+def _stock_middleware(middleware: Sequence[str]) -> list[str]:
+    # Path-aware middleware replaced by the django class it extends,
+    # function middleware is kept as is:
+    stock = []
+    for path in middleware:
+        middleware_class = import_string(path)
+        if isinstance(middleware_class, type) and issubclass(
+            middleware_class,
+            StatelessPathsMixin,
+        ):
+            base = middleware_class.__bases__[-1]
+            path = f"{base.__module__}.{base.__qualname__}"  # noqa: PLW2901
+        stock.append(path)
+    return stock
+
+
+def _timings(
+    handler: BaseHandler,
+    build_request: Callable[[], HttpRequest],
+    requests: int,
+) -> list[float]:
+    # Translations and settings are loaded by the first requests:
+    for _ in range(min(requests, 1000)):
+        handler.get_response(build_request())
+    timings = []
+    for _ in range(requests):
+        request = build_request()
+        started = time.perf_counter()
+        handler.get_response(request)
+        timings.append((time.perf_counter() - started) * 1e6)
+    return timings
+
+
+def _percentile(timings: list[float], percentile: int) -> float:
+    quantiles = statistics.quantiles(timings, n=100, method="inclusive")
+    return quantiles[percentile - 1]
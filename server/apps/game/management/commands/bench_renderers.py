@@ -0,0 +1,95 @@
+import timeit
+import uuid
+from typing import Any, override
+
+from django.core.management.base import BaseCommand, CommandParser
+from django.test import RequestFactory
+from ninja.parser import Parser
+from ninja.renderers import JSONRenderer
+
+from server.apps.game.renderers import (
+    JSON_MEDIA_TYPE,
+    MSGPACK_MEDIA_TYPE,
+    NegotiatingParser,
+    NegotiatingRenderer,
+)
+from server.apps.game.services.dto import GenerateSituationParams, Situation
+from server.apps.game.services.generation import generate_situation
+
+
+class Command(BaseCommand):
+    help = (
+        "Compares the stock JSON, orjson and MessagePack renderers "
+        "and parsers on /generateChunkSituations payloads of different sizes. "
+        "Writes generations for a fresh seed, do not run against production."
+    )
+
+    @override
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument(
+            "--sizes",
+            type=int,
+            nargs="+",
+            default=[10, 50, 200],
+            help="Numbers of situations in a chunk.",
+        )
+        parser.add_argument(
+            "--repeat",
+            type=int,
+            default=200,
+            help="Number of times each payload is rendered and parsed.",
+        )
+
+    @override
+    def handle(self, *args: Any, **options: Any) -> None:
+        repeat: int = options["repeat"]
+        seed = uuid.uuid4()
+        situations = [
+            # Как ninja перед рендерингом ответа, мимо предела размера чанка:
+            Situation.from_generation_model(
+                generate_situation(
+                    GenerateSituationParams(
+                        seed=seed,
+                        num_iterations=iteration,
+                    ),
+                ),
+            ).model_dump()
+            for iteration in range(max(options["sizes"]))
+        ]
+        flavours = {
+            "stock": (JSONRenderer(), Parser(), JSON_MEDIA_TYPE),
+            "orjson": (
+                NegotiatingRenderer(),
+                NegotiatingParser(),
+                JSON_MEDIA_TYPE,
+            ),
+            "msgpack": (
+                NegotiatingRenderer(),
+                NegotiatingParser(),
+                MSGPACK_MEDIA_TYPE,
+            ),
+        }
+
+        for size in options["sizes"]:
+            data = situations[:size]
+            for name, (renderer, body_parser, media_type) in flavours.items():
+                accept = RequestFactory().get("/", HTTP_ACCEPT=media_type)
+                body = renderer.render(accept, data, response_status=200)
+                request = RequestFactory().post(
+                    "/",
+                    body,
+                    content_type=media_type,
+                )
+                render = timeit.timeit(
+                    lambda: renderer.render(accept, data, response_status=200),  # noqa: B023
+                    number=repeat,
+                )
+                parse = timeit.timeit(
+                    lambda: body_parser.parse_body(request),  # noqa: B023
+                    number=repeat,
+                )
+                self.stdout.write(
+                    f"{name:>7} situations={size} bytes={len(body)} "
+                    f"render={render / repeat * 1e6:.0f}us "
+                    f"parse={parse / repeat * 1e6:.0f}us"
+                )
@@ -0,0 +1,104 @@
+import datetime
+import importlib.util
+import uuid
+from pathlib import Path
+from typing import Any, override
+
+from django.core.management.base import BaseCommand, CommandError, CommandParser
+
+from server.apps.game.services import export
+
+
+class Command(BaseCommand):
+    help = (
+        "Streams generations with their answers into chunked CSV "
+        "or Parquet files, ordered by id."
+    )
+
+    @override
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument(
+            "output_dir",
+            type=Path,
+            help="Directory to write the files to.",
+        )
+        parser.add_argument(
+            "--format",
+            choices=export.FORMATS,
+            default="csv",
+            help="File format, Parquet requires pyarrow.",
+        )
+        parser.add_argument(
+            "--since",
+            type=datetime.date.fromisoformat,
+            help="First day of creation to export, inclusive.",
+        )
+        parser.add_argument(
+            "--until",
+            type=datetime.date.fromisoformat,
+            help="Last day of creation to export, inclusive.",
+        )
+        parser.add_argument(
+            "--seed-from",
+            type=uuid.UUID,
+            help="Lowest seed to export, inclusive.",
+        )
+        parser.add_argument(
+            "--seed-to",
+            type=uuid.UUID,
+            help="Highest seed to export, inclusive.",
+        )
+        parser.add_argument(
+            "--after-id",
+            type=int,
+            default=0,
+            help="Export generations with a greater id only.",
+        )
+        parser.add_argument(
+            "--resume",
+            action="store_true",
+            help="Continue after the last file already in the directory.",
+        )
+        parser.add_argument(
+            "--chunk-size",
+            type=int,
+            default=2000,
+            help="Number of rows fetched by one query.",
+        )
+        parser.add_argument(
+            "--rows-per-file",
+            type=int,
+            default=100_000,
+            help="Number of rows written to each file.",
+        )
+
+    @override
+    def handle(self, *args: Any, **options: Any) -> None:
+        if (
+            options["format"] == "parquet"
+            and importlib.util.find_spec("pyarrow") is None
+        ):
+            raise CommandError("Install pyarrow to export Parquet files")
+
+        output_dir: Path = options["output_dir"]
+        output_dir.mkdir(parents=True, exist_ok=True)
+        after_id = options["after_id"]
+        if options["resume"]:
+            after_id = max(after_id, export.last_exported_id(output_dir))
+
+        queryset = export.filter_generations(
+            since=options["since"],
+            until=options["until"],
+            seed_from=options["seed_from"],
+            seed_to=options["seed_to"],
+            after_id=after_id,
+        )
+        paths = export.export_rows(
+            export.generation_rows(queryset, options["chunk_size"]),
+            output_dir,
+            file_format=options["format"],
+            rows_per_file=options["rows_per_file"],
+            chunk_size=options["chunk_size"],
+        )
+        for path in paths:
+            self.stdout.write(f"Exported {path.name}")
@@ -0,0 +1,40 @@
+from typing import Any, override
+
+from django.core.cache import DEFAULT_CACHE_ALIAS, caches
+from django.core.cache.backends.locmem import LocMemCache
+from django.core.management.base import BaseCommand, CommandParser
+
+from server.apps.game.services import metrics
+
+
+class Command(BaseCommand):
+    help = (
+        "Prints game counters from the django cache, "
+        "including the hit rate of prefetched iterations."
+    )
+
+    @override
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument(
+            "--reset",
+            action="store_true",
+            help="Reset all counters after printing them.",
+        )
+
+    @override
+    def handle(self, *args: Any, **options: Any) -> None:
+        if isinstance(caches[DEFAULT_CACHE_ALIAS], LocMemCache):
+            self.stderr.write(
+                "LocMemCache keeps counters per process, "
+                "set DJANGO_REDIS_URL to see totals of all workers.",
+            )
+        counters = metrics.get_counters()
+        for name, value in counters.items():
+            self.stdout.write(f"{name}={value}")
+
+        hit_rate = metrics.prefetch_hit_rate(counters)
+        if hit_rate is not None:
+            self.stdout.write(f"prefetch_hit_rate={hit_rate:.1%}")
+
+        if options["reset"]:
+            metrics.reset_counters()
@@ -0,0 +1,26 @@
+from typing import Any, override
+
+from django.core.management.base import BaseCommand, CommandParser
+
+from server.apps.game.services import generation
+
+
+class Command(BaseCommand):
+    help = (
+        "Rebuilds stored /generateSituation responses that are missing "
+        "or were rendered for an older catalog version."
+    )
+
+    @override
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=500,
+            help="Number of generations updated per query.",
+        )
+
+    @override
+    def handle(self, *args: Any, **options: Any) -> None:
+        total = generation.rebuild_situation_payloads(options["batch_size"])
+        self.stdout.write(f"Rebuilt {total} payloads")
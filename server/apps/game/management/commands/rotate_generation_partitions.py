@@ -0,0 +1,53 @@
+import datetime
+from typing import Any, override
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandParser
+from django.utils import timezone
+
+from server.apps.game.services import partitions
+
+
+class Command(BaseCommand):
+    help = (
+        "Creates weekly partitions of generation tables ahead of time "
+        "and drops partitions older than the retention period, "
+        "together with old rows of the default partitions "
+        "and keys of the deleted generations."
+    )
+
+    @override
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument(
+            "--retention-days",
+            type=int,
+            default=settings.GAME_GENERATION_RETENTION_DAYS,
+            help="Drop weeks that ended more than this many days ago.",
+        )
+        parser.add_argument(
+            "--weeks-ahead",
+            type=int,
+            default=2,
+            help="Number of upcoming weeks to create partitions for.",
+        )
+
+    @override
+    def handle(self, *args: Any, **options: Any) -> None:
+        today = timezone.localdate()
+        created = partitions.create_partitions(
+            since=today,
+            until=today + datetime.timedelta(weeks=options["weeks_ahead"]),
+        )
+        before = today - datetime.timedelta(days=options["retention_days"])
+        dropped = partitions.drop_partitions(before=before)
+        purged = partitions.purge_default_partitions(before=before)
+        keys = partitions.purge_generation_keys(before=before)
+        for name in created:
+            self.stdout.write(f"Created {name}")
+        for name in dropped:
+            self.stdout.write(f"Dropped {name}")
+        for name, rows in purged.items():
+            if rows:
+                self.stdout.write(f"Deleted {rows} rows from {name}")
+        if keys:
+            self.stdout.write(f"Deleted {keys} generation keys")
@@ -0,0 +1,72 @@
+"""
+Промежуточные слои сайта, пропускающие запросы API игры.
+
+API игры не хранит состояния между запросами: ему не нужны сессия,
+пользователь, сообщения и язык из ``Accept-Language``. Стандартные слои
+всё равно разбирали cookies, создавали ленивые объекты, выбирали язык
+и добавляли к ответам ``Vary: Cookie, Accept-Language``, из-за которого
+кешируемые GET-ответы делились в CDN по cookies и языку клиента.
+
+Эти слои заменены наследниками, которые передают запросы с путями
+из ``STATELESS_PATH_PREFIXES`` дальше без своей работы. Остальные пути,
+включая админку, обрабатываются как раньше. ``CommonMiddleware``
+(проверка ``ALLOWED_HOSTS``), ``CsrfViewMiddleware`` и
+``XFrameOptionsMiddleware`` остаются для всех путей: views ninja
+и так освобождены от CSRF, а проверки безопасности django ищут
+именно эти слои.
+"""
+
+from collections.abc import Awaitable
+from typing import override
+
+from django.conf import settings
+from django.contrib.auth import middleware as auth_middleware
+from django.contrib.messages import middleware as messages_middleware
+from django.contrib.sessions import middleware as sessions_middleware
+from django.http import HttpRequest, HttpResponseBase
+from django.middleware import locale
+from django.utils.deprecation import MiddlewareMixin
+
+
+def is_stateless(request: HttpRequest) -> bool:
+    """Запрос к API без сессий, языка, пользователя и сообщений."""
+    return request.path_info.startswith(settings.STATELESS_PATH_PREFIXES)
+
+
+class StatelessPathsMixin(MiddlewareMixin):
+    """Пропускает ``process_request`` и ``process_response`` для API."""
+
+    @override
+    def __call__(
+        self,
+        request: HttpRequest,
+    ) -> HttpResponseBase | Awaitable[HttpResponseBase]:
+        if is_stateless(request):
+            # В асинхронном режиме возвращается корутина следующего слоя:
+            return self.get_response(request)
+        return super().__call__(request)
+
+
+class SessionMiddleware(
+    StatelessPathsMixin,
+    sessions_middleware.SessionMiddleware,
+):
+    """``SessionMiddleware`` без сессии для API игры."""
+
+
+class LocaleMiddleware(StatelessPathsMixin, locale.LocaleMiddleware):
+    """``LocaleMiddleware``, API игры отвечает на ``LANGUAGE_CODE``."""
+
+
+class AuthenticationMiddleware(
+    StatelessPathsMixin,
+    auth_middleware.AuthenticationMiddleware,
+):
+    """``AuthenticationMiddleware`` без ``request.user`` для API игры."""
+
+
+class MessageMiddleware(
+    StatelessPathsMixin,
+    messages_middleware.MessageMiddleware,
+):
+    """``MessageMiddleware`` без хранилища сообщений для API игры."""
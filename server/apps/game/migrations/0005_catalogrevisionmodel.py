@@ -0,0 +1,43 @@
+from django.db import migrations, models
+
+
+def create_catalog_revision(apps, schema_editor):
+    """Создаёт единственную строку, из которой читается версия."""
+    CatalogRevisionModel = apps.get_model("game", "CatalogRevisionModel")
+    CatalogRevisionModel.objects.create(pk=1, version=1)
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("game", "0004_situationmodel_allowed_age_groups"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="CatalogRevisionModel",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "version",
+                    models.PositiveBigIntegerField(
+                        default=0, verbose_name="версия"
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "версия справочников",
+                "verbose_name_plural": "версии справочников",
+            },
+        ),
+        migrations.RunPython(
+            create_catalog_revision, migrations.RunPython.noop
+        ),
+    ]
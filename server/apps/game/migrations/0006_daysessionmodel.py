@@ -0,0 +1,33 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("game", "0005_catalogrevisionmodel"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="DaySessionModel",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("seed", models.UUIDField(unique=True, verbose_name="сид")),
+                (
+                    "iterations",
+                    models.JSONField(default=dict, verbose_name="итерации"),
+                ),
+            ],
+            options={
+                "verbose_name": "игровой день",
+                "verbose_name_plural": "игровые дни",
+            },
+        ),
+    ]
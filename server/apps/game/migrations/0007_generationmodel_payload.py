@@ -0,0 +1,20 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("game", "0006_daysessionmodel"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="generationmodel",
+            name="payload",
+            field=models.JSONField(
+                blank=True,
+                editable=False,
+                null=True,
+                verbose_name="готовый ответ",
+            ),
+        ),
+    ]
@@ -0,0 +1,28 @@
+from django.db import migrations
+
+import server.apps.game.fields
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("game", "0007_generationmodel_payload"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="generationmodel",
+            name="correct_product_ids",
+            field=server.apps.game.fields.PackedIdsField(
+                null=True,
+                verbose_name="правильные продукты",
+            ),
+        ),
+        migrations.AddField(
+            model_name="generationmodel",
+            name="incorrect_product_ids",
+            field=server.apps.game.fields.PackedIdsField(
+                null=True,
+                verbose_name="неправильные продукты",
+            ),
+        ),
+    ]
@@ -0,0 +1,69 @@
+from collections import defaultdict
+from typing import Final
+
+from django.apps.registry import Apps
+from django.db import migrations, transaction
+from django.db.backends.base.schema import BaseDatabaseSchemaEditor
+from django.db.models import Model
+
+_BATCH_SIZE: Final = 1000
+
+
+def pack_answers(apps: Apps, schema_editor: BaseDatabaseSchemaEditor) -> None:
+    """
+    Копирует строки ответов в упакованные идентификаторы генераций.
+
+    Каждая пачка коммитится отдельно: таблица не заблокирована на всё
+    время миграции, а прерванная миграция продолжит с неупакованных.
+    """
+    generation_model = apps.get_model("game", "GenerationModel")
+    answer_model = apps.get_model("game", "GenerationAnswerModel")
+    using = schema_editor.connection.alias
+
+    last_pk = 0
+    while batch := list(
+        generation_model.objects.using(using)
+        .filter(pk__gt=last_pk, correct_product_ids__isnull=True)
+        .order_by("pk")[:_BATCH_SIZE],
+    ):
+        with transaction.atomic(using=using):
+            _pack_batch(answer_model, generation_model, batch, using)
+        last_pk = batch[-1].pk
+
+
+def _pack_batch(
+    answer_model: type[Model],
+    generation_model: type[Model],
+    batch: list[Model],
+    using: str,
+) -> None:
+    answers: defaultdict[int, dict[bool, list[int]]] = defaultdict(
+        lambda: {True: [], False: []},
+    )
+    for generation_id, product_id, is_correct in (
+        answer_model.objects.using(using)
+        .filter(generation__in=batch)
+        .order_by("pk")
+        .values_list("generation_id", "product_id", "is_correct")
+    ):
+        answers[generation_id][is_correct].append(product_id)
+
+    for generation in batch:
+        generation.correct_product_ids = tuple(answers[generation.pk][True])
+        generation.incorrect_product_ids = tuple(answers[generation.pk][False])
+    generation_model.objects.using(using).bulk_update(
+        batch,
+        ["correct_product_ids", "incorrect_product_ids"],
+    )
+
+
+class Migration(migrations.Migration):
+    atomic = False
+
+    dependencies = [
+        ("game", "0008_generationmodel_product_ids"),
+    ]
+
+    operations = [
+        migrations.RunPython(pack_answers, migrations.RunPython.noop),
+    ]
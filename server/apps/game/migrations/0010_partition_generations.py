@@ -0,0 +1,179 @@
+import datetime
+import re
+from typing import Final
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.apps.registry import Apps
+from django.db import migrations, models
+from django.db.backends.base.schema import BaseDatabaseSchemaEditor
+from django.db.backends.utils import CursorWrapper
+
+_TABLES: Final = ("game_generationmodel", "game_generationanswermodel")
+_PARTITION_KEY: Final = "created_on"
+_WEEKS_AHEAD: Final = 2
+
+
+def _create_partitioned(
+    cursor: CursorWrapper,
+    table: str,
+    old_table: str,
+    weeks: list[datetime.date],
+) -> None:
+    cursor.execute(
+        f"""
+        CREATE TABLE {table}
+        (LIKE {old_table} INCLUDING DEFAULTS INCLUDING IDENTITY)
+        PARTITION BY RANGE ({_PARTITION_KEY})
+        """,
+    )
+    cursor.execute(f"CREATE TABLE {table}_default PARTITION OF {table} DEFAULT")
+    for week in weeks:
+        cursor.execute(
+            f"""
+            CREATE TABLE {table}_p{week:%Y%m%d} PARTITION OF {table}
+            FOR VALUES FROM (%s) TO (%s)
+            """,
+            [week, week + datetime.timedelta(weeks=1)],
+        )
+
+
+def _rebuild_table(
+    cursor: CursorWrapper,
+    table: str,
+    weeks: list[datetime.date] | None,
+) -> None:
+    # Переименование блокирует таблицу `ACCESS EXCLUSIVE` до конца
+    # миграции, и пока строки копируются, генерации недоступны игре:
+    old_table = f"{table}_old"
+    cursor.execute(f"ALTER TABLE {table} RENAME TO {old_table}")
+
+    # Первичный ключ пересоздаётся, остальное как было:
+    cursor.execute(
+        """
+        SELECT conname, pg_get_constraintdef(oid) FROM pg_constraint
+        WHERE conrelid = %s::regclass AND contype IN ('u', 'f')
+        """,
+        [old_table],
+    )
+    constraints = cursor.fetchall()
+    cursor.execute(
+        """
+        SELECT indexdef FROM pg_indexes WHERE tablename = %s
+        AND indexname NOT IN (
+            SELECT conname FROM pg_constraint WHERE conrelid = %s::regclass
+        )
+        """,
+        [old_table, old_table],
+    )
+    # Индексы разбитой таблицы создаются `ON ONLY`:
+    old_name = re.compile(rf" ON (ONLY )?(\S+\.)?{old_table} ")
+    indexes = [
+        old_name.sub(f" ON {table} ", indexdef)
+        for (indexdef,) in cursor.fetchall()
+    ]
+
+    if weeks is None:
+        primary_key = "id"
+        cursor.execute(
+            f"""
+            CREATE TABLE {table}
+            (LIKE {old_table} INCLUDING DEFAULTS INCLUDING IDENTITY)
+            """,
+        )
+    else:
+        primary_key = f"id, {_PARTITION_KEY}"
+        _create_partitioned(cursor, table, old_table, weeks)
+    cursor.execute(
+        f"INSERT INTO {table} SELECT * FROM {old_table}",  # noqa: S608
+    )
+    cursor.execute(
+        f"""
+        SELECT setval(
+            pg_get_serial_sequence(%s, 'id'),
+            (SELECT coalesce(max(id), 0) + 1 FROM {table}),
+            false
+        )
+        """,  # noqa: S608
+        [table],
+    )
+    cursor.execute(f"DROP TABLE {old_table}")
+
+    cursor.execute(f"ALTER TABLE {table} ADD PRIMARY KEY ({primary_key})")
+    for name, definition in constraints:
+        cursor.execute(
+            f"ALTER TABLE {table} ADD CONSTRAINT {name} {definition}",
+        )
+    for indexdef in indexes:
+        cursor.execute(indexdef)
+
+
+def partition_tables(
+    apps: Apps,
+    schema_editor: BaseDatabaseSchemaEditor,
+) -> None:
+    """Превращает таблицы генераций в разбитые по неделям создания."""
+    today = django.utils.timezone.localdate()
+    this_week = today - datetime.timedelta(days=today.weekday())
+    weeks = [
+        this_week + datetime.timedelta(weeks=offset)
+        for offset in range(_WEEKS_AHEAD + 1)
+    ]
+    with schema_editor.connection.cursor() as cursor:
+        for table in _TABLES:
+            _rebuild_table(cursor, table, weeks)
+
+
+def merge_partitions(
+    apps: Apps,
+    schema_editor: BaseDatabaseSchemaEditor,
+) -> None:
+    """Собирает партиции генераций обратно в обычные таблицы."""
+    with schema_editor.connection.cursor() as cursor:
+        for table in _TABLES:
+            _rebuild_table(cursor, table, weeks=None)
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("game", "0009_pack_generation_answers"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="generationmodel",
+            name="created_on",
+            field=models.DateField(
+                default=django.utils.timezone.localdate,
+                editable=False,
+                verbose_name="дата создания",
+            ),
+        ),
+        migrations.AddField(
+            model_name="generationanswermodel",
+            name="created_on",
+            field=models.DateField(
+                default=django.utils.timezone.localdate,
+                editable=False,
+                verbose_name="дата создания",
+            ),
+        ),
+        migrations.AlterField(
+            model_name="generationanswermodel",
+            name="generation",
+            field=models.ForeignKey(
+                db_constraint=False,
+                on_delete=django.db.models.deletion.CASCADE,
+                related_name="answers",
+                to="game.generationmodel",
+                verbose_name="генерация",
+            ),
+        ),
+        migrations.AlterUniqueTogether(
+            name="generationmodel",
+            unique_together={("seed", "iteration", "created_on")},
+        ),
+        # Откат упадёт на уникальности без даты, если у итерации
+        # уже есть генерации разных дней:
+        migrations.RunPython(partition_tables, merge_partitions),
+    ]
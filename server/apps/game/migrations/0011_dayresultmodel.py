@@ -0,0 +1,40 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("game", "0010_partition_generations"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="DayResultModel",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("seed", models.UUIDField(verbose_name="сид")),
+                (
+                    "answers_hash",
+                    models.CharField(max_length=64, verbose_name="хеш ответов"),
+                ),
+                ("response", models.JSONField(verbose_name="ответ")),
+            ],
+            options={
+                "verbose_name": "итог дня",
+                "verbose_name_plural": "итоги дней",
+                "constraints": [
+                    models.UniqueConstraint(
+                        fields=("seed", "answers_hash"),
+                        name="game_dayresultmodel_unique_answers",
+                    ),
+                ],
+            },
+        ),
+    ]
@@ -0,0 +1,83 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("game", "0011_dayresultmodel"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="LeaderboardBucketModel",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "period",
+                    models.CharField(max_length=8, verbose_name="период"),
+                ),
+                (
+                    "period_start",
+                    models.DateField(verbose_name="начало периода"),
+                ),
+                ("rating", models.IntegerField(verbose_name="рейтинг")),
+                (
+                    "players",
+                    models.BigIntegerField(default=0, verbose_name="игроков"),
+                ),
+            ],
+            options={
+                "verbose_name": "корзина таблицы лидеров",
+                "verbose_name_plural": "корзины таблицы лидеров",
+                "constraints": [
+                    models.UniqueConstraint(
+                        fields=("period", "period_start", "rating"),
+                        name="game_leaderboardbucketmodel_unique_rating",
+                    ),
+                ],
+            },
+        ),
+        migrations.CreateModel(
+            name="LeaderboardEntryModel",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("seed", models.UUIDField(unique=True, verbose_name="сид")),
+                ("rating", models.IntegerField(verbose_name="рейтинг")),
+                ("day", models.DateField(verbose_name="день")),
+                ("week", models.DateField(verbose_name="начало недели")),
+            ],
+            options={
+                "verbose_name": "результат в таблице лидеров",
+                "verbose_name_plural": "результаты в таблице лидеров",
+                "indexes": [
+                    models.Index(
+                        fields=["day", "-rating", "id"],
+                        name="game_leaderboard_day_idx",
+                    ),
+                    models.Index(
+                        fields=["week", "-rating", "id"],
+                        name="game_leaderboard_week_idx",
+                    ),
+                    models.Index(
+                        fields=["-rating", "id"],
+                        name="game_leaderboard_rating_idx",
+                    ),
+                ],
+            },
+        ),
+    ]
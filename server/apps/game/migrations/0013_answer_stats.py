@@ -0,0 +1,113 @@
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("game", "0012_leaderboard"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ProductAnswerStatsModel",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("day", models.DateField(verbose_name="день")),
+                (
+                    "full_correct",
+                    models.BigIntegerField(
+                        default=0,
+                        verbose_name="правильно рекомендован",
+                    ),
+                ),
+                (
+                    "incorrect_but_selected",
+                    models.BigIntegerField(
+                        default=0,
+                        verbose_name="ошибочно рекомендован",
+                    ),
+                ),
+                (
+                    "correct_but_not_selected",
+                    models.BigIntegerField(default=0, verbose_name="пропущен"),
+                ),
+                (
+                    "product",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        to="game.productmodel",
+                        verbose_name="продукт",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "статистика ответов по продукту",
+                "verbose_name_plural": "статистика ответов по продуктам",
+                "constraints": [
+                    models.UniqueConstraint(
+                        fields=("day", "product"),
+                        name="game_productanswerstatsmodel_unique_day",
+                    ),
+                ],
+            },
+        ),
+        migrations.CreateModel(
+            name="SituationAnswerStatsModel",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("day", models.DateField(verbose_name="день")),
+                (
+                    "full_correct",
+                    models.BigIntegerField(
+                        default=0,
+                        verbose_name="правильно рекомендован",
+                    ),
+                ),
+                (
+                    "incorrect_but_selected",
+                    models.BigIntegerField(
+                        default=0,
+                        verbose_name="ошибочно рекомендован",
+                    ),
+                ),
+                (
+                    "correct_but_not_selected",
+                    models.BigIntegerField(default=0, verbose_name="пропущен"),
+                ),
+                (
+                    "situation",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        to="game.situationmodel",
+                        verbose_name="ситуация",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "статистика ответов по ситуации",
+                "verbose_name_plural": "статистика ответов по ситуациям",
+                "constraints": [
+                    models.UniqueConstraint(
+                        fields=("day", "situation"),
+                        name="game_situationanswerstatsmodel_unique_day",
+                    ),
+                ],
+            },
+        ),
+    ]
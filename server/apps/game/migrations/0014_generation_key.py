@@ -0,0 +1,79 @@
+from typing import Final
+
+from django.db import migrations, models
+
+# Итерации, записанные дважды на стыке дней, кроме первой записи:
+_DUPLICATES: Final = """
+    SELECT id FROM (
+        SELECT id, row_number() OVER (
+            PARTITION BY seed, iteration ORDER BY id
+        ) AS position
+        FROM game_generationmodel
+    ) AS numbered
+    WHERE position > 1
+"""
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("game", "0013_answer_stats"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="GenerationKeyModel",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("seed", models.UUIDField(verbose_name="сид")),
+                (
+                    "iteration",
+                    models.PositiveSmallIntegerField(verbose_name="итерация"),
+                ),
+                (
+                    "created_on",
+                    models.DateField(verbose_name="дата создания"),
+                ),
+            ],
+            options={
+                "verbose_name": "ключ генерации",
+                "verbose_name_plural": "ключи генераций",
+                "indexes": [
+                    models.Index(
+                        fields=["created_on"],
+                        name="game_generationkey_created_idx",
+                    ),
+                ],
+                "constraints": [
+                    models.UniqueConstraint(
+                        fields=("seed", "iteration"),
+                        name="game_generationkeymodel_unique_iteration",
+                    ),
+                ],
+            },
+        ),
+        migrations.RunSQL(
+            [
+                f"""
+                DELETE FROM game_generationanswermodel
+                WHERE generation_id IN ({_DUPLICATES})
+                """,  # noqa: S608
+                f"""
+                DELETE FROM game_generationmodel
+                WHERE id IN ({_DUPLICATES})
+                """,  # noqa: S608
+                """
+                INSERT INTO game_generationkeymodel (seed, iteration, created_on)
+                SELECT seed, iteration, created_on FROM game_generationmodel
+                """,
+            ],
+            migrations.RunSQL.noop,
+        ),
+    ]
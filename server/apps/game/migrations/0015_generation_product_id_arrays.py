@@ -0,0 +1,111 @@
+from typing import Final
+
+import django.contrib.postgres.fields
+import django.contrib.postgres.indexes
+from django.db import migrations, models
+
+# Байты `PackedIdsField`: идентификаторы `int32` little-endian подряд.
+_UNPACK_FUNCTION: Final = r"""
+CREATE OR REPLACE FUNCTION pg_temp.game_unpack_ids(packed bytea) RETURNS integer[]
+LANGUAGE sql IMMUTABLE STRICT AS $$
+    SELECT coalesce(
+        array_agg(
+            get_byte(packed, position)
+            | (get_byte(packed, position + 1) << 8)
+            | (get_byte(packed, position + 2) << 16)
+            | (get_byte(packed, position + 3) << 24)
+            ORDER BY position
+        ),
+        '{}'
+    )
+    FROM generate_series(0, length(packed) - 4, 4) AS position
+$$
+"""
+
+_PACK_FUNCTION: Final = r"""
+CREATE OR REPLACE FUNCTION pg_temp.game_pack_ids(ids integer[]) RETURNS bytea
+LANGUAGE sql IMMUTABLE STRICT AS $$
+    SELECT coalesce(
+        string_agg(
+            set_byte(set_byte(set_byte(set_byte(
+                '\x00000000'::bytea,
+                0, id & 255),
+                1, (id >> 8) & 255),
+                2, (id >> 16) & 255),
+                3, (id >> 24) & 255),
+            '\x'::bytea
+            ORDER BY position
+        ),
+        '\x'::bytea
+    )
+    FROM unnest(ids) WITH ORDINALITY AS packed(id, position)
+$$
+"""
+
+_ALTER_COLUMN: Final = """
+ALTER TABLE game_generationmodel ALTER COLUMN {column}
+TYPE {column_type} USING pg_temp.{function}({column})
+"""
+
+
+def _alter_field(
+    name: str,
+    verbose_name: str,
+) -> migrations.SeparateDatabaseAndState:
+    return migrations.SeparateDatabaseAndState(
+        database_operations=[
+            migrations.RunSQL(
+                _ALTER_COLUMN.format(
+                    column=name,
+                    column_type="integer[]",
+                    function="game_unpack_ids",
+                ),
+                _ALTER_COLUMN.format(
+                    column=name,
+                    column_type="bytea",
+                    function="game_pack_ids",
+                ),
+            ),
+        ],
+        state_operations=[
+            migrations.AlterField(
+                model_name="generationmodel",
+                name=name,
+                field=django.contrib.postgres.fields.ArrayField(
+                    base_field=models.IntegerField(),
+                    null=True,
+                    size=None,
+                    verbose_name=verbose_name,
+                ),
+            ),
+        ],
+    )
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("game", "0014_generation_key"),
+    ]
+
+    operations = [
+        # Временные функции живут до конца соединения, поэтому создаются
+        # с заменой. При откате операции выполняются в обратном порядке:
+        migrations.RunSQL(_UNPACK_FUNCTION, migrations.RunSQL.noop),
+        _alter_field("correct_product_ids", "правильные продукты"),
+        _alter_field("incorrect_product_ids", "неправильные продукты"),
+        migrations.RunSQL(migrations.RunSQL.noop, _PACK_FUNCTION),
+        migrations.AddIndex(
+            model_name="generationmodel",
+            index=django.contrib.postgres.indexes.GinIndex(
+                fields=["correct_product_ids"],
+                name="game_generation_correct_gin",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="generationmodel",
+            index=django.contrib.postgres.indexes.GinIndex(
+                fields=["incorrect_product_ids"],
+                name="game_generation_incorrect_gin",
+            ),
+        ),
+    ]
@@ -1,6 +1,9 @@
 from typing import Final, final, override
 
+from django.contrib.postgres.fields import ArrayField
+from django.contrib.postgres.indexes import GinIndex
 from django.db import models
+from django.utils import timezone
 
 
 class FeatureParamModel(models.Model):
@@ -234,6 +237,10 @@ class ProductRecommendationConditionModel(models.Model):
 class GenerationModel(models.Model):
     seed = models.UUIDField(verbose_name="сид")
     iteration = models.PositiveSmallIntegerField(verbose_name="итерация")
+    # Ключ партиционирования таблицы в PostgreSQL, см. `services.partitions`:
+    created_on = models.DateField(
+        default=timezone.localdate, editable=False, verbose_name="дата создания"
+    )
 
     situation = models.ForeignKey(
         to=SituationModel, on_delete=models.PROTECT, verbose_name="ситуация"
@@ -270,17 +277,51 @@ class GenerationModel(models.Model):
         to=HintModel, on_delete=models.PROTECT, verbose_name="подсказка"
     )
 
+    # Ответы итерации, у старых генераций они лежат строками в `answers`:
+    correct_product_ids = ArrayField(
+        models.IntegerField(), null=True, verbose_name="правильные продукты"
+    )
+    incorrect_product_ids = ArrayField(
+        models.IntegerField(), null=True, verbose_name="неправильные продукты"
+    )
+
+    # Готовый ответ `/generateSituation`, см. `services.payloads`:
+    payload = models.JSONField(
+        null=True, blank=True, editable=False, verbose_name="готовый ответ"
+    )
+
+    # Строки ответов, загруженные через `Prefetch(to_attr=...)` или только
+    # что сгенерированные, чтобы не делать повторный запрос к бд:
+    prefetched_answers: list["GenerationAnswerModel"]
+
     class Meta:
         verbose_name = "генерация"
         verbose_name_plural = "генерации"
-        unique_together = [("seed", "iteration")]
+        # Уникальность в партиционированной таблице включает ключ партиций:
+        unique_together = (("seed", "iteration", "created_on"),)
+        # Продукт в ответах ищется по индексу при защите от удаления:
+        indexes = (
+            GinIndex(
+                fields=["correct_product_ids"],
+                name="game_generation_correct_gin",
+            ),
+            GinIndex(
+                fields=["incorrect_product_ids"],
+                name="game_generation_incorrect_gin",
+            ),
+        )
 
 
 @final
 class GenerationAnswerModel(models.Model):
+    # Внешний ключ на партиционированную таблицу был бы составным
+    # `(id, created_on)` и не дал бы отсоединить партицию по умолчанию,
+    # из которой новая неделя забирает строки, см. `services.partitions`.
+    # Ответы удаляются вместе со своей партицией:
     generation = models.ForeignKey(
         GenerationModel,
         on_delete=models.CASCADE,
+        db_constraint=False,
         related_name="answers",
         verbose_name="генерация",
     )
@@ -288,7 +329,224 @@ class GenerationAnswerModel(models.Model):
         to=ProductModel, on_delete=models.PROTECT, verbose_name="продукт"
     )
     is_correct = models.BooleanField(verbose_name="корректность")
+    created_on = models.DateField(
+        default=timezone.localdate, editable=False, verbose_name="дата создания"
+    )
 
     class Meta:
         verbose_name = "ответ генерации"
         verbose_name_plural = "ответы генераций"
+
+
+@final
+class GenerationKeyModel(models.Model):
+    """
+    Записанная итерация сида.
+
+    Уникальность в разбитой по неделям таблице генераций включает дату
+    создания, и на стыке дней итерация записалась бы дважды. Эта таблица
+    не разбита и не даёт записать итерацию второй раз.
+    """
+
+    seed = models.UUIDField(verbose_name="сид")
+    iteration = models.PositiveSmallIntegerField(verbose_name="итерация")
+    # Дата создания генерации, ключ удаляется вместе с её партицией:
+    created_on = models.DateField(verbose_name="дата создания")
+
+    class Meta:
+        verbose_name = "ключ генерации"
+        verbose_name_plural = "ключи генераций"
+        constraints = (
+            models.UniqueConstraint(
+                fields=["seed", "iteration"],
+                name="%(app_label)s_%(class)s_unique_iteration",
+            ),
+        )
+        indexes = (
+            models.Index(
+                fields=["created_on"],
+                name="game_generationkey_created_idx",
+            ),
+        )
+
+
+@final
+class CatalogRevisionModel(models.Model):
+    """
+    Версия справочников игры.
+
+    Увеличивается при каждом изменении продуктов, подсказок и отзывов,
+    чтобы все воркеры узнали об изменениях одним дешевым запросом.
+    """
+
+    version = models.PositiveBigIntegerField(default=0, verbose_name="версия")
+
+    class Meta:
+        verbose_name = "версия справочников"
+        verbose_name_plural = "версии справочников"
+
+
+@final
+class DaySessionModel(models.Model):
+    """
+    Все итерации одного игрового дня одной строкой.
+
+    Альтернатива :class:`GenerationModel` с ответами: итерации лежат
+    в ``iterations`` по номеру итерации и читаются одним запросом по сиду.
+    """
+
+    seed = models.UUIDField(unique=True, verbose_name="сид")
+    iterations = models.JSONField(default=dict, verbose_name="итерации")
+
+    class Meta:
+        verbose_name = "игровой день"
+        verbose_name_plural = "игровые дни"
+
+
+@final
+class DayResultModel(models.Model):
+    """
+    Посчитанный ответ ``/acknowledgeDayFinish``.
+
+    Клиенты повторяют запрос при обрывах связи, поэтому итог дня хранится
+    по сиду и хешу отправленных ответов и отдаётся повторно как есть.
+    """
+
+    seed = models.UUIDField(verbose_name="сид")
+    answers_hash = models.CharField(max_length=64, verbose_name="хеш ответов")
+    response = models.JSONField(verbose_name="ответ")
+
+    class Meta:
+        verbose_name = "итог дня"
+        verbose_name_plural = "итоги дней"
+        constraints = (
+            models.UniqueConstraint(
+                fields=["seed", "answers_hash"],
+                name="%(app_label)s_%(class)s_unique_answers",
+            ),
+        )
+
+
+@final
+class LeaderboardEntryModel(models.Model):
+    """
+    Рейтинг игрового дня в таблице лидеров, одна запись на сид.
+
+    Индексы по периоду и убыванию рейтинга отдают лучших игроков
+    без сортировки всей таблицы.
+    """
+
+    seed = models.UUIDField(unique=True, verbose_name="сид")
+    rating = models.IntegerField(verbose_name="рейтинг")
+    day = models.DateField(verbose_name="день")
+    week = models.DateField(verbose_name="начало недели")
+
+    class Meta:
+        verbose_name = "результат в таблице лидеров"
+        verbose_name_plural = "результаты в таблице лидеров"
+        indexes = (
+            models.Index(
+                fields=["day", "-rating", "id"],
+                name="game_leaderboard_day_idx",
+            ),
+            models.Index(
+                fields=["week", "-rating", "id"],
+                name="game_leaderboard_week_idx",
+            ),
+            models.Index(
+                fields=["-rating", "id"],
+                name="game_leaderboard_rating_idx",
+            ),
+        )
+
+
+@final
+class LeaderboardBucketModel(models.Model):
+    """
+    Количество игроков с одним рейтингом за период.
+
+    Обновляется вместе с :class:`LeaderboardEntryModel`, место игрока
+    считается суммой корзин выше его рейтинга, а не подсчётом записей.
+    """
+
+    period = models.CharField(max_length=8, verbose_name="период")
+    period_start = models.DateField(verbose_name="начало периода")
+    rating = models.IntegerField(verbose_name="рейтинг")
+    players = models.BigIntegerField(default=0, verbose_name="игроков")
+
+    class Meta:
+        verbose_name = "корзина таблицы лидеров"
+        verbose_name_plural = "корзины таблицы лидеров"
+        constraints = (
+            models.UniqueConstraint(
+                fields=["period", "period_start", "rating"],
+                name="%(app_label)s_%(class)s_unique_rating",
+            ),
+        )
+
+
+class AnswerStatsModel(models.Model):
+    """Сколько раз за день продукт получил каждый статус ответа."""
+
+    day = models.DateField(verbose_name="день")
+    full_correct = models.BigIntegerField(
+        default=0,
+        verbose_name="правильно рекомендован",
+    )
+    incorrect_but_selected = models.BigIntegerField(
+        default=0,
+        verbose_name="ошибочно рекомендован",
+    )
+    correct_but_not_selected = models.BigIntegerField(
+        default=0,
+        verbose_name="пропущен",
+    )
+
+    class Meta:
+        abstract = True
+
+
+@final
+class ProductAnswerStatsModel(AnswerStatsModel):
+    """Статусы ответов продукта за день по всем ситуациям."""
+
+    product = models.ForeignKey(
+        to=ProductModel,
+        on_delete=models.CASCADE,
+        # Уникальность начинается с дня, удалению нужен свой индекс:
+        db_index=True,
+        verbose_name="продукт",
+    )
+
+    class Meta:
+        verbose_name = "статистика ответов по продукту"
+        verbose_name_plural = "статистика ответов по продуктам"
+        constraints = (
+            models.UniqueConstraint(
+                fields=["day", "product"],
+                name="%(app_label)s_%(class)s_unique_day",
+            ),
+        )
+
+
+@final
+class SituationAnswerStatsModel(AnswerStatsModel):
+    """Статусы всех ответов итераций ситуации за день."""
+
+    situation = models.ForeignKey(
+        to=SituationModel,
+        on_delete=models.CASCADE,
+        # Уникальность начинается с дня, удалению нужен свой индекс:
+        db_index=True,
+        verbose_name="ситуация",
+    )
+
+    class Meta:
+        verbose_name = "статистика ответов по ситуации"
+        verbose_name_plural = "статистика ответов по ситуациям"
+        constraints = (
+            models.UniqueConstraint(
+                fields=["day", "situation"],
+                name="%(app_label)s_%(class)s_unique_day",
+            ),
+        )
@@ -0,0 +1,169 @@
+"""
+Рендерер и парсер API игры на ``orjson`` и MessagePack.
+
+``/generateChunkSituations`` отдаёт десятки вложенных ситуаций,
+и стандартный ``json`` с ``NinjaJSONEncoder`` заметно нагружает процессор.
+``orjson`` сам сериализует ``UUID``, даты, перечисления и наследников
+``str``, остальное (ссылки ``AnyHttpUrl``, модели pydantic, ``Decimal``)
+передаётся в ``NinjaJSONEncoder``, поэтому ответ совпадает со стандартным.
+
+Клиент может попросить MessagePack заголовком
+``Accept: application/msgpack`` и так же прислать тело запроса
+с ``Content-Type: application/msgpack``. По умолчанию остаётся JSON.
+Длинные ответы можно отдавать потоком строк NDJSON.
+"""
+
+from collections.abc import AsyncIterable, AsyncIterator, Iterable, Iterator
+from typing import Any, Final, override
+
+import msgpack
+import orjson
+from django.http import HttpRequest, HttpResponse
+from django.utils.cache import patch_vary_headers
+from ninja import NinjaAPI
+from ninja.parser import Parser
+from ninja.renderers import BaseRenderer
+from ninja.responses import NinjaJSONEncoder
+from ninja.types import DictStrAny
+
+JSON_MEDIA_TYPE: Final = "application/json"
+MSGPACK_MEDIA_TYPE: Final = "application/msgpack"
+NDJSON_MEDIA_TYPE: Final = "application/x-ndjson"
+
+# Первый тип отдаётся, если клиент согласен на любой:
+_MEDIA_TYPES: Final = (JSON_MEDIA_TYPE, MSGPACK_MEDIA_TYPE)
+
+_OPTIONS: Final = orjson.OPT_NON_STR_KEYS
+
+_encoder: Final = NinjaJSONEncoder()
+
+
+def dumps(data: Any) -> bytes:
+    """JSON ответа, сериализованный ``orjson``."""
+    return orjson.dumps(data, default=_encoder.default, option=_OPTIONS)
+
+
+def _dumps_line(data: Any) -> bytes:
+    return orjson.dumps(
+        data,
+        default=_encoder.default,
+        option=_OPTIONS | orjson.OPT_APPEND_NEWLINE,
+    )
+
+
+def ndjson_lines(items: Iterable[Any]) -> Iterator[bytes]:
+    """Строки NDJSON, по одной на элемент, для ``StreamingHttpResponse``."""
+    return map(_dumps_line, items)
+
+
+async def andjson_lines(items: AsyncIterable[Any]) -> AsyncIterator[bytes]:
+    """Асинхронная версия ``ndjson_lines``."""
+    async for item in items:
+        yield _dumps_line(item)
+
+
+def packb(data: Any) -> bytes:
+    """Ответ в MessagePack."""
+    # Те же преобразования, что и для JSON, чтобы данные не расходились:
+    return msgpack.packb(data, default=_encoder.default)  # type: ignore[no-any-return]
+
+
+def negotiate(request: HttpRequest | None) -> str:
+    """Тип ответа по заголовку ``Accept``, JSON если подходящего нет."""
+    if request is None:
+        return JSON_MEDIA_TYPE
+    return request.get_preferred_type(_MEDIA_TYPES) or JSON_MEDIA_TYPE
+
+
+def render_response(request: HttpRequest, data: Any) -> HttpResponse:
+    """Ответ с уже готовыми данными в обход рендерера ``NinjaAPI``."""
+    media_type = negotiate(request)
+    content = packb(data) if media_type == MSGPACK_MEDIA_TYPE else dumps(data)
+    response = HttpResponse(content, content_type=media_type)
+    patch_vary_headers(response, ["Accept"])
+    return response
+
+
+class ORJSONRenderer(BaseRenderer):
+    media_type = JSON_MEDIA_TYPE
+
+    @override
+    def render(
+        self,
+        request: HttpRequest,
+        data: Any,
+        *,
+        response_status: int,
+    ) -> bytes:
+        return dumps(data)
+
+
+class ORJSONParser(Parser):
+    @override
+    def parse_body(self, request: HttpRequest) -> DictStrAny:
+        # `orjson.JSONDecodeError` наследует `json.JSONDecodeError`,
+        # так что ninja по-прежнему отвечает 400 на битое тело:
+        return orjson.loads(request.body)  # type: ignore[no-any-return]
+
+
+class NegotiatingRenderer(ORJSONRenderer):
+    @override
+    def render(
+        self,
+        request: HttpRequest,
+        data: Any,
+        *,
+        response_status: int,
+    ) -> bytes:
+        if negotiate(request) == MSGPACK_MEDIA_TYPE:
+            return packb(data)
+        return super().render(request, data, response_status=response_status)
+
+    def get_content_type(self, request: HttpRequest) -> str:
+        """``Content-Type`` выбранного для запроса типа ответа."""
+        media_type = negotiate(request)
+        if media_type == MSGPACK_MEDIA_TYPE:
+            return media_type
+        return f"{media_type}; charset={self.charset}"
+
+
+class NegotiatingParser(ORJSONParser):
+    @override
+    def parse_body(self, request: HttpRequest) -> DictStrAny:
+        if request.content_type == MSGPACK_MEDIA_TYPE:
+            # Любая ошибка разбора тела превращается ninja в ответ 400:
+            return msgpack.unpackb(request.body)  # type: ignore[no-any-return]
+        return super().parse_body(request)
+
+
+class NegotiatingNinjaAPI(NinjaAPI):
+    """``NinjaAPI`` с типом ответа, выбранным по заголовку ``Accept``."""
+
+    renderer: NegotiatingRenderer
+
+    def __init__(self, **kwargs: Any) -> None:
+        """Подключает рендерер и парсер с выбором типа."""
+        super().__init__(
+            renderer=NegotiatingRenderer(),
+            parser=NegotiatingParser(),
+            **kwargs,
+        )
+
+    @override
+    def create_response(
+        self,
+        request: HttpRequest,
+        data: Any,
+        *,
+        status: int | None = None,
+        temporal_response: HttpResponse | None = None,
+    ) -> HttpResponse:
+        response = super().create_response(
+            request,
+            data,
+            status=status,
+            temporal_response=temporal_response,
+        )
+        response["Content-Type"] = self.renderer.get_content_type(request)
+        patch_vary_headers(response, ["Accept"])
+        return response
@@ -0,0 +1,132 @@
+"""
+Правильные продукты итераций для ``/validateAnswer``.
+
+Правильные продукты сохранённой итерации не меняются, поэтому воркер
+держит их в памяти, и проверка одного клика игрока не обращается к бд.
+При промахе читается только колонка упакованных идентификаторов,
+без соединений, моделей и отзывов.
+
+Итерация, которую ещё никому не выдавали, не генерируется: иначе
+перебор итераций через этот дешёвый запрос заполнял бы таблицы.
+Ответ на неё неверный и в памяти не запоминается.
+"""
+
+import threading
+from collections import OrderedDict
+from uuid import UUID
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+
+from server.apps.game.models import GenerationAnswerModel, GenerationModel
+from server.apps.game.services import day_sessions, generation, write_behind
+from server.apps.game.services.dto import GenerateSituationParams
+
+_correct_products: OrderedDict[tuple[UUID, int], frozenset[int]] = OrderedDict()
+_lock = threading.Lock()
+
+
+def _key(generation_params: GenerateSituationParams) -> tuple[UUID, int]:
+    return generation_params.seed, generation_params.num_iterations
+
+
+def get_cached(
+    generation_params: GenerateSituationParams,
+) -> frozenset[int] | None:
+    """Правильные продукты итерации из памяти воркера, без бд."""
+    key = _key(generation_params)
+    with _lock:
+        product_ids = _correct_products.get(key)
+        if product_ids is not None:
+            _correct_products.move_to_end(key)
+    return product_ids
+
+
+def _remember(
+    generation_params: GenerateSituationParams,
+    product_ids: frozenset[int],
+) -> None:
+    with _lock:
+        _correct_products[_key(generation_params)] = product_ids
+        while len(_correct_products) > settings.GAME_ANSWER_CACHE_SIZE:
+            _correct_products.popitem(last=False)
+
+
+def clear() -> None:
+    """Забывает все запомненные итерации."""
+    with _lock:
+        _correct_products.clear()
+
+
+def _load(generation_params: GenerateSituationParams) -> frozenset[int] | None:
+    if settings.GAME_DAY_SESSIONS:
+        record = day_sessions.get_day_records(generation_params.seed).get(
+            generation_params.num_iterations,
+        )
+        if record is None:
+            return None
+        return frozenset(record.correct_product_ids)
+
+    stored = (
+        GenerationModel.objects.filter(
+            seed=generation_params.seed,
+            iteration=generation_params.num_iterations,
+        )
+        .values_list("pk", "correct_product_ids")
+        .first()
+    )
+    if stored is None:
+        return _load_pending(generation_params)
+
+    pk, correct_product_ids = stored
+    if correct_product_ids is not None:
+        return frozenset(correct_product_ids)
+    return frozenset(
+        GenerationAnswerModel.objects.filter(
+            generation_id=pk,
+            is_correct=True,
+        ).values_list("product_id", flat=True),
+    )
+
+
+def _load_pending(
+    generation_params: GenerateSituationParams,
+) -> frozenset[int] | None:
+    # Выданная итерация может ещё ждать записи в очереди этого воркера:
+    writer = write_behind.get_generation_writer()
+    if writer is None:
+        return None
+    pending_generation = writer.get(
+        generation_params.seed,
+        generation_params.num_iterations,
+    )
+    if pending_generation is None:
+        return None
+    return frozenset(generation.get_correct_product_ids(pending_generation))
+
+
+def get_correct_product_ids(
+    generation_params: GenerateSituationParams,
+) -> frozenset[int]:
+    """Правильные продукты выданной итерации, пусто если её не выдавали."""
+    product_ids = get_cached(generation_params)
+    if product_ids is None:
+        product_ids = _load(generation_params)
+        if product_ids is None:
+            return frozenset()
+        _remember(generation_params, product_ids)
+    return product_ids
+
+
+async def aget_correct_product_ids(
+    generation_params: GenerateSituationParams,
+) -> frozenset[int]:
+    """Асинхронная версия ``get_correct_product_ids``."""
+    # Попадание в кеш не уходит в поток, промах выполняется синхронно:
+    product_ids = get_cached(generation_params)
+    if product_ids is None:
+        product_ids = await sync_to_async(_load)(generation_params)
+        if product_ids is None:
+            return frozenset()
+        _remember(generation_params, product_ids)
+    return product_ids
@@ -0,0 +1,111 @@
+"""
+Статистика качества ответов по продуктам и ситуациям за день.
+
+Редакторам нужно знать, какие продукты игроки чаще всего рекомендуют
+ошибочно и какие ситуации сложнее остальных. Счётчики статусов
+увеличиваются в той же транзакции, что и первая запись итога дня,
+поэтому админка читает готовые строки дня, а не разбирает ответы
+и не пересчитывает отзывы.
+"""
+
+import datetime
+from collections import Counter, defaultdict
+from typing import Any, Final
+
+from django.conf import settings
+from django.db import connections
+from django.utils import timezone
+
+from server.apps.game.models import (
+    AnswerStatsModel,
+    ProductAnswerStatsModel,
+    SituationAnswerStatsModel,
+)
+from server.apps.game.services import day_sessions, generation
+from server.apps.game.services.dto import AcknowledgeDayFinish, AnswerStatusEnum
+
+# Колонки счётчиков называются так же, как статусы ответов:
+STATUS_FIELDS: Final = tuple(status.value for status in AnswerStatusEnum)
+
+_UPSERT_SQL: Final = """
+INSERT INTO {table} (day, {key}, {columns})
+VALUES {values}
+ON CONFLICT (day, {key}) DO UPDATE SET {increments}
+"""
+
+
+def _situation_ids(data: AcknowledgeDayFinish) -> dict[int, int]:
+    iterations = [answer.iteration for answer in data.answers]
+    if settings.GAME_DAY_SESSIONS:
+        return day_sessions.get_situation_ids(data.seed, iterations)
+    return generation.get_situation_ids(data.seed, iterations)
+
+
+def _increment(
+    using: str,
+    model: type[AnswerStatsModel],
+    key: str,
+    day: datetime.date,
+    counts: dict[int, Counter[str]],
+) -> None:
+    if not counts:
+        return
+    # Одинаковый порядок строк не даёт параллельным записям взаимно
+    # заблокироваться:
+    object_ids = sorted(counts)
+    connection = connections[using]
+    table = connection.ops.quote_name(model._meta.db_table)  # noqa: SLF001
+    with connection.cursor() as cursor:
+        cursor.execute(
+            _UPSERT_SQL.format(
+                table=table,
+                key=key,
+                columns=", ".join(STATUS_FIELDS),
+                values=", ".join(
+                    [f"(%s, %s, {', '.join(['%s'] * len(STATUS_FIELDS))})"]
+                    * len(object_ids),
+                ),
+                increments=", ".join(
+                    f"{field} = {table}.{field} + EXCLUDED.{field}"
+                    for field in STATUS_FIELDS
+                ),
+            ),
+            [
+                value
+                for object_id in object_ids
+                for value in (
+                    day,
+                    object_id,
+                    *(counts[object_id][field] for field in STATUS_FIELDS),
+                )
+            ],
+        )
+
+
+def record_day(
+    data: AcknowledgeDayFinish,
+    response: dict[str, Any],
+    using: str,
+) -> None:
+    """Добавляет статусы ответов посчитанного итога дня к статистике."""
+    situation_ids = _situation_ids(data)
+    products: defaultdict[int, Counter[str]] = defaultdict(Counter)
+    situations: defaultdict[int, Counter[str]] = defaultdict(Counter)
+    # Отзывы идут в порядке отправленных ответов:
+    for answer, review in zip(data.answers, response["reviews"], strict=True):
+        situation_id = situation_ids.get(answer.iteration)
+        for product_review in review["review"]:
+            status = product_review["answer_status"]
+            products[product_review["answered_product"]["id"]][status] += 1
+            if situation_id is not None:
+                situations[situation_id][status] += 1
+
+    day = timezone.localdate()
+    _increment(using, ProductAnswerStatsModel, "product_id", day, products)
+    _increment(
+        using,
+        SituationAnswerStatsModel,
+        "situation_id",
+        day,
+        situations,
+    )
@@ -0,0 +1,317 @@
+import dataclasses
+import enum
+import threading
+import time
+from collections import defaultdict
+from collections.abc import Iterable, Sequence
+from typing import Protocol, Self
+
+from django.conf import settings
+from django.db.models import F, Model
+
+from server.apps.game.models import (
+    AgeGroupModel,
+    CatalogRevisionModel,
+    CityModel,
+    FirstNameModel,
+    HintModel,
+    JobSphereModel,
+    LastNameModel,
+    ProductModel,
+    ReviewModel,
+    SituationModel,
+    SpriteModel,
+)
+
+CATALOG_REVISION_ID = 1
+
+
+@dataclasses.dataclass(frozen=True, slots=True)
+class CatalogProduct:
+    id: int
+    name: str
+    link: str
+
+
+@dataclasses.dataclass(frozen=True, slots=True)
+class CatalogHint:
+    id: int
+    product_id: int
+    text: str
+
+
+@dataclasses.dataclass(frozen=True, slots=True)
+class CatalogSituation:
+    id: int
+    male_text: str
+    female_text: str
+
+
+@enum.unique
+class ClientFeature(enum.StrEnum):
+    """Признаки клиента, которые хранятся в генерации ссылкой на справочник."""
+
+    AGE_GROUP = "age_groups"
+    JOB_SPHERE = "job_spheres"
+    CITY = "cities"
+    SPRITE = "sprites"
+    FIRST_NAME = "first_names"
+    LAST_NAME = "last_names"
+
+
+# Модель и поле со значением признака, для спрайта это имя файла в хранилище:
+CLIENT_FEATURE_SOURCES: dict[ClientFeature, tuple[type[Model], str]] = {
+    ClientFeature.AGE_GROUP: (AgeGroupModel, "name"),
+    ClientFeature.JOB_SPHERE: (JobSphereModel, "name"),
+    ClientFeature.CITY: (CityModel, "name"),
+    ClientFeature.SPRITE: (SpriteModel, "image"),
+    ClientFeature.FIRST_NAME: (FirstNameModel, "content"),
+    ClientFeature.LAST_NAME: (LastNameModel, "content"),
+}
+
+
+class CatalogReader(Protocol):
+    """Общий интерфейс снимка справочников в памяти и в ``mmap`` файле."""
+
+    @property
+    def version(self) -> int:
+        """Версия справочников, из которой собран снимок."""
+
+    def get_product(self, product_id: int) -> CatalogProduct | None:
+        """Продукт по идентификатору или ``None``."""
+
+    def get_hint(self, hint_id: int) -> CatalogHint | None:
+        """Подсказка по идентификатору или ``None``."""
+
+    def get_success_reviews(self) -> Sequence[str]:
+        """Отзывы за верный ответ."""
+
+    def get_lost_reviews(self, product_id: int) -> Sequence[str]:
+        """Отзывы за продукт, которого не хватило в ответе."""
+
+    def get_incorrect_reviews(self, product_id: int) -> Sequence[str]:
+        """Отзывы за лишний продукт в ответе."""
+
+    def get_situation(self, situation_id: int) -> CatalogSituation | None:
+        """Тексты ситуации по идентификатору или ``None``."""
+
+    def get_client_feature(
+        self,
+        feature: ClientFeature,
+        feature_id: int,
+    ) -> str | None:
+        """Значение признака клиента по идентификатору или ``None``."""
+
+
+@dataclasses.dataclass(frozen=True, slots=True)
+class Catalog:
+    """
+    Снимок справочных данных игры.
+
+    Продукты, подсказки, отзывы, тексты ситуаций и признаки клиентов.
+    Данные меняются только через админку, поэтому снимок загружается один раз
+    на процесс и перечитывается только при смене версии справочников.
+    """
+
+    version: int
+    products: dict[int, CatalogProduct]
+    hints: dict[int, CatalogHint]
+    success_reviews: tuple[str, ...]
+    lost_reviews: dict[int, tuple[str, ...]]
+    incorrect_reviews: dict[int, tuple[str, ...]]
+    situations: dict[int, CatalogSituation]
+    client_features: dict[ClientFeature, dict[int, str]]
+
+    @classmethod
+    def load(cls) -> Self:
+        """Загружает снимок из бд."""
+        # Версию читаем первой: если справочники поменяются во время
+        # загрузки, снимок окажется новее версии, но никогда не старее.
+        version = get_catalog_version()
+
+        lost_reviews: defaultdict[int, list[str]] = defaultdict(list)
+        incorrect_reviews: defaultdict[int, list[str]] = defaultdict(list)
+        success_reviews = []
+
+        reviews = ReviewModel.objects.order_by("id").values_list(
+            "product_id", "is_product_in_answer", "text"
+        )
+        for product_id, is_product_in_answer, text in reviews:
+            if product_id is None:
+                success_reviews.append(text)
+            elif is_product_in_answer:
+                incorrect_reviews[product_id].append(text)
+            else:
+                lost_reviews[product_id].append(text)
+
+        return cls(
+            version=version,
+            products={
+                product_id: CatalogProduct(product_id, name, link)
+                for product_id, name, link in ProductModel.objects.order_by(
+                    "id"
+                ).values_list("id", "name", "link")
+            },
+            hints={
+                hint_id: CatalogHint(hint_id, product_id, text)
+                for hint_id, product_id, text in HintModel.objects.order_by(
+                    "id"
+                ).values_list("id", "product_id", "text")
+            },
+            success_reviews=tuple(success_reviews),
+            lost_reviews={
+                key: tuple(value) for key, value in lost_reviews.items()
+            },
+            incorrect_reviews={
+                key: tuple(value) for key, value in incorrect_reviews.items()
+            },
+            situations={
+                situation_id: CatalogSituation(
+                    situation_id, male_text, female_text
+                )
+                for situation_id, male_text, female_text in (
+                    SituationModel.objects.order_by("id").values_list(
+                        "id", "male_text", "female_text"
+                    )
+                )
+            },
+            client_features={
+                feature: dict(
+                    model._default_manager.order_by("id").values_list(  # noqa: SLF001
+                        "id", field
+                    )
+                )
+                for feature, (model, field) in CLIENT_FEATURE_SOURCES.items()
+            },
+        )
+
+    def get_product(self, product_id: int) -> CatalogProduct | None:
+        """Продукт по идентификатору или ``None``."""
+        return self.products.get(product_id)
+
+    def get_hint(self, hint_id: int) -> CatalogHint | None:
+        """Подсказка по идентификатору или ``None``."""
+        return self.hints.get(hint_id)
+
+    def get_success_reviews(self) -> tuple[str, ...]:
+        """Отзывы за верный ответ."""
+        return self.success_reviews
+
+    def get_lost_reviews(self, product_id: int) -> tuple[str, ...]:
+        """Отзывы за продукт, которого не хватило в ответе."""
+        return self.lost_reviews.get(product_id, ())
+
+    def get_incorrect_reviews(self, product_id: int) -> tuple[str, ...]:
+        """Отзывы за лишний продукт в ответе."""
+        return self.incorrect_reviews.get(product_id, ())
+
+    def get_situation(self, situation_id: int) -> CatalogSituation | None:
+        """Тексты ситуации по идентификатору или ``None``."""
+        return self.situations.get(situation_id)
+
+    def get_client_feature(
+        self,
+        feature: ClientFeature,
+        feature_id: int,
+    ) -> str | None:
+        """Значение признака клиента по идентификатору или ``None``."""
+        return self.client_features[feature].get(feature_id)
+
+
+def get_catalog_version() -> int:
+    """Текущая версия справочников в бд."""
+    return (
+        CatalogRevisionModel.objects.filter(pk=CATALOG_REVISION_ID)
+        .values_list("version", flat=True)
+        .first()
+        or 0
+    )
+
+
+def bump_catalog_version() -> None:
+    """Увеличивает версию справочников, снимки воркеров устаревают."""
+    revision = CatalogRevisionModel.objects.filter(pk=CATALOG_REVISION_ID)
+    updated = revision.update(version=F("version") + 1)
+    if not updated:
+        CatalogRevisionModel.objects.get_or_create(
+            pk=CATALOG_REVISION_ID, defaults={"version": 1}
+        )
+
+
+def _load_catalog(version: int) -> CatalogReader:
+    if settings.GAME_CATALOG_MMAP_DIR:
+        from server.apps.game.services.catalog_file import (  # noqa: PLC0415
+            open_shared_catalog,
+        )
+
+        return open_shared_catalog(settings.GAME_CATALOG_MMAP_DIR, version)
+    return Catalog.load()
+
+
+_catalog: CatalogReader | None = None
+_checked_at: float = 0
+_catalog_lock = threading.Lock()
+
+
+def get_catalog() -> CatalogReader:
+    """Снимок справочников процесса, перечитанный при смене версии."""
+    global _catalog, _checked_at  # noqa: PLW0603
+
+    catalog = _catalog
+    if catalog is not None and not _is_check_due():
+        return catalog
+
+    with _catalog_lock:
+        if _catalog is None or _is_check_due():
+            version = get_catalog_version()
+            if _catalog is None or _catalog.version != version:
+                _catalog = _load_catalog(version)
+            _checked_at = time.monotonic()
+        return _catalog
+
+
+def _is_check_due() -> bool:
+    return time.monotonic() - _checked_at > settings.GAME_CATALOG_TTL
+
+
+def reset_catalog() -> None:
+    """Сбрасывает снимок, следующий запрос перечитает его."""
+    global _catalog  # noqa: PLW0603
+
+    with _catalog_lock:
+        _catalog = None
+
+
+def with_products(
+    catalog: CatalogReader,
+    product_ids: Iterable[int],
+) -> CatalogReader:
+    """
+    Снимок, в котором есть все продукты из базы с этими идентификаторами.
+
+    Продукт мог появиться уже после загрузки снимка этим воркером,
+    тогда снимок перечитывается один раз. Идентификаторы ответа присылает
+    игрок, поэтому сначала проверяем, что пропущенные продукты есть в базе.
+    """
+    missing = [
+        product_id
+        for product_id in product_ids
+        if catalog.get_product(product_id) is None
+    ]
+    if not missing or not ProductModel.objects.filter(id__in=missing).exists():
+        return catalog
+    reset_catalog()
+    return get_catalog()
+
+
+def get_catalog_products(product_ids: Sequence[int]) -> list[CatalogProduct]:
+    """Продукты снимка в порядке идентификаторов."""
+    catalog = with_products(get_catalog(), product_ids)
+    products = list(map(catalog.get_product, product_ids))
+
+    found = []
+    for product_id, product in zip(product_ids, products, strict=True):
+        if product is None:
+            raise LookupError(f"Unknown product {product_id}")
+        found.append(product)
+    return found
@@ -0,0 +1,379 @@
+"""
+Колоночный файл справочников, общий для всех воркеров на узле.
+
+Файл собирается один раз на версию справочников и открывается через ``mmap``,
+поэтому страницы с данными лежат в page cache в единственном экземпляре,
+а строки декодируются только при обращении к конкретной записи.
+
+Формат (little-endian, все секции выровнены по 8 байт)::
+
+    header:  magic "GCAT" | u32 format | u64 version | u64 offsets[tables]
+    table:   u64 rows | i64 keys[rows] | i64 ints[columns][rows]
+             | (u64 offsets[rows + 1] | utf-8 blob)[str columns]
+
+Ключи в таблице отсортированы и могут повторяться (отзывы по продукту),
+поэтому поиск выполняется бинарным поиском прямо по ``mmap``.
+"""
+
+import bisect
+import contextlib
+import dataclasses
+import mmap
+import operator
+import os
+import struct
+import tempfile
+from collections.abc import Iterator, Sequence
+from pathlib import Path
+from typing import Final, Self, overload, override
+
+from server.apps.game.services.catalog import (
+    Catalog,
+    CatalogHint,
+    CatalogProduct,
+    CatalogSituation,
+    ClientFeature,
+)
+
+_MAGIC: Final = b"GCAT"
+_FORMAT_VERSION: Final = 2
+_ALIGN: Final = 8
+# Воркеры разных релизов на одном узле не должны читать чужой формат:
+_FILE_PREFIX: Final = f"catalog-f{_FORMAT_VERSION}-v"
+_FILE_SUFFIX: Final = ".bin"
+
+
+@dataclasses.dataclass(frozen=True, slots=True)
+class _TableSchema:
+    name: str
+    int_columns: int
+    str_columns: int
+
+
+_PRODUCTS: Final = _TableSchema("products", int_columns=0, str_columns=2)
+_HINTS: Final = _TableSchema("hints", int_columns=1, str_columns=1)
+_SUCCESS_REVIEWS: Final = _TableSchema("success_reviews", 0, 1)
+_LOST_REVIEWS: Final = _TableSchema("lost_reviews", 0, 1)
+_INCORRECT_REVIEWS: Final = _TableSchema("incorrect_reviews", 0, 1)
+_SITUATIONS: Final = _TableSchema("situations", int_columns=0, str_columns=2)
+_CLIENT_FEATURES: Final = {
+    feature: _TableSchema(feature.value, 0, 1) for feature in ClientFeature
+}
+_TABLES: Final = (
+    _PRODUCTS,
+    _HINTS,
+    _SUCCESS_REVIEWS,
+    _LOST_REVIEWS,
+    _INCORRECT_REVIEWS,
+    _SITUATIONS,
+    *_CLIENT_FEATURES.values(),
+)
+_HEADER: Final = struct.Struct(f"<4sIQ{len(_TABLES)}Q")
+
+_Row = tuple[int, list[int], list[str]]
+
+
+def _pad(buffer: bytearray) -> None:
+    buffer.extend(b"\0" * (-len(buffer) % _ALIGN))
+
+
+def _pack_table(schema: _TableSchema, rows: list[_Row]) -> bytes:
+    rows = sorted(rows, key=operator.itemgetter(0))
+    buffer = bytearray(struct.pack("<Q", len(rows)))
+    buffer += struct.pack(f"<{len(rows)}q", *(row[0] for row in rows))
+    for column in range(schema.int_columns):
+        buffer += struct.pack(
+            f"<{len(rows)}q", *(row[1][column] for row in rows)
+        )
+
+    for column in range(schema.str_columns):
+        encoded = [row[2][column].encode() for row in rows]
+        offsets = [0]
+        for item in encoded:
+            offsets.append(offsets[-1] + len(item))
+        buffer += struct.pack(f"<{len(offsets)}Q", *offsets)
+        buffer += b"".join(encoded)
+        _pad(buffer)
+
+    return bytes(buffer)
+
+
+def _catalog_rows(catalog: Catalog) -> dict[str, list[_Row]]:
+    return {
+        _PRODUCTS.name: [
+            (product.id, [], [product.name, product.link])
+            for product in catalog.products.values()
+        ],
+        _HINTS.name: [
+            (hint.id, [hint.product_id], [hint.text])
+            for hint in catalog.hints.values()
+        ],
+        _SUCCESS_REVIEWS.name: [
+            (index, [], [text])
+            for index, text in enumerate(catalog.success_reviews)
+        ],
+        _LOST_REVIEWS.name: [
+            (product_id, [], [text])
+            for product_id, texts in catalog.lost_reviews.items()
+            for text in texts
+        ],
+        _INCORRECT_REVIEWS.name: [
+            (product_id, [], [text])
+            for product_id, texts in catalog.incorrect_reviews.items()
+            for text in texts
+        ],
+        _SITUATIONS.name: [
+            (situation.id, [], [situation.male_text, situation.female_text])
+            for situation in catalog.situations.values()
+        ],
+        **{
+            _CLIENT_FEATURES[feature].name: [
+                (feature_id, [], [value])
+                for feature_id, value in values.items()
+            ]
+            for feature, values in catalog.client_features.items()
+        },
+    }
+
+
+def write_catalog_file(catalog: Catalog, directory: Path) -> Path:
+    """Атомарно записывает снимок в ``directory`` и возвращает путь к нему."""
+    rows = _catalog_rows(catalog)
+    tables = [_pack_table(schema, rows[schema.name]) for schema in _TABLES]
+
+    offsets = []
+    position = _HEADER.size + (-_HEADER.size % _ALIGN)
+    for table in tables:
+        offsets.append(position)
+        position += len(table)
+
+    target = _catalog_path(directory, catalog.version)
+    fd, temp_name = tempfile.mkstemp(dir=directory, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as temp_file:
+            header = bytearray(
+                _HEADER.pack(_MAGIC, _FORMAT_VERSION, catalog.version, *offsets)
+            )
+            _pad(header)
+            temp_file.write(header)
+            for table in tables:
+                temp_file.write(table)
+            temp_file.flush()
+            os.fsync(temp_file.fileno())
+        # Читатели видят либо старый файл, либо полностью записанный новый:
+        Path(temp_name).replace(target)
+    except BaseException:
+        Path(temp_name).unlink(missing_ok=True)
+        raise
+
+    return target
+
+
+class _StrColumn(Sequence[str]):
+    """Ленивое представление диапазона строк одной колонки без копирования."""
+
+    __slots__ = ("_blob", "_offsets", "_start", "_stop")
+
+    def __init__(
+        self,
+        offsets: memoryview,
+        blob: memoryview,
+        start: int,
+        stop: int,
+    ) -> None:
+        self._offsets = offsets
+        self._blob = blob
+        self._start = start
+        self._stop = stop
+
+    @override
+    def __len__(self) -> int:
+        return self._stop - self._start
+
+    @overload
+    def __getitem__(self, index: int) -> str: ...
+
+    @overload
+    def __getitem__(self, index: slice) -> Sequence[str]: ...
+
+    @override
+    def __getitem__(self, index: int | slice) -> str | Sequence[str]:
+        if isinstance(index, slice):
+            return [self[item] for item in range(len(self))[index]]
+
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError(index)
+
+        row = self._start + index
+        return str(
+            self._blob[self._offsets[row] : self._offsets[row + 1]], "utf-8"
+        )
+
+    @override
+    def __iter__(self) -> Iterator[str]:
+        for index in range(len(self)):
+            yield self[index]
+
+
+@dataclasses.dataclass(frozen=True, slots=True)
+class _MappedTable:
+    keys: memoryview
+    ints: list[memoryview]
+    strs: list[tuple[memoryview, memoryview]]
+
+    @classmethod
+    def parse(
+        cls, buffer: memoryview, offset: int, schema: _TableSchema
+    ) -> Self:
+        (rows,) = struct.unpack_from("<Q", buffer, offset)
+        offset += 8
+
+        def _take(size: int) -> memoryview:
+            nonlocal offset
+            view = buffer[offset : offset + size]
+            offset += size + (-size % _ALIGN)
+            return view
+
+        keys = _take(rows * 8).cast("q")
+        ints = [_take(rows * 8).cast("q") for _ in range(schema.int_columns)]
+        strs = []
+        for _ in range(schema.str_columns):
+            offsets = _take((rows + 1) * 8).cast("Q")
+            strs.append((offsets, _take(offsets[rows])))
+        return cls(keys=keys, ints=ints, strs=strs)
+
+    def find(self, key: int) -> tuple[int, int]:
+        return (
+            bisect.bisect_left(self.keys, key),
+            bisect.bisect_right(self.keys, key),
+        )
+
+    def find_one(self, key: int) -> int | None:
+        start, stop = self.find(key)
+        return start if start < stop else None
+
+    def column(self, column: int, start: int, stop: int) -> _StrColumn:
+        offsets, blob = self.strs[column]
+        return _StrColumn(offsets, blob, start, stop)
+
+    def text(self, column: int, row: int) -> str:
+        return self.column(column, row, row + 1)[0]
+
+
+class MappedCatalog:
+    """Снимок справочников, читаемый напрямую из ``mmap`` файла."""
+
+    def __init__(self, path: Path) -> None:
+        """Отображает файл в память и разбирает оглавление таблиц."""
+        with path.open("rb") as catalog_file:
+            self._mmap = mmap.mmap(
+                catalog_file.fileno(), 0, access=mmap.ACCESS_READ
+            )
+        buffer = memoryview(self._mmap)
+
+        magic, file_format, version, *offsets = _HEADER.unpack_from(buffer)
+        if magic != _MAGIC or file_format != _FORMAT_VERSION:
+            raise ValueError(f"Unsupported catalog file: {path}")
+
+        self.path = path
+        self._version: int = version
+        self._tables = {
+            schema.name: _MappedTable.parse(buffer, offset, schema)
+            for schema, offset in zip(_TABLES, offsets, strict=True)
+        }
+
+    @property
+    def version(self) -> int:
+        """Версия справочников, записанная в заголовке файла."""
+        return self._version
+
+    def get_product(self, product_id: int) -> CatalogProduct | None:
+        """Продукт по идентификатору или ``None``."""
+        table = self._tables[_PRODUCTS.name]
+        row = table.find_one(product_id)
+        if row is None:
+            return None
+        return CatalogProduct(
+            product_id, table.text(0, row), table.text(1, row)
+        )
+
+    def get_hint(self, hint_id: int) -> CatalogHint | None:
+        """Подсказка по идентификатору или ``None``."""
+        table = self._tables[_HINTS.name]
+        row = table.find_one(hint_id)
+        if row is None:
+            return None
+        return CatalogHint(hint_id, table.ints[0][row], table.text(0, row))
+
+    def get_success_reviews(self) -> Sequence[str]:
+        """Отзывы за верный ответ, строки читаются из файла по запросу."""
+        table = self._tables[_SUCCESS_REVIEWS.name]
+        return table.column(0, 0, len(table.keys))
+
+    def get_lost_reviews(self, product_id: int) -> Sequence[str]:
+        """Отзывы за продукт, которого не хватило в ответе."""
+        table = self._tables[_LOST_REVIEWS.name]
+        return table.column(0, *table.find(product_id))
+
+    def get_incorrect_reviews(self, product_id: int) -> Sequence[str]:
+        """Отзывы за лишний продукт в ответе."""
+        table = self._tables[_INCORRECT_REVIEWS.name]
+        return table.column(0, *table.find(product_id))
+
+    def get_situation(self, situation_id: int) -> CatalogSituation | None:
+        """Тексты ситуации по идентификатору или ``None``."""
+        table = self._tables[_SITUATIONS.name]
+        row = table.find_one(situation_id)
+        if row is None:
+            return None
+        return CatalogSituation(
+            situation_id,
+            table.text(0, row),
+            table.text(1, row),
+        )
+
+    def get_client_feature(
+        self,
+        feature: ClientFeature,
+        feature_id: int,
+    ) -> str | None:
+        """Значение признака клиента по идентификатору или ``None``."""
+        table = self._tables[_CLIENT_FEATURES[feature].name]
+        row = table.find_one(feature_id)
+        if row is None:
+            return None
+        return table.text(0, row)
+
+
+def _catalog_path(directory: Path, version: int) -> Path:
+    return directory / f"{_FILE_PREFIX}{version}{_FILE_SUFFIX}"
+
+
+def _remove_stale_files(directory: Path, version: int) -> None:
+    # Уже открытые отображения остаются валидными и после удаления файла.
+    for path in directory.glob(f"{_FILE_PREFIX}*{_FILE_SUFFIX}"):
+        file_version = path.name.removeprefix(_FILE_PREFIX).removesuffix(
+            _FILE_SUFFIX
+        )
+        if file_version.isdigit() and int(file_version) < version:
+            path.unlink(missing_ok=True)
+
+
+def open_shared_catalog(directory: str | Path, version: int) -> MappedCatalog:
+    """
+    Открывает файл справочников нужной версии, собирая его при отсутствии.
+
+    Несколько воркеров могут собрать один и тот же файл одновременно:
+    содержимое у них одинаковое, а замена файла атомарна.
+    """
+    directory = Path(directory)
+    # Файла ещё нет или его только что удалил воркер с новой версией:
+    with contextlib.suppress(FileNotFoundError):
+        return MappedCatalog(_catalog_path(directory, version))
+
+    directory.mkdir(parents=True, exist_ok=True)
+    catalog = MappedCatalog(write_catalog_file(Catalog.load(), directory))
+    _remove_stale_files(directory, catalog.version)
+    return catalog
@@ -0,0 +1,107 @@
+"""
+Сохранённые итоги дня для повторных ``/acknowledgeDayFinish``.
+
+Мобильные клиенты повторяют запрос при обрывах связи, и каждый повтор
+заново считал отзывы и рейтинг всех итераций. Итог хранится по сиду
+и хешу отправленных ответов, повтор читает его одной выборкой.
+Одновременные одинаковые запросы ждут друг друга
+на advisory-блокировке, и итог считается один раз.
+"""
+
+import hashlib
+from typing import Any
+
+import orjson
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.db import connections, router, transaction
+
+from server.apps.game.models import DayResultModel
+from server.apps.game.services import (
+    answer_stats,
+    day_sessions,
+    generation,
+    leaderboard,
+)
+from server.apps.game.services.dto import AcknowledgeDayFinish
+
+
+def answers_hash(data: AcknowledgeDayFinish) -> str:
+    """Хеш отправленных ответов дня, ключ сохранённого итога."""
+    # Порядок ответов и продуктов сохраняется, от него зависят отзывы:
+    return hashlib.sha256(
+        orjson.dumps([
+            [answer.iteration, answer.recommended_product_ids]
+            for answer in data.answers
+        ]),
+    ).hexdigest()
+
+
+def _stored_query(data: AcknowledgeDayFinish, key: str) -> Any:
+    # Только с основной бд: реплика может ещё не получить итог,
+    # записанный прошлой попыткой, и его посчитали бы заново.
+    using = router.db_for_write(DayResultModel)
+    return (
+        DayResultModel.objects.using(using)
+        .filter(seed=data.seed, answers_hash=key)
+        .values_list("response", flat=True)
+    )
+
+
+def _lock(using: str, data: AcknowledgeDayFinish, key: str) -> None:
+    lock_id = int.from_bytes(
+        hashlib.blake2b(f"{data.seed}:{key}".encode(), digest_size=8).digest(),
+        signed=True,
+    )
+    with connections[using].cursor() as cursor:
+        cursor.execute("SELECT pg_advisory_xact_lock(%s)", [lock_id])
+
+
+def _compute(data: AcknowledgeDayFinish) -> dict[str, Any]:
+    if settings.GAME_DAY_SESSIONS:
+        response = day_sessions.acknowledge_day_finish(data)
+    else:
+        response = generation.acknowledge_day_finish(data)
+    return response.model_dump(mode="json")
+
+
+def _compute_and_store(data: AcknowledgeDayFinish, key: str) -> dict[str, Any]:
+    using = router.db_for_write(DayResultModel)
+    with transaction.atomic(using=using):
+        _lock(using, data, key)
+        # Пока ждали блокировку, итог мог записать другой запрос:
+        stored = _stored_query(data, key).first()
+        if stored is not None:
+            return stored  # type: ignore[no-any-return]
+
+        response = _compute(data)
+        DayResultModel.objects.using(using).create(
+            seed=data.seed,
+            answers_hash=key,
+            response=response,
+        )
+        # В таблицу лидеров и статистику ответов попадает только первый
+        # итог дня, повторная отправка других ответов их не искажает:
+        rating = response["total_rating"]
+        if leaderboard.record_rating(data.seed, rating, using):
+            answer_stats.record_day(data, response, using)
+    return response
+
+
+def acknowledge_day_finish(data: AcknowledgeDayFinish) -> dict[str, Any]:
+    """Ответ ``/acknowledgeDayFinish`` в виде данных для сериализации."""
+    key = answers_hash(data)
+    stored = _stored_query(data, key).first()
+    if stored is not None:
+        return stored  # type: ignore[no-any-return]
+    return _compute_and_store(data, key)
+
+
+async def aacknowledge_day_finish(data: AcknowledgeDayFinish) -> dict[str, Any]:
+    """Асинхронная версия ``acknowledge_day_finish``."""
+    key = answers_hash(data)
+    stored = await _stored_query(data, key).afirst()
+    if stored is not None:
+        return stored  # type: ignore[no-any-return]
+    # Транзакции и блокировки в async ORM недоступны, считаем в потоке:
+    return await sync_to_async(_compute_and_store)(data, key)
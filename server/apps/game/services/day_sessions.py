@@ -0,0 +1,394 @@
+"""
+Хранение игрового дня одной строкой на сид.
+
+Вместо строки :class:`GenerationModel` с четырьмя ответами и десятком
+внешних ключей каждая итерация хранится записью из идентификаторов
+в ``DaySessionModel.iterations``. День читается одним запросом по
+уникальному индексу сида, а названия и тексты берутся из снимка справочников.
+"""
+
+import dataclasses
+import json
+import uuid
+from collections.abc import Callable, Iterable
+from typing import Any, Final, Self
+
+from django.db import connections, router
+
+from server.apps.game.models import DaySessionModel
+from server.apps.game.services.catalog import (
+    CatalogReader,
+    ClientFeature,
+    get_catalog,
+    reset_catalog,
+)
+from server.apps.game.services.dto import (
+    AcknowledgeDayFinish,
+    AcknowledgeDayFinishResponse,
+    Client,
+    GenerateChunkSituation,
+    GenerateHints,
+    GenerateSituationParams,
+    Product,
+    Situation,
+    SituationAnswer,
+    SituationHint,
+    shuffle_answers,
+)
+from server.apps.game.services.generation import (
+    SituationGeneration,
+    build_generation,
+    review_answers,
+)
+from server.apps.game.services.payloads import sprite_url
+
+# Уже сохранённые итерации важнее новых, они могли быть отданы игроку:
+_APPEND_SQL: Final = """
+    INSERT INTO {table} (seed, iterations) VALUES (%s, %s::jsonb)
+    ON CONFLICT (seed) DO UPDATE
+    SET iterations = EXCLUDED.iterations || {table}.iterations
+"""
+
+
+@dataclasses.dataclass(frozen=True, slots=True)
+class GenerationRecord:
+    """Итерация дня: выбранные идентификаторы без загруженных объектов."""
+
+    situation_id: int
+    client_gender: str
+    client_age_id: int
+    client_job_id: int
+    client_is_married: bool
+    client_is_have_child: bool
+    client_is_have_real_estate: bool
+    client_city_id: int
+    client_sprite_id: int
+    client_first_name_id: int
+    client_last_name_id: int
+    hint_id: int
+    correct_product_ids: tuple[int, ...]
+    incorrect_product_ids: tuple[int, ...]
+
+    @classmethod
+    def from_generation(cls, situation_generation: SituationGeneration) -> Self:
+        """Запись несохранённой генерации."""
+        generation = situation_generation.generation
+        return cls(
+            situation_id=generation.situation_id,
+            client_gender=generation.client_gender,
+            client_age_id=generation.client_age_id,
+            client_job_id=generation.client_job_id,
+            client_is_married=generation.client_is_married,
+            client_is_have_child=generation.client_is_have_child,
+            client_is_have_real_estate=generation.client_is_have_real_estate,
+            client_city_id=generation.client_city_id,
+            client_sprite_id=generation.client_sprite_id,
+            client_first_name_id=generation.client_first_name_id,
+            client_last_name_id=generation.client_last_name_id,
+            hint_id=generation.hint_id,
+            correct_product_ids=tuple(generation.correct_product_ids or ()),
+            incorrect_product_ids=tuple(
+                generation.incorrect_product_ids or (),
+            ),
+        )
+
+    @classmethod
+    def from_json(cls, data: dict[str, Any]) -> Self:
+        """Запись из ``DaySessionModel.iterations``."""
+        return cls(
+            **{
+                **data,
+                "correct_product_ids": tuple(data["correct_product_ids"]),
+                "incorrect_product_ids": tuple(data["incorrect_product_ids"]),
+            },
+        )
+
+    def to_json(self) -> dict[str, Any]:
+        """Запись для ``DaySessionModel.iterations``."""
+        return dataclasses.asdict(self)
+
+
+class _CatalogMissError(LookupError):
+    """Запись ссылается на справочник, загруженный после снимка."""
+
+
+def get_day_records(seed: uuid.UUID) -> dict[int, GenerationRecord]:
+    """Сохранённые итерации дня по номерам."""
+    iterations = (
+        DaySessionModel.objects.filter(seed=seed)
+        .values_list("iterations", flat=True)
+        .first()
+    ) or {}
+    return {
+        int(iteration): GenerationRecord.from_json(record)
+        for iteration, record in iterations.items()
+    }
+
+
+def append_day_records(
+    seed: uuid.UUID,
+    records: dict[int, GenerationRecord],
+) -> None:
+    """Атомарно дописывает итерации, не перезаписывая уже сохранённые."""
+    if not records:
+        return
+
+    payload = {
+        str(iteration): record.to_json()
+        for iteration, record in records.items()
+    }
+    connection = connections[router.db_for_write(DaySessionModel)]
+    with connection.cursor() as cursor:
+        cursor.execute(
+            _APPEND_SQL.format(
+                table=connection.ops.quote_name(
+                    DaySessionModel._meta.db_table,  # noqa: SLF001
+                ),
+            ),
+            [seed, json.dumps(payload)],
+        )
+
+
+def _ensure_records(
+    seed: uuid.UUID,
+    iterations: list[int],
+) -> dict[int, GenerationRecord]:
+    records = get_day_records(seed)
+    new_records = {
+        iteration: GenerationRecord.from_generation(
+            build_generation(
+                GenerateSituationParams(seed=seed, num_iterations=iteration),
+            ),
+        )
+        for iteration in dict.fromkeys(iterations)
+        if iteration not in records
+    }
+    append_day_records(seed, new_records)
+    return records | new_records
+
+
+def _with_catalog[T](build: Callable[[CatalogReader], T]) -> T:
+    try:
+        return build(get_catalog())
+    except _CatalogMissError:
+        # Итерацию сгенерировали по записи, которой ещё нет в снимке:
+        reset_catalog()
+        return build(get_catalog())
+
+
+def _lookup[T](value: T | None) -> T:
+    if value is None:
+        raise _CatalogMissError
+    return value
+
+
+def _product(catalog: CatalogReader, product_id: int) -> Product:
+    return Product.from_trusted(_lookup(catalog.get_product(product_id)))
+
+
+def _client(
+    record: GenerationRecord,
+    catalog: CatalogReader,
+    sprite_link: Callable[[str], str] = sprite_url,
+) -> Client:
+    situation = _lookup(catalog.get_situation(record.situation_id))
+    sprite_name = _lookup(
+        catalog.get_client_feature(
+            ClientFeature.SPRITE, record.client_sprite_id
+        ),
+    )
+    return Client.model_construct(
+        first_name=_lookup(
+            catalog.get_client_feature(
+                ClientFeature.FIRST_NAME,
+                record.client_first_name_id,
+            ),
+        ),
+        last_name=_lookup(
+            catalog.get_client_feature(
+                ClientFeature.LAST_NAME,
+                record.client_last_name_id,
+            ),
+        ),
+        gender=record.client_gender,
+        age=_lookup(
+            catalog.get_client_feature(
+                ClientFeature.AGE_GROUP,
+                record.client_age_id,
+            ),
+        ),
+        job_sphere=_lookup(
+            catalog.get_client_feature(
+                ClientFeature.JOB_SPHERE,
+                record.client_job_id,
+            ),
+        ),
+        is_married=record.client_is_married,
+        is_have_child=record.client_is_have_child,
+        is_have_real_estate=record.client_is_have_real_estate,
+        city=_lookup(
+            catalog.get_client_feature(
+                ClientFeature.CITY, record.client_city_id
+            ),
+        ),
+        message=(
+            situation.female_text
+            if record.client_gender == "female"
+            else situation.male_text
+        ),
+        sprite=sprite_link(sprite_name),
+    )
+
+
+def _hint(record: GenerationRecord, catalog: CatalogReader) -> SituationHint:
+    hint = _lookup(catalog.get_hint(record.hint_id))
+    return SituationHint.model_construct(
+        product=_product(catalog, hint.product_id),
+        text=hint.text,
+    )
+
+
+def _situation(
+    generation_params: GenerateSituationParams,
+    record: GenerationRecord,
+    catalog: CatalogReader,
+    sprite_link: Callable[[str], str] = sprite_url,
+) -> Situation:
+    answers = [
+        SituationAnswer.model_construct(
+            product=_product(catalog, product_id),
+            is_correct=True,
+        )
+        for product_id in record.correct_product_ids
+    ] + [
+        SituationAnswer.model_construct(
+            product=_product(catalog, product_id),
+            is_correct=False,
+        )
+        for product_id in record.incorrect_product_ids
+    ]
+    return Situation.model_construct(
+        generation_params=generation_params,
+        client=_client(record, catalog, sprite_link),
+        answers=shuffle_answers(answers, generation_params),
+        hint=_hint(record, catalog),
+    )
+
+
+def generate_situation(
+    generation_params: GenerateSituationParams,
+    sprite_link: Callable[[str], str] = sprite_url,
+) -> Situation:
+    """Ситуация итерации дня, недостающая итерация дописывается в день."""
+    record = _ensure_records(
+        generation_params.seed,
+        [generation_params.num_iterations],
+    )[generation_params.num_iterations]
+    return _with_catalog(
+        lambda catalog: _situation(
+            generation_params,
+            record,
+            catalog,
+            sprite_link,
+        ),
+    )
+
+
+def get_hint(generation_params: GenerateSituationParams) -> SituationHint:
+    """Подсказка к итерации дня."""
+    record = _ensure_records(
+        generation_params.seed,
+        [generation_params.num_iterations],
+    )[generation_params.num_iterations]
+    return _with_catalog(lambda catalog: _hint(record, catalog))
+
+
+def get_situation_ids(
+    seed: uuid.UUID,
+    iterations: Iterable[int],
+) -> dict[int, int]:
+    """Ситуации сохранённых итераций дня."""
+    records = get_day_records(seed)
+    return {
+        iteration: records[iteration].situation_id
+        for iteration in iterations
+        if iteration in records
+    }
+
+
+def get_hints(hints_data: GenerateHints) -> list[SituationHint]:
+    """Подсказки итераций дня в порядке запроса."""
+    records = _ensure_records(hints_data.seed, hints_data.iterations)
+    return _with_catalog(
+        lambda catalog: [
+            _hint(records[iteration], catalog)
+            for iteration in hints_data.iterations
+        ],
+    )
+
+
+def pregenerate_situation(generation_params: GenerateSituationParams) -> bool:
+    """Создаёт итерацию заранее, ``False`` если она уже есть."""
+    seed = generation_params.seed
+    iteration = generation_params.num_iterations
+    if iteration in get_day_records(seed):
+        return False
+    append_day_records(
+        seed,
+        {
+            iteration: GenerationRecord.from_generation(
+                build_generation(generation_params),
+            ),
+        },
+    )
+    return True
+
+
+def generate_chunk_situations(
+    generation_data: GenerateChunkSituation,
+) -> list[Situation]:
+    """Ситуации окна чанка, недостающие итерации дописываются в день."""
+    iterations = list(generation_data.iterations)
+    records = _ensure_records(generation_data.seed, iterations)
+    return _with_catalog(
+        lambda catalog: [
+            _situation(
+                GenerateSituationParams(
+                    seed=generation_data.seed,
+                    num_iterations=iteration,
+                ),
+                records[iteration],
+                catalog,
+            )
+            for iteration in iterations
+        ],
+    )
+
+
+def acknowledge_day_finish(
+    data: AcknowledgeDayFinish,
+) -> AcknowledgeDayFinishResponse:
+    """Итог дня по записям итераций."""
+    records = _ensure_records(
+        data.seed,
+        [ans.iteration for ans in data.answers],
+    )
+
+    def _review(catalog: CatalogReader) -> AcknowledgeDayFinishResponse:
+        return AcknowledgeDayFinishResponse.model_construct(
+            reviews=[
+                review_answers(
+                    GenerateSituationParams(
+                        seed=data.seed,
+                        num_iterations=ans.iteration,
+                    ),
+                    list(records[ans.iteration].correct_product_ids),
+                    _client(records[ans.iteration], catalog),
+                    ans.recommended_product_ids,
+                    catalog,
+                )
+                for ans in data.answers
+            ],
+        )
+
+    return _with_catalog(_review)
@@ -1,12 +1,27 @@
+import datetime
 import enum
+import functools
 import random
-from typing import TYPE_CHECKING, Self
+from collections.abc import Sequence
+from typing import TYPE_CHECKING, Any, Self
 from uuid import UUID
 
-from pydantic import AnyHttpUrl, BaseModel, Field, computed_field
+from django.conf import settings
+from pydantic import (
+    AnyHttpUrl,
+    BaseModel,
+    Field,
+    NonNegativeInt,
+    computed_field,
+    field_validator,
+    model_validator,
+)
+
+from server.apps.game.services import pagination
+from server.apps.game.services.catalog import get_catalog_products
 
 if TYPE_CHECKING:
-    from server.apps.game.models import GenerationModel
+    from server.apps.game.models import GenerationModel, HintModel
 
 
 class Client(BaseModel):
@@ -41,7 +56,8 @@ class Client(BaseModel):
         if generation_instance.client_gender == "female":
             data["message"] = generation_instance.situation.female_text
 
-        return cls.model_validate(data)
+        # Данные из своей бд, проверять каждое поле на каждом ответе незачем:
+        return cls.model_construct(**data)
 
 
 class Product(BaseModel):
@@ -49,6 +65,17 @@ class Product(BaseModel):
     name: str = Field(description="Наименование продукта")
     link: AnyHttpUrl = Field(description="Ссылка на продукт")
 
+    @classmethod
+    def from_trusted(cls, product: Any) -> "Product":
+        """Продукт из справочника, ссылка проверяется один раз на продукт."""
+        return _trusted_product(product.id, product.name, product.link)
+
+
+@functools.lru_cache(maxsize=4096)
+def _trusted_product(product_id: int, name: str, link: str) -> Product:
+    # Экземпляры общие для всех ответов, их нельзя изменять:
+    return Product(id=product_id, name=name, link=link)  # type: ignore[arg-type]
+
 
 class GenerateSituationParams(BaseModel):
     seed: UUID = Field(description="Сид ранддомной генерации.")
@@ -61,11 +88,51 @@ class SituationAnswer(BaseModel):
     product: Product
     is_correct: bool
 
+    @classmethod
+    def from_product_ids(
+        cls,
+        correct_product_ids: Sequence[int],
+        incorrect_product_ids: Sequence[int],
+    ) -> list[Self]:
+        """Ответы по упакованным идентификаторам и снимку справочников."""
+        products = get_catalog_products(
+            [*correct_product_ids, *incorrect_product_ids],
+        )
+        return [
+            cls.model_construct(
+                product=Product.from_trusted(product),
+                is_correct=index < len(correct_product_ids),
+            )
+            for index, product in enumerate(products)
+        ]
+
 
 class SituationHint(BaseModel):
     product: Product
     text: str
 
+    @classmethod
+    def from_hint_model(cls, hint: "HintModel") -> Self:
+        """Подсказка из модели без повторной валидации."""
+        return cls.model_construct(
+            product=Product.from_trusted(hint.product),
+            text=hint.text,
+        )
+
+    @classmethod
+    def from_row(
+        cls,
+        text: str,
+        product_id: int,
+        product_name: str,
+        product_link: str,
+    ) -> Self:
+        """Подсказка из узкой выборки текста и полей продукта."""
+        return cls.model_construct(
+            product=_trusted_product(product_id, product_name, product_link),
+            text=text,
+        )
+
 
 class Situation(BaseModel):
     generation_params: GenerateSituationParams = Field(
@@ -79,23 +146,65 @@ class Situation(BaseModel):
     hint: SituationHint
 
     @classmethod
-    def from_generation_model(cls, generation: "GenerationModel") -> Self:
-        answers = [
-            SituationAnswer.model_validate(ans, from_attributes=True)
-            for ans in generation.answers.all()
-        ]
-        random.shuffle(answers)
-        data = {
-            "generation_params": GenerateSituationParams(
-                seed=generation.seed,
-                num_iterations=generation.iteration,
-            ),
-            "client": Client.from_generation(generation),
-            "answers": answers,
-            "hint": SituationHint.model_validate(generation.hint, from_attributes=True),
-        }
+    def from_generation_model(
+        cls,
+        generation: "GenerationModel",
+        *,
+        shuffle: bool = True,
+    ) -> Self:
+        """Ситуация из генерации с загруженными связанными объектами."""
+        generation_params = GenerateSituationParams.model_construct(
+            seed=generation.seed,
+            num_iterations=generation.iteration,
+        )
+        if generation.correct_product_ids is None:
+            answers = [
+                SituationAnswer.model_construct(
+                    product=Product.from_trusted(ans.product),
+                    is_correct=ans.is_correct,
+                )
+                for ans in generation.prefetched_answers
+            ]
+        else:
+            answers = SituationAnswer.from_product_ids(
+                generation.correct_product_ids,
+                generation.incorrect_product_ids or (),
+            )
+        if shuffle:
+            answers = shuffle_answers(answers, generation_params)
+        return cls.model_construct(
+            generation_params=generation_params,
+            client=Client.from_generation(generation),
+            answers=answers,
+            hint=SituationHint.from_hint_model(generation.hint),
+        )
+
+
+def shuffle_answers[T](
+    answers: Sequence[T],
+    generation_params: GenerateSituationParams,
+) -> list[T]:
+    """Перемешивает ответы итерации одинаково для одних и тех же запросов."""
+    random_instance = random.Random(  # noqa: S311
+        f"{generation_params.seed}:{generation_params.num_iterations}",
+    )
+    return random_instance.sample(answers, len(answers))
 
-        return cls.model_validate(data)
+
+class GenerateHints(BaseModel):
+    seed: UUID = Field(description="Сид ранддомной генерации.")
+    iterations: list[NonNegativeInt] = Field(
+        description=(
+            "Итерации, подсказки которых нужны, не больше максимума чанка"
+        ),
+    )
+
+    @field_validator("iterations")
+    @classmethod
+    def _check_iterations(cls, iterations: list[int]) -> list[int]:
+        if len(iterations) > settings.GAME_CHUNK_MAX_ITERATIONS:
+            raise ValueError("Too many iterations")
+        return iterations
 
 
 class ValidateSituationAnswer(BaseModel):
@@ -146,4 +255,83 @@ class AcknowledgeDayFinishResponse(BaseModel):
 
 class GenerateChunkSituation(BaseModel):
     seed: UUID
-    total_iterations: int
+    total_iterations: int = Field(
+        ge=0,
+        description="Количество итераций в дне, не больше серверного максимума",
+    )
+    start_iteration: int = Field(
+        default=0, ge=0, description="Первая итерация окна"
+    )
+    limit: int | None = Field(
+        default=None,
+        ge=1,
+        description="Размер окна, не больше серверного максимума",
+    )
+    cursor: str | None = Field(
+        default=None,
+        description="Курсор следующего окна из ответа на предыдущее",
+    )
+
+    @field_validator("total_iterations")
+    @classmethod
+    def _check_total_iterations(cls, total_iterations: int) -> int:
+        if total_iterations > settings.GAME_DAY_MAX_ITERATIONS:
+            raise ValueError("Too many iterations")
+        return total_iterations
+
+    @model_validator(mode="after")
+    def _apply_cursor(self) -> Self:
+        if self.cursor is not None:
+            self.start_iteration = pagination.load_cursor(
+                self.cursor,
+                self.seed,
+            )
+        return self
+
+    @property
+    def iterations(self) -> range:
+        """Итерации, которые генерирует этот запрос."""
+        return pagination.iteration_window(
+            self.start_iteration,
+            self.total_iterations,
+            self.limit,
+        )
+
+    @property
+    def next_cursor(self) -> str | None:
+        """Курсор следующего окна, ``None`` если это окно последнее."""
+        next_iteration = self.iterations.stop
+        if next_iteration >= self.total_iterations:
+            return None
+        return pagination.dump_cursor(self.seed, next_iteration)
+
+
+class LeaderboardPeriod(enum.StrEnum):
+    DAY = enum.auto()
+    WEEK = enum.auto()
+    ALL = enum.auto()
+
+
+class LeaderboardEntry(BaseModel):
+    seed: UUID
+    rating: int
+    rank: int = Field(description="Место, игроки с равным рейтингом делят его")
+
+
+class Leaderboard(BaseModel):
+    period: LeaderboardPeriod
+    period_start: datetime.date | None = Field(
+        description="Первый день периода, пусто для всего времени",
+    )
+    players: int = Field(description="Количество игроков за период")
+    top: list[LeaderboardEntry]
+
+
+class LeaderboardRank(BaseModel):
+    period: LeaderboardPeriod
+    period_start: datetime.date | None = Field(
+        description="Первый день периода, пусто для всего времени",
+    )
+    players: int = Field(description="Количество игроков за период")
+    rating: int
+    rank: int
@@ -0,0 +1,205 @@
+"""
+Потоковая выгрузка истории генераций для аналитики.
+
+Строки читаются пачками по ``id`` (``id > последний id`` и ``LIMIT``)
+и пишутся в файлы по порядку ``id``, так что в памяти держится
+не больше одной пачки строк. Курсор на стороне сервера для этого
+не годится: за PgBouncer серверные курсоры отключены,
+и ``QuerySet.iterator()`` загрузил бы всю выборку.
+Файл получает имя по первому и последнему ``id`` только после того,
+как записан целиком, поэтому выгрузку можно продолжить с последнего
+готового файла.
+"""
+
+import csv
+import datetime
+import itertools
+import re
+import uuid
+from collections.abc import Iterable, Iterator
+from pathlib import Path
+from typing import Any, Final
+
+from django.db.models import QuerySet
+
+from server.apps.game.models import GenerationAnswerModel, GenerationModel
+
+FORMATS: Final = ("csv", "parquet")
+
+COLUMNS: Final = (
+    "id",
+    "created_on",
+    "seed",
+    "iteration",
+    "situation_id",
+    "client_gender",
+    "client_age_id",
+    "client_job_id",
+    "client_is_married",
+    "client_is_have_child",
+    "client_is_have_real_estate",
+    "client_city_id",
+    "client_sprite_id",
+    "client_first_name_id",
+    "client_last_name_id",
+    "hint_id",
+    "correct_product_ids",
+    "incorrect_product_ids",
+)
+
+_FILE_NAME: Final = re.compile(
+    r"^generations-(?P<first>\d+)-(?P<last>\d+)\.(?:csv|parquet)$",
+)
+
+type Row = tuple[Any, ...]
+
+
+def filter_generations(
+    *,
+    since: datetime.date | None = None,
+    until: datetime.date | None = None,
+    seed_from: uuid.UUID | None = None,
+    seed_to: uuid.UUID | None = None,
+    after_id: int = 0,
+) -> QuerySet[GenerationModel]:
+    """Генерации по дням создания и диапазону сидов, включая границы."""
+    queryset = GenerationModel.objects.filter(pk__gt=after_id)
+    if since is not None:
+        queryset = queryset.filter(created_on__gte=since)
+    if until is not None:
+        queryset = queryset.filter(created_on__lte=until)
+    if seed_from is not None:
+        queryset = queryset.filter(seed__gte=seed_from)
+    if seed_to is not None:
+        queryset = queryset.filter(seed__lte=seed_to)
+    return queryset
+
+
+def generation_rows(
+    queryset: QuerySet[GenerationModel],
+    chunk_size: int,
+) -> Iterator[Row]:
+    """Строки :data:`COLUMNS` по возрастанию ``id``."""
+    rows = queryset.order_by("pk").values_list(*COLUMNS)
+    last_id = 0
+    while chunk := list(rows.filter(pk__gt=last_id)[:chunk_size]):
+        last_id = chunk[-1][0]
+        legacy_answers = _answer_rows(
+            [row[0] for row in chunk if row[-2] is None],
+        )
+        for row in chunk:
+            if row[-2] is None:
+                yield (*row[:-2], *legacy_answers.get(row[0], ((), ())))
+            else:
+                yield row
+
+
+def _answer_rows(
+    generation_ids: list[int],
+) -> dict[int, tuple[tuple[int, ...], tuple[int, ...]]]:
+    # Старые генерации без упакованных ответов, одним запросом на пачку:
+    if not generation_ids:
+        return {}
+    answers: dict[int, tuple[list[int], list[int]]] = {}
+    for generation_id, product_id, is_correct in (
+        GenerationAnswerModel.objects.filter(generation_id__in=generation_ids)
+        .order_by("pk")
+        .values_list("generation_id", "product_id", "is_correct")
+    ):
+        correct, incorrect = answers.setdefault(generation_id, ([], []))
+        (correct if is_correct else incorrect).append(product_id)
+    return {
+        generation_id: (tuple(correct), tuple(incorrect))
+        for generation_id, (correct, incorrect) in answers.items()
+    }
+
+
+def last_exported_id(output_dir: Path) -> int:
+    """Последний ``id`` среди полностью записанных файлов выгрузки."""
+    last_ids = [
+        int(match["last"])
+        for path in output_dir.iterdir()
+        if (match := _FILE_NAME.match(path.name)) is not None
+    ]
+    return max(last_ids, default=0)
+
+
+def export_rows(
+    rows: Iterable[Row],
+    output_dir: Path,
+    *,
+    file_format: str = "csv",
+    rows_per_file: int = 100_000,
+    chunk_size: int = 2000,
+) -> Iterator[Path]:
+    """Пишет строки в файлы по ``rows_per_file`` и отдаёт готовые файлы."""
+    write = _write_parquet if file_format == "parquet" else _write_csv
+    rows = iter(rows)
+    while first_row := next(rows, None):
+        name = f"generations-{first_row[0]:012d}"
+        part = output_dir / f"{name}.{file_format}.part"
+        file_rows = itertools.islice(
+            itertools.chain((first_row,), rows),
+            rows_per_file,
+        )
+        last_id = write(part, file_rows, chunk_size)
+        path = output_dir / f"{name}-{last_id:012d}.{file_format}"
+        part.replace(path)
+        yield path
+
+
+def _write_csv(path: Path, rows: Iterable[Row], chunk_size: int) -> int:
+    last_id = 0
+    with path.open("w", newline="", encoding="utf-8") as csv_file:
+        writer = csv.writer(csv_file)
+        writer.writerow(COLUMNS)
+        for row in rows:
+            writer.writerow(
+                (
+                    *row[:-2],
+                    " ".join(map(str, row[-2])),
+                    " ".join(map(str, row[-1])),
+                ),
+            )
+            last_id = row[0]
+    return last_id
+
+
+def _write_parquet(path: Path, rows: Iterable[Row], chunk_size: int) -> int:
+    # Необязательная зависимость, нужна только для выгрузки в Parquet:
+    import pyarrow as pa  # noqa: PLC0415
+    import pyarrow.parquet as pq  # noqa: PLC0415
+
+    ids = pa.int64()
+    product_ids = pa.list_(pa.int32())
+    schema = pa.schema(
+        [
+            ("id", ids),
+            ("created_on", pa.date32()),
+            ("seed", pa.string()),
+            ("iteration", pa.int16()),
+            ("situation_id", ids),
+            ("client_gender", pa.string()),
+            ("client_age_id", ids),
+            ("client_job_id", ids),
+            ("client_is_married", pa.bool_()),
+            ("client_is_have_child", pa.bool_()),
+            ("client_is_have_real_estate", pa.bool_()),
+            ("client_city_id", ids),
+            ("client_sprite_id", ids),
+            ("client_first_name_id", ids),
+            ("client_last_name_id", ids),
+            ("hint_id", ids),
+            ("correct_product_ids", product_ids),
+            ("incorrect_product_ids", product_ids),
+        ],
+    )
+    last_id = 0
+    with pq.ParquetWriter(path, schema) as writer:
+        # Каждая пачка строк становится отдельной группой строк файла:
+        for chunk in itertools.batched(rows, chunk_size):
+            batch = dict(zip(COLUMNS, zip(*chunk, strict=True), strict=True))
+            batch["seed"] = tuple(map(str, batch["seed"]))
+            writer.write_table(pa.Table.from_pydict(batch, schema=schema))
+            last_id = chunk[-1][0]
+    return last_id
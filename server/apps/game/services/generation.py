@@ -1,36 +1,58 @@
 import dataclasses
 import itertools
 import random
-from collections import defaultdict
-from typing import Final, Self, TypeVar, Iterable
-
-from django.db.models import Prefetch, QuerySet, Model
+import uuid
+from collections.abc import AsyncIterator, Callable, Iterable, Iterator
+from typing import Any, Final, Self, TypeVar
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.db.models import (
+    Model,
+    Prefetch,
+    Q,
+    QuerySet,
+    aprefetch_related_objects,
+    prefetch_related_objects,
+)
 
 from server.apps.game.models import (
     AgeGroupModel,
     CityModel,
+    FirstNameModel,
+    GenerationAnswerModel,
     GenerationModel,
     HintModel,
     JobSphereModel,
+    LastNameModel,
     ProductModel,
     ProductRecommendationConditionModel,
     SituationModel,
     SpriteModel,
-    GenerationAnswerModel,
-    ReviewModel,
-    FirstNameModel,
-    LastNameModel,
+)
+from server.apps.game.services import payloads
+from server.apps.game.services.catalog import (
+    CatalogReader,
+    get_catalog,
+    get_catalog_version,
+    with_products,
 )
 from server.apps.game.services.dto import (
-    GenerateSituationParams,
     AcknowledgeDayFinish,
     AcknowledgeDayFinishResponse,
-    Review,
-    Client,
-    ProductReview,
-    Product,
     AnswerStatusEnum,
+    Client,
     GenerateChunkSituation,
+    GenerateHints,
+    GenerateSituationParams,
+    Product,
+    ProductReview,
+    Review,
+    SituationHint,
+)
+from server.apps.game.services.write_behind import (
+    get_generation_writer,
+    save_generation,
 )
 
 TOTAL_POINTS: Final[int] = 10
@@ -104,6 +126,10 @@ ModelT = TypeVar("ModelT", bound=Model)
 
 
 def get_random_value_from_qs(feature_qs: QuerySet[ModelT], val: float) -> ModelT:
+    # Без сортировки порядок строк зависит от плана запроса,
+    # и один и тот же сид давал бы разные генерации:
+    if not feature_qs.ordered:
+        feature_qs = feature_qs.order_by("pk")
     feature_count = feature_qs.count()
     index = _get_index_from_random_val(val, feature_count)
     return feature_qs[index]
@@ -230,16 +256,14 @@ def _get_answers(
         if _is_client_satisfy_condition(generated_client, cond):
             correct_products_set.add(cond.product)
 
-    correct_product_list = list(correct_products_set)
+    correct_product_list = sorted(correct_products_set, key=lambda _: _.pk)
     other_products_qs = ProductModel.objects.exclude(
         id__in=[_.id for _ in correct_product_list]
-    )
+    ).order_by("pk")
 
     # Сколько можем в сумме выдать правильных ответов.
     count_correct_answers = (
-        len(correct_product_list)
-        if len(correct_product_list) < generation.correct_answers_num
-        else generation.correct_answers_num
+        min(generation.correct_answers_num, len(correct_product_list))
     )
 
     true_answers_indices = [
@@ -282,14 +306,28 @@ def _get_hint(
         generation.hint, len(generated_answers.correct_answers)
     )
     product_to_hint = generated_answers.correct_answers[answer_index]
-    hint_qs = HintModel.objects.filter(product=product_to_hint)
+    hint_qs = HintModel.objects.filter(product=product_to_hint).select_related(
+        "product"
+    )
     return HintGeneration(hint=get_random_value_from_qs(hint_qs, generation.hint))
 
 
-def _generate_situation(
+@dataclasses.dataclass
+class SituationGeneration:
+    """Сгенерированная, но еще не сохраненная ситуация."""
+
+    generation: GenerationModel
+    # Строки ответов для записи, пустые при компактном хранении ответов:
+    answers: list[GenerationAnswerModel]
+
+
+def build_generation(
     generation_params: GenerateSituationParams,
-) -> GenerationModel:
+) -> SituationGeneration:
+    """Подбирает ситуацию итерации, ничего не записывая в бд."""
     generation = get_generation(generation_params)
+    # Версию берём до выборки, чтобы ответ не оказался новее своих данных:
+    catalog_version = get_catalog().version
 
     situation_count = SituationModel.objects.count()
     # TODO: Подумать над этой семантикой как-то по-другому
@@ -306,8 +344,11 @@ def _generate_situation(
                 "city_condition",
             ),
         ),
-        "allowed_age_groups",
-    )[situation_index]
+        Prefetch(
+            "allowed_age_groups",
+            queryset=AgeGroupModel.objects.order_by("pk"),
+        ),
+    ).order_by("pk")[situation_index]
 
     generated_client = _get_client(
         situation,
@@ -323,20 +364,27 @@ def _generate_situation(
         generated_answers,
     )
 
-    generation_instance = GenerationModel.objects.create(
+    generation_instance = GenerationModel(
         seed=generation_params.seed,
         iteration=generation_params.num_iterations,
         situation=situation,
         **dataclasses.asdict(generated_client),
         **dataclasses.asdict(generated_hint),
+        correct_product_ids=[
+            product.id for product in generated_answers.correct_answers
+        ],
+        incorrect_product_ids=[
+            product.id for product in generated_answers.incorrect_answers
+        ],
     )
-    GenerationAnswerModel.objects.bulk_create(
+    answers = list(
         itertools.chain(
             [
                 GenerationAnswerModel(
                     generation=generation_instance,
                     product=product,
                     is_correct=True,
+                    created_on=generation_instance.created_on,
                 )
                 for product in generated_answers.correct_answers
             ],
@@ -345,47 +393,317 @@ def _generate_situation(
                     generation=generation_instance,
                     product=product,
                     is_correct=False,
+                    created_on=generation_instance.created_on,
                 )
                 for product in generated_answers.incorrect_answers
             ],
         )
     )
 
-    return generation_instance
+    # Все связанные объекты уже загружены, поэтому ответ можно отдать
+    # без повторной выборки только что созданной генерации.
+    generation_instance.prefetched_answers = answers
+    generation_instance.payload = payloads.render_payload(
+        generation_instance,
+        catalog_version,
+    )
 
+    return SituationGeneration(
+        generation=generation_instance,
+        answers=[] if settings.GAME_COMPACT_ANSWERS else answers,
+    )
 
-def _fetch_generation(generation_params: GenerateSituationParams) -> GenerationModel:
-    return (
-        GenerationModel.objects.select_related(
-            "situation",
-            "client_age",
-            "client_job",
-            "client_city",
-            "client_sprite",
-            "client_first_name",
-            "client_last_name",
-            "hint",
-            "hint__product",
-        )
-        .prefetch_related(
-            Prefetch(
-                "answers",
-                GenerationAnswerModel.objects.select_related("product"),
-            )
-        )
-        .get(
-            seed=generation_params.seed,
-            iteration=generation_params.num_iterations,
-        )
+
+def _get_pending_generation(
+    generation_params: GenerateSituationParams,
+) -> GenerationModel | None:
+    writer = get_generation_writer()
+    if writer is None:
+        return None
+    return writer.get(generation_params.seed, generation_params.num_iterations)
+
+
+def _queue_generation(
+    situation_generation: SituationGeneration,
+) -> GenerationModel | None:
+    writer = get_generation_writer()
+    if writer is None:
+        return None
+    return writer.put(situation_generation)
+
+
+def _generate_situation(
+    generation_params: GenerateSituationParams,
+) -> GenerationModel:
+    pending_generation = _get_pending_generation(generation_params)
+    if pending_generation is not None:
+        return pending_generation
+
+    situation_generation = build_generation(generation_params)
+    queued_generation = _queue_generation(situation_generation)
+    if queued_generation is not None:
+        return queued_generation
+
+    if not save_generation(situation_generation):
+        # Эту же итерацию параллельно сгенерировал другой запрос.
+        return _fetch_generation(generation_params)
+    return situation_generation.generation
+
+
+async def _agenerate_situation(
+    generation_params: GenerateSituationParams,
+) -> GenerationModel:
+    pending_generation = _get_pending_generation(generation_params)
+    if pending_generation is not None:
+        return pending_generation
+
+    # Подбор ситуации делает много мелких синхронных запросов,
+    # поэтому выполняется в потоке:
+    situation_generation = await sync_to_async(build_generation)(
+        generation_params,
+    )
+    queued_generation = _queue_generation(situation_generation)
+    if queued_generation is not None:
+        return queued_generation
+
+    # Генерация и её ответы пишутся одной транзакцией, как в синхронном
+    # пути, а транзакции в async ORM недоступны:
+    if not await sync_to_async(save_generation)(situation_generation):
+        return await _afetch_generation(generation_params)
+    return situation_generation.generation
+
+
+def _generation_queryset() -> QuerySet[GenerationModel]:
+    return GenerationModel.objects.select_related(
+        "situation",
+        "client_age",
+        "client_job",
+        "client_city",
+        "client_sprite",
+        "client_first_name",
+        "client_last_name",
+        "hint",
+        "hint__product",
+    )
+
+
+def _answer_rows_prefetch() -> Prefetch[GenerationAnswerModel]:
+    return Prefetch(
+        "answers",
+        # Порядок записи, в нём сначала идут правильные ответы генерации:
+        GenerationAnswerModel.objects.select_related("product").order_by("pk"),
+        to_attr="prefetched_answers",
+    )
+
+
+def _legacy_generations(
+    generations: list[GenerationModel],
+) -> list[GenerationModel]:
+    # Строки ответов читаем только для генераций без упакованных ответов:
+    return [
+        generation_instance
+        for generation_instance in generations
+        if generation_instance.correct_product_ids is None
+    ]
+
+
+def _prefetch_answer_rows(generations: list[GenerationModel]) -> None:
+    prefetch_related_objects(
+        _legacy_generations(generations),
+        _answer_rows_prefetch(),
+    )
+
+
+async def _aprefetch_answer_rows(generations: list[GenerationModel]) -> None:
+    await aprefetch_related_objects(
+        _legacy_generations(generations),
+        _answer_rows_prefetch(),
+    )
+
+
+def _iteration_queryset(
+    generation_params: GenerateSituationParams,
+) -> QuerySet[GenerationModel]:
+    return _generation_queryset().filter(
+        seed=generation_params.seed,
+        iteration=generation_params.num_iterations,
     )
 
 
+def _fetch_generation(
+    generation_params: GenerateSituationParams,
+) -> GenerationModel:
+    generation_instance = _iteration_queryset(generation_params).get()
+    _prefetch_answer_rows([generation_instance])
+    return generation_instance
+
+
+async def _afetch_generation(
+    generation_params: GenerateSituationParams,
+) -> GenerationModel:
+    generation_instance = await _iteration_queryset(generation_params).aget()
+    await _aprefetch_answer_rows([generation_instance])
+    return generation_instance
+
+
 def generate_situation(generation_params: GenerateSituationParams) -> GenerationModel:
     try:
         return _fetch_generation(generation_params)
     except GenerationModel.DoesNotExist:
-        _generate_situation(generation_params)
-        return _fetch_generation(generation_params)
+        return _generate_situation(generation_params)
+
+
+async def agenerate_situation(
+    generation_params: GenerateSituationParams,
+) -> GenerationModel:
+    """Асинхронная версия ``generate_situation``."""
+    try:
+        return await _afetch_generation(generation_params)
+    except GenerationModel.DoesNotExist:
+        return await _agenerate_situation(generation_params)
+
+
+def _situation_data(
+    generation_params: GenerateSituationParams,
+    generation_instance: GenerationModel,
+    catalog_version: int,
+    sprite_link: Callable[[str], str],
+) -> dict[str, Any]:
+    payload = generation_instance.payload
+    if not payloads.is_fresh(payload, catalog_version):
+        payload = payloads.render_payload(generation_instance, catalog_version)
+    return payloads.situation_data(generation_params, payload, sprite_link)
+
+
+def _payload_queryset(
+    generation_params: GenerateSituationParams,
+) -> QuerySet[GenerationModel, tuple[int, dict[str, Any] | None]]:
+    return GenerationModel.objects.filter(
+        seed=generation_params.seed,
+        iteration=generation_params.num_iterations,
+    ).values_list("pk", "payload")
+
+
+def generate_situation_data(
+    generation_params: GenerateSituationParams,
+    sprite_link: Callable[[str], str] = payloads.sprite_url,
+) -> dict[str, Any]:
+    """
+    Ответ ``/generateSituation`` в виде данных для сериализации.
+
+    Сохранённая итерация с актуальным готовым ответом читается
+    одной узкой выборкой, без соединений и без валидации.
+    """
+    catalog_version = get_catalog().version
+    stored = _payload_queryset(generation_params).first()
+    if stored is None:
+        generation_instance = _generate_situation(generation_params)
+    else:
+        pk, payload = stored
+        if payloads.is_fresh(payload, catalog_version):
+            return payloads.situation_data(
+                generation_params,
+                payload,
+                sprite_link,
+            )
+        # Ответ ещё не собран или справочники изменились:
+        generation_instance = _generation_queryset().get(pk=pk)
+        _prefetch_answer_rows([generation_instance])
+    return _situation_data(
+        generation_params,
+        generation_instance,
+        catalog_version,
+        sprite_link,
+    )
+
+
+async def agenerate_situation_data(
+    generation_params: GenerateSituationParams,
+    sprite_link: Callable[[str], str] = payloads.sprite_url,
+) -> dict[str, Any]:
+    """Асинхронная версия ``generate_situation_data``."""
+    catalog_version = (await sync_to_async(get_catalog)()).version
+    stored = await _payload_queryset(generation_params).afirst()
+    if stored is None:
+        generation_instance = await _agenerate_situation(generation_params)
+    else:
+        pk, payload = stored
+        if payloads.is_fresh(payload, catalog_version):
+            return payloads.situation_data(
+                generation_params,
+                payload,
+                sprite_link,
+            )
+        generation_instance = await _generation_queryset().aget(pk=pk)
+        await _aprefetch_answer_rows([generation_instance])
+    # Ответ может собираться из снимка справочников, а сброшенный снимок
+    # загружается синхронным ORM:
+    return await sync_to_async(_situation_data)(
+        generation_params,
+        generation_instance,
+        catalog_version,
+        sprite_link,
+    )
+
+
+def rebuild_situation_payloads(batch_size: int) -> int:
+    """Пересобирает устаревшие готовые ответы, возвращает их количество."""
+    catalog_version = get_catalog_version()
+    stale_generations = (
+        _generation_queryset()
+        .exclude(payload__catalog_version=catalog_version)
+        .order_by("pk")
+    )
+    total = 0
+    last_pk = 0
+    while batch := list(stale_generations.filter(pk__gt=last_pk)[:batch_size]):
+        _prefetch_answer_rows(batch)
+        for generation_instance in batch:
+            generation_instance.payload = payloads.render_payload(
+                generation_instance,
+                catalog_version,
+            )
+        GenerationModel.objects.bulk_update(batch, ["payload"])
+        total += len(batch)
+        last_pk = batch[-1].pk
+    return total
+
+
+def pregenerate_situation(generation_params: GenerateSituationParams) -> bool:
+    """Создаёт генерацию заранее, ``False`` если она уже есть."""
+    if _get_pending_generation(generation_params) is not None:
+        return False
+    if GenerationModel.objects.filter(
+        seed=generation_params.seed,
+        iteration=generation_params.num_iterations,
+    ).exists():
+        return False
+    _generate_situation(generation_params)
+    return True
+
+
+def get_situation_ids(
+    seed: uuid.UUID,
+    iterations: Iterable[int],
+) -> dict[int, int]:
+    """Ситуации итераций дня, включая ещё не записанные генерации."""
+    iterations = set(iterations)
+    situation_ids = dict(
+        GenerationModel.objects.filter(
+            seed=seed,
+            iteration__in=iterations,
+        ).values_list("iteration", "situation_id"),
+    )
+    for iteration in iterations - situation_ids.keys():
+        pending_generation = _get_pending_generation(
+            GenerateSituationParams.model_construct(
+                seed=seed,
+                num_iterations=iteration,
+            ),
+        )
+        if pending_generation is not None:
+            situation_ids[iteration] = pending_generation.situation_id
+    return situation_ids
 
 
 def get_hint(generation_params: GenerateSituationParams) -> HintModel:
@@ -393,44 +711,137 @@ def get_hint(generation_params: GenerateSituationParams) -> HintModel:
     return generation_instance.hint
 
 
-LostReviews = list[str]
-IncorrectReviews = list[str]
+async def aget_hint(generation_params: GenerateSituationParams) -> HintModel:
+    """Асинхронная версия ``get_hint``."""
+    generation_instance = await agenerate_situation(generation_params)
+    return generation_instance.hint
+
+
+def _hint_rows(
+    hints_data: GenerateHints,
+) -> QuerySet[GenerationModel, tuple[int, str, int, str, str]]:
+    return (
+        GenerationModel.objects.filter(
+            seed=hints_data.seed,
+            iteration__in=set(hints_data.iterations),
+        ).values_list(
+            "iteration",
+            "hint__text",
+            "hint__product_id",
+            "hint__product__name",
+            "hint__product__link",
+        )
+    )
+
 
+def _iteration_params(
+    hints_data: GenerateHints,
+    iteration: int,
+) -> GenerateSituationParams:
+    return GenerateSituationParams.model_construct(
+        seed=hints_data.seed,
+        num_iterations=iteration,
+    )
 
-def _get_reviews_for_products_ids(
-    products_ids: Iterable[int],
-) -> tuple[dict[int, LostReviews], dict[int, IncorrectReviews]]:
-    res_lost: defaultdict[int, LostReviews] = defaultdict(list)
-    res_incorrect: defaultdict[int, IncorrectReviews] = defaultdict(list)
-    review_qs = ReviewModel.objects.filter(product_id__in=products_ids)
 
-    for rew in review_qs:
-        if rew.product_id is not None:
-            if rew.is_product_in_answer:
-                res_incorrect[rew.product_id].append(rew.text)
-            else:
-                res_lost[rew.product_id].append(rew.text)
+def get_hints(hints_data: GenerateHints) -> list[SituationHint]:
+    """
+    Подсказки нескольких итераций в порядке запроса.
 
-    return res_lost, res_incorrect
+    Сохранённые итерации читаются одной выборкой только текста подсказки
+    и полей продукта, генерируются лишь недостающие.
+    """
+    hints = {
+        iteration: SituationHint.from_row(*hint_row)
+        for iteration, *hint_row in _hint_rows(hints_data)
+    }
+    for iteration in hints_data.iterations:
+        if iteration not in hints:
+            hints[iteration] = SituationHint.from_hint_model(
+                _generate_situation(
+                    _iteration_params(hints_data, iteration),
+                ).hint,
+            )
+    return [hints[iteration] for iteration in hints_data.iterations]
+
+
+async def aget_hints(hints_data: GenerateHints) -> list[SituationHint]:
+    """Асинхронная версия ``get_hints``."""
+    hints = {
+        iteration: SituationHint.from_row(*hint_row)
+        async for iteration, *hint_row in _hint_rows(hints_data)
+    }
+    for iteration in hints_data.iterations:
+        if iteration not in hints:
+            generation_instance = await _agenerate_situation(
+                _iteration_params(hints_data, iteration),
+            )
+            hints[iteration] = SituationHint.from_hint_model(
+                generation_instance.hint,
+            )
+    return [hints[iteration] for iteration in hints_data.iterations]
 
 
 def check_answers(
     generation_instance: GenerationModel,
     chosen_product_ids: list[int],
+    catalog: CatalogReader,
 ) -> Review:
-    # Реализовывается не методами, так как создание нового кверисета ведет
-    # к еще одному запросу к бд, что нам не особо хочется делать
-    generated_answers = list(generation_instance.answers.all())
-
-    correct_generated_answers = list(
-        filter(
-            lambda ans: ans.is_correct,
-            generated_answers,
-        )
+    # Ответы и клиент берутся из уже загруженной генерации,
+    # отзывы и продукты - из снимка справочников, без запросов к бд:
+    return review_answers(
+        GenerateSituationParams.model_construct(
+            seed=generation_instance.seed,
+            num_iterations=generation_instance.iteration,
+        ),
+        get_correct_product_ids(generation_instance),
+        Client.from_generation(generation_instance),
+        chosen_product_ids,
+        catalog,
     )
 
-    points_per_answer = TOTAL_POINTS // len(correct_generated_answers)
-    correct_product_ids = set([ans.product_id for ans in correct_generated_answers])
+
+def get_correct_product_ids(generation_instance: GenerationModel) -> list[int]:
+    """Правильные продукты из упакованных ответов или из строк ответов."""
+    if generation_instance.correct_product_ids is not None:
+        return list(generation_instance.correct_product_ids)
+    return [
+        ans.product_id
+        for ans in generation_instance.prefetched_answers
+        if ans.is_correct
+    ]
+
+
+def find_answered_generation(product_id: int) -> GenerationModel | None:
+    """
+    Генерация, у которой продукт среди упакованных ответов.
+
+    Строки ответов защищают продукт от удаления внешним ключом,
+    а массивы ответов проверяются по GIN-индексам.
+    """
+    # Без сортировки: `first()` упорядочил бы по ключу, и планировщик
+    # мог бы пройти генерации по первичному ключу вместо GIN-индексов.
+    generations = GenerationModel.objects.filter(
+        Q(correct_product_ids__contains=[product_id])
+        | Q(incorrect_product_ids__contains=[product_id]),
+    ).only("seed", "iteration")[:1]
+    return next(iter(generations), None)
+
+
+def review_answers(
+    generation_params: GenerateSituationParams,
+    correct_generated_product_ids: list[int],
+    client: Client,
+    chosen_product_ids: list[int],
+    catalog: CatalogReader,
+) -> Review:
+    """Оценивает ответ игрока по правильным продуктам итерации."""
+    catalog = with_products(
+        catalog,
+        [*correct_generated_product_ids, *chosen_product_ids],
+    )
+    points_per_answer = TOTAL_POINTS // len(correct_generated_product_ids)
+    correct_product_ids = set(correct_generated_product_ids)
     answered_product_ids = set(chosen_product_ids)
 
     correct_answers = correct_product_ids & answered_product_ids
@@ -440,100 +851,73 @@ def check_answers(
     points_for_correct_answers = len(correct_answers) * points_per_answer
     points_for_incorrect_answers = len(incorrect_answers) * INCORRECT_ANSWER_FINE
     total_points = points_for_correct_answers - points_for_incorrect_answers
-    total_points = 0 if total_points < 0 else total_points
-
-    success_reviews = ReviewModel.objects.filter(product__isnull=True).values_list(
-        "text", flat=True
-    )
-    lost_reviews, incorrect_reviews = _get_reviews_for_products_ids(
-        incorrect_answers | lost_correct_answers
-    )
+    total_points = max(total_points, 0)
 
-    generation = get_generation(
-        GenerateSituationParams(
-            seed=generation_instance.seed,
-            num_iterations=generation_instance.iteration,
-        )
-    )
+    generation = get_generation(generation_params)
 
     reviews = []
-    answered_products = list(ProductModel.objects.filter(id__in=answered_product_ids))
+    # Продуктов, которых нет и в базе, игрок мог прислать любых:
+    answered_products = filter(
+        None, map(catalog.get_product, sorted(answered_product_ids))
+    )
     for answered_product in answered_products:
         random_instance = random.Random(generation.review + answered_product.id)
 
-        chosen_review = random_instance.choice(success_reviews)
+        chosen_review = random_instance.choice(catalog.get_success_reviews())
         ans_status = AnswerStatusEnum.FULL_CORRECT
 
         if answered_product.id not in correct_product_ids:
             chosen_review = random_instance.choice(
-                incorrect_reviews[answered_product.id]
+                catalog.get_incorrect_reviews(answered_product.id)
             )
             ans_status = AnswerStatusEnum.INCORRECT_BUT_SELECTED
 
         reviews.append(
-            ProductReview.model_validate(
-                {
-                    "answered_product": Product.model_validate(
-                        answered_product, from_attributes=True
-                    ),
-                    "review": chosen_review,
-                    "answer_status": ans_status,
-                }
+            ProductReview.model_construct(
+                answered_product=Product.from_trusted(answered_product),
+                review=chosen_review,
+                answer_status=ans_status,
             )
         )
 
-    for ans in filter(
-        lambda ans: ans.product_id in lost_correct_answers, generated_answers
+    for product_id in filter(
+        lambda product_id: product_id in lost_correct_answers,
+        correct_generated_product_ids,
     ):
-        random_instance = random.Random(generation.review + ans.product_id)
-        chosen_review = random_instance.choice(lost_reviews[ans.product_id])
+        random_instance = random.Random(  # noqa: S311
+            generation.review + product_id,
+        )
+        chosen_review = random_instance.choice(
+            catalog.get_lost_reviews(product_id)
+        )
 
         reviews.append(
-            ProductReview.model_validate(
-                {
-                    "answered_product": Product.model_validate(
-                        ans.product, from_attributes=True
-                    ),
-                    "review": chosen_review,
-                    "answer_status": AnswerStatusEnum.CORRECT_BUT_NOT_SELECTED,
-                }
+            ProductReview.model_construct(
+                answered_product=Product.from_trusted(
+                    catalog.get_product(product_id)
+                ),
+                review=chosen_review,
+                answer_status=AnswerStatusEnum.CORRECT_BUT_NOT_SELECTED,
             )
         )
 
-    return Review(
-        client=Client.from_generation(generation_instance),
+    return Review.model_construct(
+        client=client,
         review=reviews,
         rating=total_points,
     )
 
 
 def acknowledge_day_finish(data: AcknowledgeDayFinish) -> AcknowledgeDayFinishResponse:
-
-    generation_qs = (
-        GenerationModel.objects.select_related(
-            "situation",
-            "client_age",
-            "client_job",
-            "client_city",
-            "client_sprite",
-            "client_first_name",
-            "client_last_name",
-            "hint",
-        )
-        .prefetch_related(
-            Prefetch(
-                "answers",
-                GenerationAnswerModel.objects.select_related("product"),
-            )
-        )
-        .filter(seed=data.seed)
-    )
-    generation_by_iteration = {gen.iteration: gen for gen in generation_qs}
+    generations = list(_generation_queryset().filter(seed=data.seed))
+    _prefetch_answer_rows(generations)
+    generation_by_iteration = {gen.iteration: gen for gen in generations}
+    catalog = get_catalog()
     reviews = []
     for ans in data.answers:
         generation_instance = generation_by_iteration.get(ans.iteration)
         if generation_instance is None:
-            generation_instance = generate_situation(
+            generation_instance = _generate_situation(
                 GenerateSituationParams(
                     seed=data.seed,
                     num_iterations=ans.iteration,
@@ -544,25 +928,87 @@ def acknowledge_day_finish(data: AcknowledgeDayFinish) -> AcknowledgeDayFinishRe
             check_answers(
                 generation_instance,
                 ans.recommended_product_ids,
+                catalog,
             )
         )
 
-    return AcknowledgeDayFinishResponse(reviews=reviews)
+    return AcknowledgeDayFinishResponse.model_construct(reviews=reviews)
+
+
+def _window_generations(
+    generation_data: GenerateChunkSituation,
+) -> QuerySet[GenerationModel]:
+    iterations = generation_data.iterations
+    return _generation_queryset().filter(
+        seed=generation_data.seed,
+        iteration__gte=iterations.start,
+        iteration__lt=iterations.stop,
+    )
 
 
 def generate_chunk_iterations(
     generation_data: GenerateChunkSituation,
 ) -> list[GenerationModel]:
+    """Итерации окна чанка: сохранённые одним запросом, остальные заново."""
+    stored = {
+        generation_instance.iteration: generation_instance
+        for generation_instance in _window_generations(generation_data)
+    }
+    _prefetch_answer_rows(list(stored.values()))
+    return [
+        stored.get(iteration)
+        or _generate_situation(
+            GenerateSituationParams(
+                seed=generation_data.seed,
+                num_iterations=iteration,
+            )
+        )
+        for iteration in generation_data.iterations
+    ]
 
-    generations = []
-    for iteration in range(generation_data.total_iterations):
-        generations.append(
-            generate_situation(
-                GenerateSituationParams(
-                    seed=generation_data.seed,
-                    num_iterations=iteration,
-                )
+
+async def agenerate_chunk_iterations(
+    generation_data: GenerateChunkSituation,
+) -> list[GenerationModel]:
+    """Асинхронная версия ``generate_chunk_iterations``."""
+    stored = {
+        generation_instance.iteration: generation_instance
+        async for generation_instance in _window_generations(generation_data)
+    }
+    await _aprefetch_answer_rows(list(stored.values()))
+    return [
+        stored.get(iteration)
+        or await _agenerate_situation(
+            GenerateSituationParams(
+                seed=generation_data.seed,
+                num_iterations=iteration,
+            )
+        )
+        for iteration in generation_data.iterations
+    ]
+
+
+def iter_chunk_situation_data(
+    generation_data: GenerateChunkSituation,
+) -> Iterator[dict[str, Any]]:
+    """Ответы итераций окна по одной, по мере чтения или генерации."""
+    for iteration in generation_data.iterations:
+        yield generate_situation_data(
+            GenerateSituationParams(
+                seed=generation_data.seed,
+                num_iterations=iteration,
             )
         )
 
-    return generations
+
+async def aiter_chunk_situation_data(
+    generation_data: GenerateChunkSituation,
+) -> AsyncIterator[dict[str, Any]]:
+    """Асинхронная версия ``iter_chunk_situation_data``."""
+    for iteration in generation_data.iterations:
+        yield await agenerate_situation_data(
+            GenerateSituationParams(
+                seed=generation_data.seed,
+                num_iterations=iteration,
+            )
+        )
@@ -0,0 +1,267 @@
+"""
+Таблица лидеров по ``total_rating`` игровых дней.
+
+Рейтинг дня записывается один раз на сид, когда итог дня сохраняется
+впервые. Вместе с записью увеличиваются корзины ``(период, рейтинг)``
+за день, неделю и всё время. Место игрока - сумма корзин выше его
+рейтинга: рейтинг дня ограничен, корзин за период немного, и запрос
+не зависит от количества игроков. Лучшие игроки читаются из индексов
+по периоду и убыванию рейтинга без сортировки таблицы.
+"""
+
+import datetime
+import uuid
+from collections import Counter
+from typing import Final
+
+from django.db import connections, router, transaction
+from django.db.models import Q, QuerySet, Sum
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+
+from server.apps.game.models import (
+    LeaderboardBucketModel,
+    LeaderboardEntryModel,
+)
+from server.apps.game.services.dto import (
+    Leaderboard,
+    LeaderboardEntry,
+    LeaderboardPeriod,
+    LeaderboardRank,
+)
+from server.apps.game.services.partitions import week_start
+
+MAX_TOP_SIZE: Final = 100
+
+# Корзины всего времени хранятся с условным началом периода:
+_ALL_TIME_START: Final = datetime.date.min
+
+# Период, его начало и рейтинг:
+type BucketKey = tuple[str, datetime.date, int]
+
+_UPSERT_SQL: Final = """
+INSERT INTO {table} (period, period_start, rating, players)
+VALUES {values}
+ON CONFLICT (period, period_start, rating)
+DO UPDATE SET players = {table}.players + EXCLUDED.players
+"""
+
+
+def period_start(
+    period: LeaderboardPeriod,
+    day: datetime.date,
+) -> datetime.date:
+    """Начало периода, в который попадает день."""
+    if period == LeaderboardPeriod.DAY:
+        return day
+    if period == LeaderboardPeriod.WEEK:
+        return week_start(day)
+    return _ALL_TIME_START
+
+
+def bucket_keys(rating: int, day: datetime.date) -> list[BucketKey]:
+    """Корзины рейтинга дня за каждый период."""
+    return [
+        (period.value, period_start(period, day), rating)
+        for period in LeaderboardPeriod
+    ]
+
+
+def increment_buckets(using: str, counts: Counter[BucketKey]) -> None:
+    """Прибавляет игроков к корзинам, создаёт недостающие корзины."""
+    # Одинаковый порядок строк не даёт параллельным записям взаимно
+    # заблокироваться:
+    keys = sorted(counts)
+    connection = connections[using]
+    with connection.cursor() as cursor:
+        cursor.execute(
+            _UPSERT_SQL.format(
+                table=connection.ops.quote_name(
+                    LeaderboardBucketModel._meta.db_table,  # noqa: SLF001
+                ),
+                values=", ".join(["(%s, %s, %s, %s)"] * len(keys)),
+            ),
+            [value for key in keys for value in (*key, counts[key])],
+        )
+
+
+def record_rating(
+    seed: uuid.UUID,
+    rating: int,
+    using: str | None = None,
+) -> bool:
+    """Записывает рейтинг дня, ``False`` если у сида он уже есть."""
+    if using is None:
+        using = router.db_for_write(LeaderboardEntryModel)
+    today = timezone.localdate()
+    with transaction.atomic(using=using):
+        _, created = LeaderboardEntryModel.objects.using(using).get_or_create(
+            seed=seed,
+            defaults={
+                "rating": rating,
+                "day": today,
+                "week": week_start(today),
+            },
+        )
+        if created:
+            increment_buckets(using, Counter(bucket_keys(rating, today)))
+    return created
+
+
+def _period_entries(
+    period: LeaderboardPeriod,
+    start: datetime.date,
+) -> QuerySet[LeaderboardEntryModel]:
+    entries = LeaderboardEntryModel.objects.all()
+    if period == LeaderboardPeriod.DAY:
+        entries = entries.filter(day=start)
+    elif period == LeaderboardPeriod.WEEK:
+        entries = entries.filter(week=start)
+    return entries
+
+
+def _period_buckets(
+    period: LeaderboardPeriod,
+    start: datetime.date,
+) -> QuerySet[LeaderboardBucketModel]:
+    return LeaderboardBucketModel.objects.filter(
+        period=period.value,
+        period_start=start,
+    )
+
+
+def _top_entries(
+    period: LeaderboardPeriod,
+    start: datetime.date,
+    limit: int,
+) -> QuerySet[LeaderboardEntryModel, tuple[uuid.UUID, int]]:
+    return (
+        _period_entries(period, start)
+        .order_by("-rating", "pk")
+        .values_list("seed", "rating")[: min(limit, MAX_TOP_SIZE)]
+    )
+
+
+def _players() -> dict[str, Coalesce]:
+    return {"players": Coalesce(Sum("players"), 0)}
+
+
+def _public_start(start: datetime.date) -> datetime.date | None:
+    return None if start == _ALL_TIME_START else start
+
+
+def _leaderboard(
+    period: LeaderboardPeriod,
+    start: datetime.date,
+    players: int,
+    top: list[tuple[uuid.UUID, int]],
+) -> Leaderboard:
+    entries = []
+    for position, (seed, rating) in enumerate(top, start=1):
+        # Равный рейтинг делит место предыдущего игрока:
+        rank = position
+        if entries and entries[-1].rating == rating:
+            rank = entries[-1].rank
+        entries.append(
+            LeaderboardEntry.model_construct(
+                seed=seed,
+                rating=rating,
+                rank=rank,
+            ),
+        )
+    return Leaderboard.model_construct(
+        period=period,
+        period_start=_public_start(start),
+        players=players,
+        top=entries,
+    )
+
+
+def get_top(period: LeaderboardPeriod, limit: int) -> Leaderboard:
+    """Лучшие игроки текущего периода."""
+    start = period_start(period, timezone.localdate())
+    return _leaderboard(
+        period,
+        start,
+        _period_buckets(period, start).aggregate(**_players())["players"],
+        list(_top_entries(period, start, limit)),
+    )
+
+
+async def aget_top(period: LeaderboardPeriod, limit: int) -> Leaderboard:
+    """Асинхронная версия ``get_top``."""
+    start = period_start(period, timezone.localdate())
+    counts = await _period_buckets(period, start).aaggregate(**_players())
+    return _leaderboard(
+        period,
+        start,
+        counts["players"],
+        [entry async for entry in _top_entries(period, start, limit)],
+    )
+
+
+def _entry_query(
+    seed: uuid.UUID,
+) -> QuerySet[LeaderboardEntryModel, tuple[int, datetime.date]]:
+    return LeaderboardEntryModel.objects.filter(seed=seed).values_list(
+        "rating",
+        "day",
+    )
+
+
+def _rank_counts(rating: int) -> dict[str, Coalesce]:
+    return {
+        "players_above": Coalesce(
+            Sum("players", filter=Q(rating__gt=rating)),
+            0,
+        ),
+        **_players(),
+    }
+
+
+def _rank(
+    period: LeaderboardPeriod,
+    start: datetime.date,
+    rating: int,
+    counts: dict[str, int],
+) -> LeaderboardRank:
+    return LeaderboardRank.model_construct(
+        period=period,
+        period_start=_public_start(start),
+        players=counts["players"],
+        rating=rating,
+        rank=counts["players_above"] + 1,
+    )
+
+
+def get_rank(
+    seed: uuid.UUID,
+    period: LeaderboardPeriod,
+) -> LeaderboardRank | None:
+    """Место дня среди игроков его дня, недели или всего времени."""
+    entry = _entry_query(seed).first()
+    if entry is None:
+        return None
+    rating, day = entry
+    start = period_start(period, day)
+    return _rank(
+        period,
+        start,
+        rating,
+        _period_buckets(period, start).aggregate(**_rank_counts(rating)),
+    )
+
+
+async def aget_rank(
+    seed: uuid.UUID,
+    period: LeaderboardPeriod,
+) -> LeaderboardRank | None:
+    """Асинхронная версия ``get_rank``."""
+    entry = await _entry_query(seed).afirst()
+    if entry is None:
+        return None
+    rating, day = entry
+    start = period_start(period, day)
+    buckets = _period_buckets(period, start)
+    counts = await buckets.aaggregate(**_rank_counts(rating))
+    return _rank(period, start, rating, counts)
@@ -0,0 +1,63 @@
+"""
+Счётчики игры в кеше django.
+
+В продакшене кеш общий (redis), и счётчики суммируются по всем
+воркерам. С ``LocMemCache`` в разработке и в тестах каждый процесс
+считает только свои запросы.
+"""
+
+from collections.abc import Iterable
+from typing import Final
+
+from django.core.cache import cache
+
+_KEY_PREFIX: Final = "game:metrics:"
+
+PREFETCH_SCHEDULED: Final = "prefetch_scheduled"
+PREFETCH_SKIPPED: Final = "prefetch_skipped"
+PREFETCH_GENERATED: Final = "prefetch_generated"
+PREFETCH_HIT: Final = "prefetch_hit"
+PREFETCH_MISS: Final = "prefetch_miss"
+RATE_LIMIT_ADMITTED_COST: Final = "rate_limit_admitted_cost"
+RATE_LIMIT_REJECTED_COST: Final = "rate_limit_rejected_cost"
+RATE_LIMIT_REJECTED: Final = "rate_limit_rejected"
+
+COUNTERS: Final = (
+    PREFETCH_SCHEDULED,
+    PREFETCH_SKIPPED,
+    PREFETCH_GENERATED,
+    PREFETCH_HIT,
+    PREFETCH_MISS,
+    RATE_LIMIT_ADMITTED_COST,
+    RATE_LIMIT_REJECTED_COST,
+    RATE_LIMIT_REJECTED,
+)
+
+
+def incr(name: str, delta: int = 1) -> None:
+    """Прибавляет ``delta`` к счётчику."""
+    key = f"{_KEY_PREFIX}{name}"
+    # `add` не трогает счётчик, созданный другим процессом, а `incr`
+    # атомарен, поэтому параллельные прибавления не теряются:
+    cache.add(key, 0, timeout=None)
+    cache.incr(key, delta)
+
+
+def get_counters(names: Iterable[str] = COUNTERS) -> dict[str, int]:
+    """Значения счётчиков, ещё не тронутые равны нулю."""
+    names = list(names)
+    values = cache.get_many([f"{_KEY_PREFIX}{name}" for name in names])
+    return {name: values.get(f"{_KEY_PREFIX}{name}", 0) for name in names}
+
+
+def reset_counters(names: Iterable[str] = COUNTERS) -> None:
+    """Обнуляет счётчики."""
+    cache.delete_many([f"{_KEY_PREFIX}{name}" for name in names])
+
+
+def prefetch_hit_rate(counters: dict[str, int]) -> float | None:
+    """Доля запросов, попавших в заранее созданные генерации."""
+    requests = counters[PREFETCH_HIT] + counters[PREFETCH_MISS]
+    if not requests:
+        return None
+    return counters[PREFETCH_HIT] / requests
@@ -0,0 +1,57 @@
+"""
+Окна итераций для чанков ``/generateChunkSituations``.
+
+Один запрос генерирует не больше ``GAME_CHUNK_MAX_ITERATIONS`` итераций.
+Следующее окно клиент запрашивает по непрозрачному курсору из ответа,
+курсор подписан и привязан к сиду дня.
+"""
+
+import uuid
+from typing import Final
+
+from django.conf import settings
+from django.core import signing
+
+# Заголовок ответа с курсором следующего окна, если оно есть:
+NEXT_CURSOR_HEADER: Final = "X-Next-Cursor"
+
+_CURSOR_SALT: Final = "game.chunk-cursor"
+
+
+def dump_cursor(seed: uuid.UUID, start_iteration: int) -> str:
+    """Подписанный курсор окна, которое начинается с ``start_iteration``."""
+    return signing.dumps(
+        {"seed": str(seed), "start": start_iteration},
+        salt=_CURSOR_SALT,
+    )
+
+
+def load_cursor(cursor: str, seed: uuid.UUID) -> int:
+    """Первая итерация окна из курсора, ``ValueError`` если он чужой."""
+    try:
+        data = signing.loads(cursor, salt=_CURSOR_SALT)
+    except signing.BadSignature as exc:
+        raise ValueError("Invalid cursor") from exc
+    if data["seed"] != str(seed):
+        raise ValueError("Cursor belongs to another seed")
+    return int(data["start"])
+
+
+def is_day_iteration(iteration: int) -> bool:
+    """Есть ли итерация в дне длиной ``GAME_DAY_MAX_ITERATIONS``."""
+    return 0 <= iteration < settings.GAME_DAY_MAX_ITERATIONS
+
+
+def iteration_window(
+    start_iteration: int,
+    total_iterations: int,
+    limit: int | None,
+) -> range:
+    """Итерации окна, не больше ``GAME_CHUNK_MAX_ITERATIONS``."""
+    max_iterations = settings.GAME_CHUNK_MAX_ITERATIONS
+    if limit is None or limit > max_iterations:
+        limit = max_iterations
+    return range(
+        start_iteration,
+        max(start_iteration, min(total_iterations, start_iteration + limit)),
+    )
@@ -0,0 +1,179 @@
+"""
+Недельные партиции таблиц генераций в PostgreSQL.
+
+Генерации и их ответы разбиты по ``created_on`` на недели, начиная
+с понедельника. Устаревшая неделя удаляется вместе со своей партицией:
+``DROP TABLE`` не трогает строки по одной и не оставляет мёртвых кортежей
+и раздутых индексов, в отличие от ``DELETE``. Партиции на следующие недели
+создаются заранее, строки вне созданных партиций попадают
+в партицию по умолчанию. Она не удаляется: новая неделя забирает из неё
+свои строки, а устаревшие строки из неё удаляются ``DELETE``.
+Ключи итераций в неразбитой таблице удаляются вместе с их генерациями.
+"""
+
+import datetime
+import re
+from typing import Final
+
+from django.db import connections, router, transaction
+from django.db.backends.base.base import BaseDatabaseWrapper
+
+from server.apps.game.models import (
+    GenerationAnswerModel,
+    GenerationKeyModel,
+    GenerationModel,
+)
+
+# Ответы удаляются раньше генераций, на которые ссылаются:
+PARTITIONED_MODELS: Final = (GenerationAnswerModel, GenerationModel)
+
+_WEEK: Final = datetime.timedelta(weeks=1)
+_PARTITION_SUFFIX: Final = re.compile(r"_p(?P<week>\d{8})$")
+
+
+def week_start(day: datetime.date) -> datetime.date:
+    """Понедельник недели дня."""
+    return day - datetime.timedelta(days=day.weekday())
+
+
+def partition_name(table: str, week: datetime.date) -> str:
+    """Имя партиции таблицы для недели."""
+    return f"{table}_p{week:%Y%m%d}"
+
+
+def default_partition_name(table: str) -> str:
+    """Имя партиции таблицы для строк вне созданных недель."""
+    return f"{table}_default"
+
+
+def get_connection() -> BaseDatabaseWrapper:
+    """Соединение, в котором живут таблицы генераций."""
+    return connections[router.db_for_write(GenerationModel)]
+
+
+def get_partitions(table: str) -> dict[datetime.date, str]:
+    """Недельные партиции таблицы по понедельнику недели."""
+    with get_connection().cursor() as cursor:
+        cursor.execute(
+            """
+            SELECT child.relname FROM pg_inherits
+            JOIN pg_class child ON child.oid = pg_inherits.inhrelid
+            WHERE pg_inherits.inhparent = %s::regclass
+            """,
+            [table],
+        )
+        names = [name for (name,) in cursor.fetchall()]
+
+    partitions = {}
+    for name in names:
+        match = _PARTITION_SUFFIX.search(name)
+        if match is not None:
+            week = datetime.date.fromisoformat(match["week"])
+            partitions[week] = name
+    return partitions
+
+
+def create_partitions(since: datetime.date, until: datetime.date) -> list[str]:
+    """Создаёт недостающие партиции недель с ``since`` по ``until``."""
+    created = []
+    for model in PARTITIONED_MODELS:
+        table = model._meta.db_table  # noqa: SLF001
+        existing = get_partitions(table)
+        week = week_start(since)
+        while week <= until:
+            if week not in existing:
+                name = partition_name(table, week)
+                _create_partition(table, name, week)
+                created.append(name)
+            week += _WEEK
+    return created
+
+
+def _create_partition(table: str, name: str, week: datetime.date) -> None:
+    connection = get_connection()
+    quoted_table = connection.ops.quote_name(table)
+    quoted_default = connection.ops.quote_name(default_partition_name(table))
+    bounds = [week, week + _WEEK]
+    create_sql = f"""
+        CREATE TABLE {connection.ops.quote_name(name)}
+        PARTITION OF {quoted_table} FOR VALUES FROM (%s) TO (%s)
+    """
+    in_week = "created_on >= %s AND created_on < %s"
+    atomic = transaction.atomic(using=connection.alias)
+    with atomic, connection.cursor() as cursor:
+        cursor.execute(
+            f"""
+            SELECT EXISTS (SELECT 1 FROM {quoted_default} WHERE {in_week})
+            """,  # noqa: S608
+            bounds,
+        )
+        (has_rows,) = cursor.fetchone()
+        if not has_rows:
+            cursor.execute(create_sql, bounds)
+            return
+        # Пока в партиции по умолчанию есть строки недели, postgres
+        # не создаст её партицию. Строки переносятся, пока партиция
+        # по умолчанию отсоединена, и до конца транзакции таблица
+        # заблокирована целиком:
+        cursor.execute(
+            f"ALTER TABLE {quoted_table} DETACH PARTITION {quoted_default}",
+        )
+        cursor.execute(create_sql, bounds)
+        cursor.execute(
+            f"""
+            WITH moved AS (
+                DELETE FROM {quoted_default} WHERE {in_week} RETURNING *
+            )
+            INSERT INTO {quoted_table} SELECT * FROM moved
+            """,  # noqa: S608
+            bounds,
+        )
+        cursor.execute(
+            f"""
+            ALTER TABLE {quoted_table}
+            ATTACH PARTITION {quoted_default} DEFAULT
+            """,
+        )
+
+
+def drop_partitions(before: datetime.date) -> list[str]:
+    """Удаляет партиции недель, которые целиком раньше ``before``."""
+    dropped = []
+    connection = get_connection()
+    for model in PARTITIONED_MODELS:
+        table = model._meta.db_table  # noqa: SLF001
+        for week, name in sorted(get_partitions(table).items()):
+            if week + _WEEK > before:
+                continue
+            with connection.cursor() as cursor:
+                cursor.execute(f"DROP TABLE {connection.ops.quote_name(name)}")
+            dropped.append(name)
+    return dropped
+
+
+def purge_default_partitions(before: datetime.date) -> dict[str, int]:
+    """Удаляет из партиций по умолчанию строки недель раньше ``before``."""
+    purged = {}
+    connection = get_connection()
+    for model in PARTITIONED_MODELS:
+        name = default_partition_name(model._meta.db_table)  # noqa: SLF001
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"""
+                DELETE FROM {connection.ops.quote_name(name)}
+                WHERE created_on < %s
+                """,  # noqa: S608
+                [week_start(before)],
+            )
+            purged[name] = cursor.rowcount
+    return purged
+
+
+def purge_generation_keys(before: datetime.date) -> int:
+    """Удаляет ключи итераций, генерации которых удалены с их неделями."""
+    deleted, _ = (
+        GenerationKeyModel.objects.using(get_connection().alias)
+        .filter(created_on__lt=week_start(before))
+        .delete()
+    )
+    return deleted
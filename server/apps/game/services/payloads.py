@@ -0,0 +1,74 @@
+"""
+Готовый ответ ``/generateSituation``, сохранённый в строке генерации.
+
+Повторный запрос итерации читает одну колонку по уникальному индексу
+и отдаёт её без соединений таблиц и без валидации pydantic.
+Ответ собран для версии справочников и устаревает после их изменения,
+пока его не пересоберёт команда ``rebuild_situation_payloads``.
+"""
+
+from collections.abc import Callable
+from typing import TYPE_CHECKING, Any, Final
+
+from server.apps.game.models import SpriteModel
+from server.apps.game.services.dto import (
+    GenerateSituationParams,
+    Situation,
+    shuffle_answers,
+)
+
+if TYPE_CHECKING:
+    from server.apps.game.models import GenerationModel
+
+_CATALOG_VERSION_KEY: Final = "catalog_version"
+
+
+def sprite_url(name: str) -> str:
+    """Ссылка на файл спрайта по его имени в хранилище."""
+    # Ссылка на спрайт может быть подписанной, поэтому строится при ответе:
+    return SpriteModel._meta.get_field("image").storage.url(name)  # noqa: SLF001
+
+
+def is_sprite(name: str) -> bool:
+    """Есть ли у спрайта с таким файлом запись в бд."""
+    return SpriteModel.objects.filter(image=name).exists()
+
+
+def render_payload(
+    generation_instance: "GenerationModel",
+    catalog_version: int,
+) -> dict[str, Any]:
+    """Собирает ответ из уже загруженных связанных объектов генерации."""
+    # Ответы хранятся неперемешанными, их перемешивает `situation_data`:
+    payload = Situation.from_generation_model(
+        generation_instance,
+        shuffle=False,
+    ).model_dump(mode="json", exclude={"generation_params"})
+    payload["client"]["sprite"] = generation_instance.client_sprite.image.name
+    payload[_CATALOG_VERSION_KEY] = catalog_version
+    return payload
+
+
+def is_fresh(payload: dict[str, Any] | None, catalog_version: int) -> bool:
+    """Собран ли готовый ответ из текущей версии справочников."""
+    return (
+        payload is not None
+        and payload.get(_CATALOG_VERSION_KEY) == catalog_version
+    )
+
+
+def situation_data(
+    generation_params: GenerateSituationParams,
+    payload: dict[str, Any],
+    sprite_link: Callable[[str], str] = sprite_url,
+) -> dict[str, Any]:
+    """Данные ответа в форме :class:`Situation`, готовые к сериализации."""
+    return {
+        "generation_params": generation_params.model_dump(mode="json"),
+        "client": {
+            **payload["client"],
+            "sprite": sprite_link(payload["client"]["sprite"]),
+        },
+        "answers": shuffle_answers(payload["answers"], generation_params),
+        "hint": payload["hint"],
+    }
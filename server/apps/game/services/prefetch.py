@@ -0,0 +1,112 @@
+"""
+Фоновая генерация следующих итераций дня.
+
+Игроки проходят итерации по порядку, поэтому после выдачи итерации ``k``
+итерации ``k + 1 .. k + N`` генерируются в пуле потоков воркера,
+и следующий запрос становится обычной выборкой.
+"""
+
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Final
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connections
+
+from server.apps.game.services import day_sessions, generation, metrics
+from server.apps.game.services.dto import GenerateSituationParams
+
+logger = logging.getLogger(__name__)
+
+# Игрок проходит день быстрее, остальные отметки считаем промахами:
+_MARK_TIMEOUT: Final = 60 * 60
+
+_executor: ThreadPoolExecutor | None = None
+_scheduled: set[tuple[str, int]] = set()
+_lock = threading.Lock()
+
+
+def _mark_key(generation_params: GenerateSituationParams) -> str:
+    return (
+        f"game:prefetched:{generation_params.seed}:"
+        f"{generation_params.num_iterations}"
+    )
+
+
+def on_situation_served(generation_params: GenerateSituationParams) -> None:
+    """Учитывает попадание в заранее созданную генерацию, планирует новые."""
+    if not settings.GAME_PREFETCH_AHEAD:
+        return
+
+    if generation_params.num_iterations:
+        # Итерацию 0 заранее создать нельзя, она не входит в статистику:
+        was_prefetched = cache.delete(_mark_key(generation_params))
+        metrics.incr(
+            metrics.PREFETCH_HIT if was_prefetched else metrics.PREFETCH_MISS,
+        )
+
+    for iteration in range(
+        generation_params.num_iterations + 1,
+        generation_params.num_iterations + 1 + settings.GAME_PREFETCH_AHEAD,
+    ):
+        _schedule(
+            GenerateSituationParams(
+                seed=generation_params.seed,
+                num_iterations=iteration,
+            ),
+        )
+
+
+def _schedule(generation_params: GenerateSituationParams) -> None:
+    global _executor  # noqa: PLW0603
+
+    key = (str(generation_params.seed), generation_params.num_iterations)
+    with _lock:
+        if key in _scheduled:
+            return
+        if len(_scheduled) >= settings.GAME_PREFETCH_QUEUE_SIZE:
+            # Генерация заранее необязательна, под нагрузкой её пропускаем:
+            metrics.incr(metrics.PREFETCH_SKIPPED)
+            return
+        if _executor is None:
+            _executor = ThreadPoolExecutor(
+                max_workers=settings.GAME_PREFETCH_WORKERS,
+                thread_name_prefix="game-prefetch",
+            )
+        _scheduled.add(key)
+        _executor.submit(_prefetch, generation_params, key)
+    metrics.incr(metrics.PREFETCH_SCHEDULED)
+
+
+def _prefetch(
+    generation_params: GenerateSituationParams,
+    key: tuple[str, int],
+) -> None:
+    pregenerate_situation = (
+        day_sessions.pregenerate_situation
+        if settings.GAME_DAY_SESSIONS
+        else generation.pregenerate_situation
+    )
+    try:
+        if pregenerate_situation(generation_params):
+            cache.set(_mark_key(generation_params), 1, _MARK_TIMEOUT)
+            metrics.incr(metrics.PREFETCH_GENERATED)
+    except Exception:
+        logger.exception("Failed to prefetch %s", key)
+    finally:
+        with _lock:
+            _scheduled.discard(key)
+        # Соединения потока возвращаются в пул между задачами:
+        connections.close_all()
+
+
+def shutdown_prefetcher() -> None:
+    """Дожидается запланированных генераций и останавливает пул."""
+    global _executor
+
+    with _lock:
+        executor, _executor = _executor, None
+    if executor is not None:
+        executor.shutdown(wait=True)
@@ -0,0 +1,248 @@
+"""
+Отложенная запись новых генераций.
+
+Генерация детерминирована сидом и справочниками, поэтому ответ можно отдать
+сразу после расчёта, а строки вставить позже пачкой из фонового потока.
+Пока генерация ждёт записи, воркер отдаёт её из памяти. Если запись
+не удалась, генерация просто будет рассчитана заново при следующем запросе.
+"""
+
+import atexit
+import itertools
+import logging
+import queue
+import threading
+import time
+import uuid
+from collections.abc import Sequence
+from typing import TYPE_CHECKING
+
+from django.conf import settings
+from django.db import IntegrityError, connections, transaction
+
+from server.apps.game.models import (
+    GenerationAnswerModel,
+    GenerationKeyModel,
+    GenerationModel,
+)
+
+if TYPE_CHECKING:
+    from server.apps.game.services.generation import SituationGeneration
+
+logger = logging.getLogger(__name__)
+
+_Key = tuple[uuid.UUID, int]
+
+
+def _key(seed: uuid.UUID, iteration: int) -> _Key:
+    return seed, iteration
+
+
+def _generation_key(generation: GenerationModel) -> GenerationKeyModel:
+    return GenerationKeyModel(
+        seed=generation.seed,
+        iteration=generation.iteration,
+        created_on=generation.created_on,
+    )
+
+
+def save_generation(situation_generation: "SituationGeneration") -> bool:
+    """Сохраняет одну генерацию, ``False`` если итерация уже записана."""
+    try:
+        with transaction.atomic():
+            # Ключ пишется первым: повтор итерации отменит транзакцию
+            # до вставки строк генерации.
+            _generation_key(situation_generation.generation).save()
+            situation_generation.generation.save()
+            GenerationAnswerModel.objects.bulk_create(
+                situation_generation.answers,
+            )
+    except IntegrityError:
+        return False
+    return True
+
+
+def save_generations(batch: Sequence["SituationGeneration"]) -> None:
+    """Сохраняет пачку генераций, пропуская уже записанные итерации."""
+    try:
+        with transaction.atomic():
+            GenerationKeyModel.objects.bulk_create(
+                [_generation_key(item.generation) for item in batch],
+            )
+            GenerationModel.objects.bulk_create(
+                [item.generation for item in batch],
+            )
+            GenerationAnswerModel.objects.bulk_create(
+                itertools.chain.from_iterable(item.answers for item in batch),
+            )
+    except IntegrityError:
+        # Часть итераций уже записал другой воркер, пишем по одной:
+        for item in batch:
+            item.generation.pk = None
+            item.generation._state.adding = True  # noqa: SLF001
+            for answer in item.answers:
+                answer.generation = item.generation
+            save_generation(item)
+
+
+class GenerationWriter:
+    """Ограниченная очередь генераций, которую разбирает фоновый поток."""
+
+    def __init__(
+        self,
+        queue_size: int,
+        batch_size: int,
+        flush_interval: float,
+    ) -> None:
+        """Создаёт пустую очередь, поток запускается первой генерацией."""
+        self._queue: queue.Queue[SituationGeneration] = queue.Queue(queue_size)
+        self._batch_size = batch_size
+        self._flush_interval = flush_interval
+        self._pending: dict[_Key, SituationGeneration] = {}
+        self._lock = threading.Lock()
+        self._stopping = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def get(self, seed: uuid.UUID, iteration: int) -> GenerationModel | None:
+        """Генерация, которая ещё ждёт записи, или ``None``."""
+        with self._lock:
+            situation_generation = self._pending.get(_key(seed, iteration))
+        if situation_generation is None:
+            return None
+        return situation_generation.generation
+
+    def put(
+        self,
+        situation_generation: "SituationGeneration",
+    ) -> GenerationModel | None:
+        """
+        Ставит генерацию в очередь на запись.
+
+        Возвращает генерацию, которую нужно отдать клиенту,
+        или ``None``, если очередь заполнена и сохранять нужно синхронно.
+        """
+        generation = situation_generation.generation
+        key = _key(generation.seed, generation.iteration)
+        with self._lock:
+            existing = self._pending.get(key)
+            if existing is not None:
+                return existing.generation
+            if self._stopping.is_set():
+                return None
+            try:
+                self._queue.put_nowait(situation_generation)
+            except queue.Full:
+                return None
+            self._pending[key] = situation_generation
+            self._ensure_started()
+        return generation
+
+    def close(self, timeout: float | None = None) -> None:
+        """Дописывает всё, что осталось в очереди, и останавливает поток."""
+        self._stopping.set()
+        thread = self._thread
+        if thread is not None and thread.is_alive():
+            thread.join(timeout)
+        self._flush()
+
+    def _ensure_started(self) -> None:
+        # Поток стартует в воркере при первой записи, а не в мастере,
+        # и после `fork` запускается заново:
+        if self._thread is None or not self._thread.is_alive():
+            self._thread = threading.Thread(
+                target=self._run,
+                name="game-generation-writer",
+                daemon=True,
+            )
+            self._thread.start()
+
+    def _run(self) -> None:
+        while not self._stopping.is_set():
+            try:
+                first = self._queue.get(timeout=self._flush_interval)
+            except queue.Empty:
+                continue
+            self._write(self._collect(first))
+        self._flush()
+
+    def _collect(
+        self,
+        first: "SituationGeneration",
+    ) -> list["SituationGeneration"]:
+        # Ждём остальную пачку не дольше интервала с первой генерации:
+        batch = [first]
+        deadline = time.monotonic() + self._flush_interval
+        while len(batch) < self._batch_size and not self._stopping.is_set():
+            timeout = deadline - time.monotonic()
+            if timeout <= 0:
+                break
+            try:
+                batch.append(self._queue.get(timeout=timeout))
+            except queue.Empty:
+                break
+        return batch
+
+    def _flush(self) -> None:
+        while batch := self._take(self._batch_size):
+            self._write(batch)
+
+    def _take(self, limit: int) -> list["SituationGeneration"]:
+        batch = []
+        while len(batch) < limit:
+            try:
+                batch.append(self._queue.get_nowait())
+            except queue.Empty:
+                break
+        return batch
+
+    def _write(self, batch: list["SituationGeneration"]) -> None:
+        try:
+            save_generations(batch)
+        except Exception:
+            logger.exception("Failed to write %d generations", len(batch))
+        finally:
+            with self._lock:
+                for item in batch:
+                    self._pending.pop(
+                        _key(item.generation.seed, item.generation.iteration),
+                        None,
+                    )
+            if threading.current_thread() is self._thread:
+                # Соединения этого потока возвращаются в пул между пачками:
+                connections.close_all()
+
+
+_writer: GenerationWriter | None = None
+_writer_lock = threading.Lock()
+
+
+def get_generation_writer() -> GenerationWriter | None:
+    """Возвращает очередь записи, если отложенная запись включена."""
+    global _writer  # noqa: PLW0603
+
+    if not settings.GAME_WRITE_BEHIND:
+        return None
+    if _writer is not None:
+        return _writer
+
+    with _writer_lock:
+        if _writer is None:
+            _writer = GenerationWriter(
+                queue_size=settings.GAME_WRITE_BEHIND_QUEUE_SIZE,
+                batch_size=settings.GAME_WRITE_BEHIND_BATCH_SIZE,
+                flush_interval=settings.GAME_WRITE_BEHIND_FLUSH_INTERVAL,
+            )
+        return _writer
+
+
+def close_generation_writer() -> None:
+    """Дописывает очередь при остановке процесса."""
+    global _writer
+
+    with _writer_lock:
+        writer, _writer = _writer, None
+    if writer is not None:
+        writer.close()
+
+
+atexit.register(close_generation_writer)
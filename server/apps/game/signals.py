@@ -0,0 +1,48 @@
+from typing import Any
+
+from django.db.models import ProtectedError
+from django.db.models.signals import post_delete, post_save, pre_delete
+
+from server.apps.game.models import (
+    HintModel,
+    ProductModel,
+    ReviewModel,
+    SituationModel,
+)
+from server.apps.game.services.catalog import (
+    CLIENT_FEATURE_SOURCES,
+    bump_catalog_version,
+    reset_catalog,
+)
+from server.apps.game.services.generation import find_answered_generation
+
+
+def on_catalog_changed(**kwargs: Any) -> None:
+    """Отмечает новую версию справочников."""
+    bump_catalog_version()
+    reset_catalog()
+
+
+def protect_answered_product(instance: ProductModel, **kwargs: Any) -> None:
+    """Запрещает удалять продукт, который есть в упакованных ответах."""
+    # Как `PROTECT` у строк ответов: иначе сохранённая итерация
+    # ссылалась бы на продукт, которого нет в справочнике.
+    generation = find_answered_generation(instance.pk)
+    if generation is not None:
+        raise ProtectedError(
+            f"Product {instance.pk} is an answer of stored generations",
+            {generation},
+        )
+
+
+for _model in (
+    ProductModel,
+    HintModel,
+    ReviewModel,
+    SituationModel,
+    *(model for model, _ in CLIENT_FEATURE_SOURCES.values()),
+):
+    post_save.connect(on_catalog_changed, sender=_model)
+    post_delete.connect(on_catalog_changed, sender=_model)
+
+pre_delete.connect(protect_answered_product, sender=ProductModel)
@@ -0,0 +1,210 @@
+"""
+Ограничение частоты дорогих запросов API игры.
+
+Чанк ситуаций, пачка подсказок и итог дня стоят столько итераций,
+сколько затрагивают, и один клиент мог занять все воркеры и бд.
+Кешируемые ``GET`` ситуации и подсказки итерации стоят одну итерацию.
+Каждый такой запрос списывает свою стоимость из двух корзин токенов:
+адреса клиента и сида. Если токенов не хватает хотя бы в одной,
+запрос получает ``429`` с ``Retry-After`` и ничего не списывается.
+Заголовок ``Authorization`` никто не проверяет, и новый токен в нём
+давал бы клиенту новую корзину, поэтому клиент определяется адресом.
+
+Корзины хранятся в кеше django. С ``RedisCache`` проверка и списание
+выполняются одним скриптом Lua, и лимит общий для всех воркеров.
+С другими кешами (``LocMemCache`` в разработке и в тестах) корзины
+меняются под блокировкой процесса, и каждый процесс считает свои.
+"""
+
+import math
+import threading
+import time
+from typing import TYPE_CHECKING, Final, NamedTuple
+from uuid import UUID
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.cache import DEFAULT_CACHE_ALIAS, cache, caches
+from django.core.cache.backends.redis import RedisCache
+from django.http import HttpRequest, HttpResponse
+from ninja.errors import Throttled
+from ninja.throttling import BaseThrottle
+
+from server.apps.game.services import metrics
+
+if TYPE_CHECKING:
+    from ninja import NinjaAPI
+
+_KEY_PREFIX: Final = "game:rate:"
+
+# KEYS: корзины, ARGV: по три числа на корзину (скорость, объём, стоимость).
+# Возвращает строку, потому что дробные числа Lua redis округляет:
+_ADMIT_SCRIPT: Final = """
+local clock = redis.call("TIME")
+local now = tonumber(clock[1]) + tonumber(clock[2]) / 1000000
+local tokens = {}
+local wait = 0
+for index, key in ipairs(KEYS) do
+    local rate = tonumber(ARGV[index * 3 - 2])
+    local burst = tonumber(ARGV[index * 3 - 1])
+    local cost = tonumber(ARGV[index * 3])
+    local state = redis.call("HMGET", key, "tokens", "updated")
+    local available = burst
+    if state[1] then
+        available = math.min(
+            burst,
+            tonumber(state[1]) + math.max(0, now - tonumber(state[2])) * rate
+        )
+    end
+    tokens[index] = available - cost
+    if available < cost then
+        wait = math.max(wait, (cost - available) / rate)
+    end
+end
+if wait > 0 then
+    return tostring(wait)
+end
+for index, key in ipairs(KEYS) do
+    local rate = tonumber(ARGV[index * 3 - 2])
+    local burst = tonumber(ARGV[index * 3 - 1])
+    redis.call(
+        "HSET", key, "tokens", tostring(tokens[index]), "updated", tostring(now)
+    )
+    redis.call("PEXPIRE", key, math.ceil(burst / rate * 1000))
+end
+return "0"
+"""
+
+_lock = threading.Lock()
+_ident: Final = BaseThrottle()
+
+
+class Bucket(NamedTuple):
+    key: str
+    rate: float
+    burst: int
+
+    @property
+    def timeout(self) -> int:
+        """Сколько хранить состояние корзины в кеше."""
+        # За это время корзина наполняется, и её можно забыть:
+        return math.ceil(self.burst / self.rate)
+
+    def cost(self, cost: int) -> int:
+        """Сколько токенов списать с этой корзины за запрос."""
+        # Запрос дороже объёма корзины иначе не прошёл бы никогда:
+        return min(max(cost, 1), self.burst)
+
+
+class RateLimited(Throttled):
+    """Корзине клиента или сида не хватает токенов на запрос."""
+
+    def __init__(self, wait: float) -> None:
+        """Запоминает, через сколько секунд повторить запрос."""
+        # `Retry-After` принимает только целые секунды:
+        super().__init__(wait=math.ceil(wait))
+
+
+def _buckets(request: HttpRequest, seed: UUID) -> list[Bucket]:
+    buckets = []
+    if settings.GAME_RATE_LIMIT_CLIENT_RATE > 0:
+        # Адрес из `X-Forwarded-For`, если задан `NINJA_NUM_PROXIES`:
+        ident = _ident.get_ident(request)
+        buckets.append(
+            Bucket(
+                f"{_KEY_PREFIX}client:{ident}",
+                settings.GAME_RATE_LIMIT_CLIENT_RATE,
+                settings.GAME_RATE_LIMIT_CLIENT_BURST,
+            ),
+        )
+    if settings.GAME_RATE_LIMIT_SEED_RATE > 0:
+        buckets.append(
+            Bucket(
+                f"{_KEY_PREFIX}seed:{seed}",
+                settings.GAME_RATE_LIMIT_SEED_RATE,
+                settings.GAME_RATE_LIMIT_SEED_BURST,
+            ),
+        )
+    return buckets
+
+
+def _take_shared(
+    redis_cache: RedisCache,
+    buckets: list[Bucket],
+    cost: int,
+) -> float:
+    client = redis_cache._cache.get_client(write=True)  # noqa: SLF001
+    wait = client.eval(
+        _ADMIT_SCRIPT,
+        len(buckets),
+        *[redis_cache.make_and_validate_key(bucket.key) for bucket in buckets],
+        *[
+            value
+            for bucket in buckets
+            for value in (bucket.rate, bucket.burst, bucket.cost(cost))
+        ],
+    )
+    return float(wait)
+
+
+def _take_local(buckets: list[Bucket], cost: int) -> float:
+    with _lock:
+        # Время стены, а не монотонное: кеш может быть общим для машин.
+        now = time.time()
+        states = cache.get_many([bucket.key for bucket in buckets])
+        tokens = {}
+        wait = 0.0
+        for bucket in buckets:
+            available = float(bucket.burst)
+            if bucket.key in states:
+                stored, updated = states[bucket.key]
+                available = min(
+                    available,
+                    stored + max(0.0, now - updated) * bucket.rate,
+                )
+            tokens[bucket] = available - bucket.cost(cost)
+            if tokens[bucket] < 0:
+                wait = max(wait, -tokens[bucket] / bucket.rate)
+        if wait > 0:
+            return wait
+        for bucket in buckets:
+            cache.set(bucket.key, (tokens[bucket], now), timeout=bucket.timeout)
+    return 0.0
+
+
+def admit(request: HttpRequest, cost: int, seed: UUID) -> None:
+    """Списывает стоимость запроса или бросает ``RateLimited``."""
+    buckets = _buckets(request, seed)
+    if not buckets:
+        return
+    # `cache` только проксирует бэкенд, сам он не `RedisCache`:
+    backend = caches[DEFAULT_CACHE_ALIAS]
+    if isinstance(backend, RedisCache):
+        wait = _take_shared(backend, buckets, cost)
+    else:
+        wait = _take_local(buckets, cost)
+    if wait > 0:
+        metrics.incr(metrics.RATE_LIMIT_REJECTED)
+        metrics.incr(metrics.RATE_LIMIT_REJECTED_COST, cost)
+        raise RateLimited(wait)
+    metrics.incr(metrics.RATE_LIMIT_ADMITTED_COST, cost)
+
+
+async def aadmit(request: HttpRequest, cost: int, seed: UUID) -> None:
+    """Асинхронная версия ``admit``."""
+    await sync_to_async(admit)(request, cost, seed)
+
+
+def rate_limited_response(
+    request: HttpRequest,
+    exc: RateLimited,
+    api: "NinjaAPI",
+) -> HttpResponse:
+    """Ответ ``429`` с заголовком ``Retry-After``."""
+    response = api.create_response(
+        request,
+        {"detail": str(exc)},
+        status=exc.status_code,
+    )
+    response["Retry-After"] = str(exc.wait)
+    return response
@@ -1,17 +1,43 @@
-from django.http import HttpRequest
-from ninja import Router
+import uuid
+from collections.abc import Iterable
+from typing import Any
 
+from django.conf import settings
+from django.http import (
+    Http404,
+    HttpRequest,
+    HttpResponse,
+    HttpResponseRedirect,
+    StreamingHttpResponse,
+)
+from django.utils.cache import patch_cache_control
+from ninja import Query, Router
 
+from server.apps.game import caching, renderers, throttling
+from server.apps.game.services import (
+    answer_cache,
+    day_results,
+    day_sessions,
+    generation,
+    leaderboard,
+    pagination,
+    payloads,
+    prefetch,
+)
 from server.apps.game.services.dto import (
-    GenerateSituationParams,
-    Situation,
-    SituationHint,
     AcknowledgeDayFinish,
     AcknowledgeDayFinishResponse,
     GenerateChunkSituation,
+    GenerateHints,
+    GenerateSituationParams,
+    Leaderboard,
+    LeaderboardPeriod,
+    LeaderboardRank,
+    Situation,
+    SituationHint,
+    ValidateSituationAnswer,
+    ValidateStuationAnswerResponse,
 )
-from server.apps.game.services import generation
-
 
 router = Router()
 
@@ -19,34 +45,172 @@ router = Router()
 @router.post("/generateSituation", response=Situation)
 def generate_situation(
     request: HttpRequest, generation_params: GenerateSituationParams
-) -> Situation:
-    generation_instance = generation.generate_situation(generation_params)
-    return Situation.from_generation_model(generation_instance)
+) -> Situation | HttpResponse:
+    if settings.GAME_DAY_SESSIONS:
+        situation: Situation | HttpResponse = day_sessions.generate_situation(
+            generation_params
+        )
+    else:
+        # Готовый ответ отдаётся как есть, без повторной валидации:
+        situation = renderers.render_response(
+            request,
+            generation.generate_situation_data(generation_params),
+        )
+    prefetch.on_situation_served(generation_params)
+    return situation
 
 
 @router.post("/getHint", response=SituationHint)
 def get_hint(
     request: HttpRequest, generation_params: GenerateSituationParams
 ) -> SituationHint:
+    if settings.GAME_DAY_SESSIONS:
+        return day_sessions.get_hint(generation_params)
     hint_instance = generation.get_hint(generation_params)
-    return SituationHint.model_validate(
-        hint_instance,
-        from_attributes=True,
+    return SituationHint.from_hint_model(hint_instance)
+
+
+@router.post("/getHints", response=list[SituationHint])
+def get_hints(
+    request: HttpRequest, hints_data: GenerateHints
+) -> list[SituationHint]:
+    """Подсказки нескольких итераций одним запросом."""
+    throttling.admit(request, len(hints_data.iterations), hints_data.seed)
+    if settings.GAME_DAY_SESSIONS:
+        return day_sessions.get_hints(hints_data)
+    return generation.get_hints(hints_data)
+
+
+@router.post("/validateAnswer", response=ValidateStuationAnswerResponse)
+def validate_answer(
+    request: HttpRequest, data: ValidateSituationAnswer
+) -> ValidateStuationAnswerResponse:
+    """Проверяет один рекомендованный продукт итерации."""
+    correct_product_ids = answer_cache.get_correct_product_ids(
+        data.generation_params,
+    )
+    return ValidateStuationAnswerResponse.model_construct(
+        is_success=data.recommended_product_id in correct_product_ids,
     )
 
 
 @router.post("/acknowledgeDayFinish", response=AcknowledgeDayFinishResponse)
 def acknowledge_day_finish(
     request: HttpRequest, data: AcknowledgeDayFinish
-) -> AcknowledgeDayFinishResponse:
-    return generation.acknowledge_day_finish(data)
+) -> HttpResponse:
+    throttling.admit(request, len(data.answers), data.seed)
+    # Повтор запроса получает сохранённый итог без пересчёта:
+    return renderers.render_response(
+        request,
+        day_results.acknowledge_day_finish(data),
+    )
 
 
 @router.post("/generateChunkSituations", response=list[Situation])
 def generate_situations_chunked(
-    request: HttpRequest, data: GenerateChunkSituation
+    request: HttpRequest, response: HttpResponse, data: GenerateChunkSituation
 ) -> list[Situation]:
+    throttling.admit(request, len(data.iterations), data.seed)
+    if data.next_cursor is not None:
+        response[pagination.NEXT_CURSOR_HEADER] = data.next_cursor
+    if settings.GAME_DAY_SESSIONS:
+        return day_sessions.generate_chunk_situations(data)
     return [
         Situation.from_generation_model(_)
         for _ in generation.generate_chunk_iterations(data)
     ]
+
+
+@router.post("/streamChunkSituations", response=list[Situation])
+def stream_situations_chunked(
+    request: HttpRequest, data: GenerateChunkSituation
+) -> StreamingHttpResponse:
+    """Ситуации окна строками NDJSON, по мере готовности."""
+    throttling.admit(request, len(data.iterations), data.seed)
+    # Каждая итерация отправляется, как только прочитана или сгенерирована:
+    if settings.GAME_DAY_SESSIONS:
+        situations: Iterable[Any] = day_sessions.generate_chunk_situations(data)
+    else:
+        situations = generation.iter_chunk_situation_data(data)
+    response = StreamingHttpResponse(
+        renderers.ndjson_lines(situations),
+        content_type=renderers.NDJSON_MEDIA_TYPE,
+    )
+    if data.next_cursor is not None:
+        response[pagination.NEXT_CURSOR_HEADER] = data.next_cursor
+    return response
+
+
+@router.get("/situation/{seed}/{iteration}", response=Situation)
+def get_situation(
+    request: HttpRequest, seed: uuid.UUID, iteration: int
+) -> HttpResponse:
+    """Кешируемая ситуация итерации."""
+    if not pagination.is_day_iteration(iteration):
+        raise Http404
+    throttling.admit(request, 1, seed)
+    generation_params = GenerateSituationParams(
+        seed=seed,
+        num_iterations=iteration,
+    )
+    sprite_link = caching.sprite_links(request)
+    if settings.GAME_DAY_SESSIONS:
+        situation = day_sessions.generate_situation(
+            generation_params,
+            sprite_link,
+        ).model_dump(mode="json")
+    else:
+        situation = generation.generate_situation_data(
+            generation_params,
+            sprite_link,
+        )
+    prefetch.on_situation_served(generation_params)
+    return caching.cacheable_response(request, situation)
+
+
+@router.get("/hint/{seed}/{iteration}", response=SituationHint)
+def get_hint_by_iteration(
+    request: HttpRequest, seed: uuid.UUID, iteration: int
+) -> HttpResponse:
+    """Кешируемая подсказка итерации."""
+    if not pagination.is_day_iteration(iteration):
+        raise Http404
+    throttling.admit(request, 1, seed)
+    hint = get_hint(
+        request,
+        GenerateSituationParams(seed=seed, num_iterations=iteration),
+    )
+    return caching.cacheable_response(request, hint.model_dump(mode="json"))
+
+
+@router.get("/sprite/{path:name}", url_name=caching.SPRITE_URL_NAME)
+def get_sprite(request: HttpRequest, name: str) -> HttpResponse:
+    """Перенаправляет на свежую ссылку спрайта в хранилище."""
+    if not payloads.is_sprite(name):
+        raise Http404
+    # Постоянный адрес спрайта для кешируемых ответов:
+    response = HttpResponseRedirect(payloads.sprite_url(name))
+    patch_cache_control(response, public=True, max_age=caching.sprite_max_age())
+    return response
+
+
+@router.get("/leaderboard/{period}", response=Leaderboard)
+def get_leaderboard(
+    request: HttpRequest,
+    period: LeaderboardPeriod,
+    limit: int = Query(10, ge=1, le=leaderboard.MAX_TOP_SIZE),
+) -> Leaderboard:
+    """Лучшие игроки текущего дня, недели или всего времени."""
+    return leaderboard.get_top(period, limit)
+
+
+@router.get("/leaderboard/{period}/{seed}", response=LeaderboardRank)
+def get_leaderboard_rank(
+    request: HttpRequest, period: LeaderboardPeriod, seed: uuid.UUID
+) -> LeaderboardRank:
+    """Место завершённого дня в таблице лидеров периода."""
+    rank = leaderboard.get_rank(seed, period)
+    if rank is None:
+        # День ещё не завершён через `/acknowledgeDayFinish`:
+        raise Http404
+    return rank
@@ -28,6 +28,7 @@ _base_settings = (
     "components/csp.py",
     "components/caches.py",
     "components/jazzmin.py",
+    "components/game.py",
     # Select the right env:
     f"environments/{_ENV}.py",
     # Optionally override some settings:
@@ -1,13 +1,26 @@
 # Caching
 # https://docs.djangoproject.com/en/5.2/topics/cache/
 
-CACHES = {
-    "default": {
-        # TODO: use some other cache in production,
-        # like https://github.com/jazzband/django-redis
-        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
-    },
-}
+from server.settings.components import config
+
+# Game counters and rate limits must be shared by all workers,
+# so production requires redis, see `environments/production.py`.
+# Without it every process keeps a cache of its own:
+_REDIS_URL = config("DJANGO_REDIS_URL", default="")
+
+if _REDIS_URL:
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.redis.RedisCache",
+            "LOCATION": _REDIS_URL,
+        },
+    }
+else:
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        },
+    }
 
 
 # django-axes
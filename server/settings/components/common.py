@@ -8,6 +8,9 @@ For the full list of settings and their config, see
 https://docs.djangoproject.com/en/5.2/ref/settings/
 """
 
+import copy
+
+from decouple import Csv
 from django.utils.translation import gettext_lazy as _
 
 from server.settings.components import BASE_DIR, config
@@ -49,6 +52,8 @@ INSTALLED_APPS: tuple[str, ...] = (
 MIDDLEWARE: tuple[str, ...] = (
     # Logging:
     "server.settings.components.logging.LoggingContextVarsMiddleware",
+    # Read replicas:
+    "server.apps.game.db_routers.PrimaryPinningMiddleware",
     # Content Security Policy:
     # "csp.middleware.CSPMiddleware",
     # Django:
@@ -57,17 +62,23 @@ MIDDLEWARE: tuple[str, ...] = (
     "corsheaders.middleware.CorsMiddleware",
     # django-permissions-policy
     "django_permissions_policy.PermissionsPolicyMiddleware",
-    "django.contrib.sessions.middleware.SessionMiddleware",
-    "django.middleware.locale.LocaleMiddleware",
+    # Sessions, locale, auth and messages are skipped
+    # for `STATELESS_PATH_PREFIXES`, see `server.apps.game.middleware`:
+    "server.apps.game.middleware.SessionMiddleware",
+    "server.apps.game.middleware.LocaleMiddleware",
     "django.middleware.common.CommonMiddleware",
     "django.middleware.csrf.CsrfViewMiddleware",
-    "django.contrib.auth.middleware.AuthenticationMiddleware",
-    "django.contrib.messages.middleware.MessageMiddleware",
+    "server.apps.game.middleware.AuthenticationMiddleware",
+    "server.apps.game.middleware.MessageMiddleware",
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
     # Axes:
     # "axes.middleware.AxesMiddleware",
 )
 
+# Paths of the stateless JSON API, they need no session,
+# user, messages or language of the request:
+STATELESS_PATH_PREFIXES: tuple[str, ...] = ("/api/game/",)
+
 ROOT_URLCONF = "server.urls"
 
 WSGI_APPLICATION = "server.wsgi.application"
@@ -85,6 +96,7 @@ DATABASES = {
         "HOST": config("DJANGO_DATABASE_HOST"),
         "PORT": config("DJANGO_DATABASE_PORT", cast=int),
         "CONN_MAX_AGE": config("CONN_MAX_AGE", cast=int, default=60),
+        "CONN_HEALTH_CHECKS": True,
         "OPTIONS": {
             "connect_timeout": 10,
             "options": "-c statement_timeout=15000ms",
@@ -93,6 +105,73 @@ DATABASES = {
     },
 }
 
+# Connection pooling (psycopg 3)
+# https://docs.djangoproject.com/en/5.2/ref/databases/#connection-pool
+# https://www.psycopg.org/psycopg3/docs/api/pool.html
+
+if config("DJANGO_DATABASE_PGBOUNCER", cast=bool, default=False):
+    # PgBouncer in transaction mode pools connections itself:
+    # server-side cursors do not survive between transactions there,
+    # and startup `options` are rejected, so set `statement_timeout`
+    # with `ALTER ROLE` instead. Prepared statements are disabled by django.
+    DATABASES["default"]["DISABLE_SERVER_SIDE_CURSORS"] = True
+    DATABASES["default"]["OPTIONS"].pop("options")
+elif config("DJANGO_DATABASE_POOL", cast=bool, default=True):
+    # Persistent connections are replaced by the pool:
+    DATABASES["default"]["CONN_MAX_AGE"] = 0
+    DATABASES["default"]["OPTIONS"]["pool"] = {
+        "min_size": config(
+            "DJANGO_DATABASE_POOL_MIN_SIZE",
+            cast=int,
+            default=1,
+        ),
+        "max_size": config(
+            "DJANGO_DATABASE_POOL_MAX_SIZE",
+            cast=int,
+            default=4,
+        ),
+        # Seconds to wait for a free connection before failing the request:
+        "timeout": config(
+            "DJANGO_DATABASE_POOL_TIMEOUT",
+            cast=float,
+            default=10,
+        ),
+        "max_idle": config(
+            "DJANGO_DATABASE_POOL_MAX_IDLE",
+            cast=float,
+            default=600,
+        ),
+        "max_lifetime": config(
+            "DJANGO_DATABASE_POOL_MAX_LIFETIME",
+            cast=float,
+            default=3600,
+        ),
+    }
+    # `CONN_HEALTH_CHECKS` makes django pass `ConnectionPool.check_connection`,
+    # so each connection is checked before it is handed out.
+
+# Read replicas
+# https://docs.djangoproject.com/en/5.2/topics/db/multi-db/
+
+# Each host from `DJANGO_DATABASE_REPLICA_HOSTS` becomes a `replica_N` alias
+# with the same credentials as the primary. Game reads are spread between
+# them by `server.apps.game.db_routers.GameReplicaRouter`, writes stay
+# on `default`. Tests use replicas as mirrors of the test database.
+DATABASE_REPLICAS: tuple[str, ...] = ()
+for _index, _replica in enumerate(
+    config("DJANGO_DATABASE_REPLICA_HOSTS", cast=Csv(), default=""),
+):
+    _replica_host, _replica_sep, _replica_port = _replica.partition(":")
+    DATABASES[f"replica_{_index}"] = {
+        **copy.deepcopy(DATABASES["default"]),
+        "HOST": _replica_host,
+        "PORT": int(_replica_port or DATABASES["default"]["PORT"]),
+        "TEST": {"MIRROR": "default"},
+    }
+    DATABASE_REPLICAS += (f"replica_{_index}",)
+
+DATABASE_ROUTERS = ("server.apps.game.db_routers.GameReplicaRouter",)
+
 # DATABASES = {
 #     "default": {
 #         "ENGINE": "django.db.backends.sqlite3",
@@ -208,6 +287,8 @@ CORS_ALLOWED_ORIGINS = ["https://*"]
 CORS_ALLOW_CREDENTIALS = True
 CORS_ALLOW_ALL_ORIGINS = True
 CORS_ALLOW_HEADERS = ["*"]
+# Cursor of the next chunk window, see `server.apps.game.services.pagination`:
+CORS_EXPOSE_HEADERS = ["X-Next-Cursor"]
 
 STORAGES = {
     "default": {
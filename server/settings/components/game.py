@@ -0,0 +1,121 @@
+# Game settings
+# These values tune the stateless game API in `server.apps.game`.
+
+from server.settings.components import config
+
+# How long (in seconds) a worker trusts its catalog snapshot
+# before checking the catalog version in the database again:
+GAME_CATALOG_TTL = config("GAME_CATALOG_TTL", cast=int, default=60)
+
+# Directory for the shared memory-mapped catalog file,
+# use a `tmpfs` like `/dev/shm/game-catalog` in production.
+# Empty value keeps a separate in-memory catalog in each worker:
+GAME_CATALOG_MMAP_DIR = config("GAME_CATALOG_MMAP_DIR", default="")
+
+# Write-behind mode for new generations: the response is returned right
+# after a generation is computed, and a background thread of the worker
+# inserts queued generations in batches. Disabled by default:
+GAME_WRITE_BEHIND = config("GAME_WRITE_BEHIND", cast=bool, default=False)
+# Generations are saved synchronously while this many are waiting:
+GAME_WRITE_BEHIND_QUEUE_SIZE = config(
+    "GAME_WRITE_BEHIND_QUEUE_SIZE",
+    cast=int,
+    default=1000,
+)
+GAME_WRITE_BEHIND_BATCH_SIZE = config(
+    "GAME_WRITE_BEHIND_BATCH_SIZE",
+    cast=int,
+    default=100,
+)
+# Seconds the writer collects a batch after the first queued generation:
+GAME_WRITE_BEHIND_FLUSH_INTERVAL = config(
+    "GAME_WRITE_BEHIND_FLUSH_INTERVAL",
+    cast=float,
+    default=0.5,
+)
+
+# Number of upcoming iterations generated in the background
+# after a situation is served, `0` disables prefetching:
+GAME_PREFETCH_AHEAD = config("GAME_PREFETCH_AHEAD", cast=int, default=0)
+GAME_PREFETCH_WORKERS = config("GAME_PREFETCH_WORKERS", cast=int, default=2)
+# Prefetching is skipped while this many iterations are waiting:
+GAME_PREFETCH_QUEUE_SIZE = config(
+    "GAME_PREFETCH_QUEUE_SIZE",
+    cast=int,
+    default=100,
+)
+
+# Store each game day as one `DaySessionModel` row per seed
+# instead of `GenerationModel` rows with answers.
+# Write-behind mode applies only to `GenerationModel` rows:
+GAME_DAY_SESSIONS = config("GAME_DAY_SESSIONS", cast=bool, default=False)
+
+# Store answers only as packed product ids on `GenerationModel`
+# instead of `GenerationAnswerModel` rows. Ids are always written,
+# rows of older generations are still read until they are migrated:
+GAME_COMPACT_ANSWERS = config("GAME_COMPACT_ANSWERS", cast=bool, default=False)
+
+# Generations are stored in weekly partitions on PostgreSQL,
+# `rotate_generation_partitions` drops weeks older than this:
+GAME_GENERATION_RETENTION_DAYS = config(
+    "GAME_GENERATION_RETENTION_DAYS",
+    cast=int,
+    default=28,
+)
+
+# Seconds caches may keep responses of GET game endpoints,
+# a situation only changes when the catalog is edited:
+GAME_CACHE_MAX_AGE = config("GAME_CACHE_MAX_AGE", cast=int, default=3600)
+
+# Most iterations generated by one chunk request,
+# clients page through longer days with a continuation cursor:
+GAME_CHUNK_MAX_ITERATIONS = config(
+    "GAME_CHUNK_MAX_ITERATIONS",
+    cast=int,
+    default=50,
+)
+
+# Most iterations in a game day, bounds the iteration
+# of cacheable GET routes and the length of chunked days:
+GAME_DAY_MAX_ITERATIONS = config(
+    "GAME_DAY_MAX_ITERATIONS",
+    cast=int,
+    default=1000,
+)
+
+# Iterations whose correct products a worker keeps in memory
+# to answer `/validateAnswer` without the database:
+GAME_ANSWER_CACHE_SIZE = config(
+    "GAME_ANSWER_CACHE_SIZE",
+    cast=int,
+    default=10000,
+)
+
+# Token buckets of expensive game endpoints, a request costs
+# the number of iterations it touches. Buckets refill at the rate
+# in iterations per second up to the burst, `0` disables a bucket:
+GAME_RATE_LIMIT_CLIENT_RATE = config(
+    "GAME_RATE_LIMIT_CLIENT_RATE",
+    cast=float,
+    default=20,
+)
+GAME_RATE_LIMIT_CLIENT_BURST = config(
+    "GAME_RATE_LIMIT_CLIENT_BURST",
+    cast=int,
+    default=500,
+)
+GAME_RATE_LIMIT_SEED_RATE = config(
+    "GAME_RATE_LIMIT_SEED_RATE",
+    cast=float,
+    default=5,
+)
+GAME_RATE_LIMIT_SEED_BURST = config(
+    "GAME_RATE_LIMIT_SEED_BURST",
+    cast=int,
+    default=200,
+)
+
+# Reverse proxies in front of django that append to `X-Forwarded-For`,
+# rate limits take the client address from it. Keep `0` when django
+# is reachable directly, or clients could pick any address:
+NINJA_NUM_PROXIES = config("NINJA_NUM_PROXIES", cast=int, default=0)
@@ -7,10 +7,11 @@
 
 from __future__ import annotations
 
-from collections.abc import Callable
-from typing import TYPE_CHECKING, final
+from collections.abc import Awaitable, Callable
+from typing import TYPE_CHECKING, Any, final
 
 import structlog
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
 
 if TYPE_CHECKING:
     from django.http import HttpRequest, HttpResponse
@@ -72,21 +73,38 @@ LOGGING = {
 class LoggingContextVarsMiddleware:
     """Used to reset ContextVars in structlog on each request."""
 
+    sync_capable = True
+    async_capable = True
+
     def __init__(
         self,
-        get_response: Callable[[HttpRequest], HttpResponse],
+        get_response: Callable[[HttpRequest], Any],
     ) -> None:
         """Django's API-compatible constructor."""
         self.get_response = get_response
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
 
-    def __call__(self, request: HttpRequest) -> HttpResponse:
+    def __call__(
+        self,
+        request: HttpRequest,
+    ) -> HttpResponse | Awaitable[HttpResponse]:
         """
         Handle requests.
 
         Add your logging metadata here.
         Example: https://github.com/jrobichaud/django-structlog
         """
-        response = self.get_response(request)
+        if self.async_mode:
+            return self._acall(request)
+        response: HttpResponse = self.get_response(request)
+        structlog.contextvars.clear_contextvars()
+        return response
+
+    async def _acall(self, request: HttpRequest) -> HttpResponse:
+        """Handle requests of async views without a thread."""
+        response: HttpResponse = await self.get_response(request)
         structlog.contextvars.clear_contextvars()
         return response
 
@@ -87,7 +87,9 @@ INTERNAL_IPS += ["127.0.0.1", "10.0.2.2"]
 
 def _custom_show_toolbar(request: HttpRequest) -> bool:
     """Only show the debug toolbar to users with the superuser flag."""
-    return DEBUG and request.user.is_superuser
+    # Stateless API paths have no `request.user`, see `STATELESS_PATH_PREFIXES`:
+    user = getattr(request, "user", None)
+    return DEBUG and user is not None and user.is_superuser
 
 
 DEBUG_TOOLBAR_CONFIG = {
@@ -22,6 +22,18 @@ ALLOWED_HOSTS = [
 ]
 
 
+# Caching
+# https://docs.djangoproject.com/en/5.2/topics/cache/
+
+# Game counters and rate limits are summed by all workers only in redis:
+CACHES = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.redis.RedisCache",
+        "LOCATION": config("DJANGO_REDIS_URL"),
+    },
+}
+
+
 # Staticfiles
 # https://docs.djangoproject.com/en/5.2/ref/contrib/staticfiles/
 
@@ -9,23 +9,32 @@ This examples uses Django's default media
 files serving technique in development.
 """
 
+from functools import partial
+
 from django.conf import settings
+from django.conf.urls.static import static
 from django.contrib import admin
 from django.contrib.admindocs import urls as admindocs_urls
 from django.urls import include, path
 from django.views.generic import TemplateView
 from health_check import urls as health_urls
-from ninja import NinjaAPI
-from django.conf.urls.static import static
 
+from server.apps.game import throttling
+from server.apps.game.async_views import router as async_game_router
+from server.apps.game.renderers import NegotiatingNinjaAPI
+from server.apps.game.views import router as game_router
 from server.apps.main import urls as main_urls
 from server.apps.main.views import index
-from server.apps.game.views import router as game_router
 
 admin.autodiscover()
 
-ninja_api = NinjaAPI()
+ninja_api = NegotiatingNinjaAPI()
 ninja_api.add_router("game", game_router)
+ninja_api.add_router("game/async", async_game_router)
+ninja_api.add_exception_handler(
+    throttling.RateLimited,
+    partial(throttling.rate_limited_response, api=ninja_api),
+)
 
 urlpatterns = [
     # Apps:
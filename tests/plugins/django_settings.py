@@ -1,5 +1,40 @@
+import copy
+from collections.abc import Iterator
+
 import pytest
-from django.conf import LazySettings
+from django.conf import LazySettings, settings
+from django.db import connections
+
+_MIRROR = "replica_mirror"
+
+
+def pytest_configure() -> None:
+    """
+    Adds a replica that mirrors the test database.
+
+    Routing to replicas is tested without ``DJANGO_DATABASE_REPLICA_HOSTS``,
+    the mirror is another connection to the same test database.
+    """
+    if settings.DATABASE_REPLICAS:
+        return
+    settings.DATABASES[_MIRROR] = {
+        **copy.deepcopy(settings.DATABASES["default"]),
+        "TEST": {"MIRROR": "default"},
+    }
+    settings.DATABASE_REPLICAS = (_MIRROR,)
+
+
+@pytest.fixture(scope="session")
+def django_db_setup(django_db_setup: None) -> Iterator[None]:
+    """
+    Closes the pool of the mirror before the test database is dropped.
+
+    Django closes pools only of the databases it creates.
+    """
+    yield
+    if _MIRROR in connections:
+        connections[_MIRROR].close()
+        connections[_MIRROR].close_pool()
 
 
 @pytest.fixture(autouse=True)
@@ -11,6 +46,22 @@ def _media_root(
     settings.MEDIA_ROOT = tmpdir_factory.mktemp("media", numbered=True)
 
 
+@pytest.fixture(autouse=True)
+def _storages(settings: LazySettings) -> None:
+    """
+    Stores media files locally instead of S3.
+
+    Signed S3 links change every second, so responses of the same
+    generation would not compare equal.
+    """
+    settings.STORAGES = {
+        **settings.STORAGES,
+        "default": {
+            "BACKEND": "django.core.files.storage.FileSystemStorage",
+        },
+    }
+
+
 @pytest.fixture(autouse=True)
 def _password_hashers(settings: LazySettings) -> None:
     """Forces django to use fast password hashers for tests."""
@@ -33,3 +84,14 @@ def _debug(settings: LazySettings) -> None:
     settings.DEBUG = False
     for template in settings.TEMPLATES:
         template["OPTIONS"]["debug"] = True
+
+
+@pytest.fixture(autouse=True)
+def _database_replicas(settings: LazySettings) -> None:
+    """
+    Routes all reads to the test database.
+
+    Test mirrors do not see rows written inside a test transaction,
+    tests that need replicas enable them explicitly.
+    """
+    settings.DATABASE_REPLICAS = ()
@@ -0,0 +1,106 @@
+import pytest
+from django.conf import LazySettings
+from django.core.cache import cache
+
+from server.apps.game.models import (
+    AgeGroupModel,
+    CityModel,
+    FirstNameModel,
+    HintModel,
+    JobSphereModel,
+    LastNameModel,
+    ProductModel,
+    ProductRecommendationConditionModel,
+    ReviewModel,
+    SituationModel,
+    SpriteModel,
+)
+from server.apps.game.services import answer_cache
+from server.apps.game.services.catalog import reset_catalog
+
+
+@pytest.fixture(autouse=True)
+def _clean_catalog() -> None:
+    """Makes sure each test starts with an empty catalog cache."""
+    reset_catalog()
+
+
+@pytest.fixture(autouse=True)
+def _clean_rate_limits() -> None:
+    """Makes sure requests of earlier tests do not count against limits."""
+    cache.clear()
+
+
+@pytest.fixture(autouse=True)
+def _clean_answer_cache() -> None:
+    """Makes sure answers validated by earlier tests are not remembered."""
+    answer_cache.clear()
+
+
+@pytest.fixture
+def redis_server(settings: LazySettings) -> object:
+    """Switches the default cache to an in-memory redis for one test."""
+    fakeredis = pytest.importorskip("fakeredis")
+    server = fakeredis.FakeServer()
+    settings.CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.redis.RedisCache",
+            "LOCATION": "redis://localhost:6379/0",
+            "OPTIONS": {
+                "connection_class": fakeredis.FakeRedisConnection,
+                "server": server,
+            },
+        },
+    }
+    return server
+
+
+@pytest.fixture
+def game_catalog(db: None) -> list[ProductModel]:
+    """Creates a minimal catalog to generate situations from."""
+    age_groups = [
+        AgeGroupModel.objects.create(name=f"age{i}") for i in range(2)
+    ]
+    CityModel.objects.create(name="Москва")
+    JobSphereModel.objects.create(name="IT")
+    for gender in ("male", "female"):
+        FirstNameModel.objects.create(content=f"{gender} имя", gender=gender)
+        LastNameModel.objects.create(content=f"{gender} фамилия", gender=gender)
+        for age_group in age_groups:
+            SpriteModel.objects.create(
+                image=f"sprites/{gender}.png",
+                gender=gender,
+                age_group=age_group,
+            )
+
+    products = [
+        ProductModel.objects.create(name=f"p{i}", link=f"https://a.ru/{i}")
+        for i in range(6)
+    ]
+    ReviewModel.objects.create(
+        product=None,
+        is_product_in_answer=False,
+        text="Спасибо!",
+    )
+    for product in products:
+        HintModel.objects.create(product=product, text=f"hint {product.id}")
+        for status in (True, False):
+            ReviewModel.objects.create(
+                product=product,
+                is_product_in_answer=status,
+                text=f"{product.id} {status}",
+            )
+
+    for index in range(2):
+        situation = SituationModel.objects.create(
+            male_text=f"m{index}",
+            female_text=f"f{index}",
+        )
+        situation.common_products.add(products[index], products[index + 1])
+        situation.allowed_age_groups.add(*age_groups)
+        ProductRecommendationConditionModel.objects.create(
+            product=products[index + 2],
+            situation=situation,
+            children_condition=True,
+        )
+    return products
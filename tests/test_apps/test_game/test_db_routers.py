@@ -0,0 +1,162 @@
+import uuid
+from collections.abc import Callable
+from contextlib import ExitStack
+from http import HTTPStatus
+
+import pytest
+from asgiref.sync import async_to_sync, iscoroutinefunction
+from django.conf import LazySettings, settings
+from django.contrib.auth.models import User
+from django.db import DEFAULT_DB_ALIAS, connections
+from django.http import HttpRequest, HttpResponse
+from django.test import Client, RequestFactory, override_settings
+from django.test.utils import CaptureQueriesContext
+
+from server.apps.game.db_routers import (
+    GameReplicaRouter,
+    PrimaryPinningMiddleware,
+)
+from server.apps.game.models import GenerationModel, ProductModel
+
+_REPLICAS = ("replica_0", "replica_1")
+_CONFIGURED_REPLICAS = settings.DATABASE_REPLICAS
+
+
+def _in_request(check: Callable[[], None]) -> None:
+    def get_response(request: HttpRequest) -> HttpResponse:
+        check()
+        return HttpResponse()
+
+    middleware = PrimaryPinningMiddleware(get_response)
+    middleware(RequestFactory().get("/"))
+
+
+@override_settings(DATABASE_REPLICAS=_REPLICAS)
+def test_reads_go_to_replicas() -> None:
+    """Ensures that game reads are routed to replicas, other apps are not."""
+    router = GameReplicaRouter()
+
+    def check() -> None:
+        assert router.db_for_read(GenerationModel) in _REPLICAS
+        assert router.db_for_read(User) is None
+
+    _in_request(check)
+
+
+@override_settings(DATABASE_REPLICAS=())
+def test_reads_without_replicas() -> None:
+    """Ensures that the router is a no-op when no replicas are configured."""
+    router = GameReplicaRouter()
+
+    _in_request(lambda: _assert_read_from_primary(router))
+
+
+@override_settings(DATABASE_REPLICAS=_REPLICAS)
+def test_reads_after_write_go_to_primary() -> None:
+    """Ensures that a write pins the rest of the request to the primary."""
+    router = GameReplicaRouter()
+
+    def check() -> None:
+        assert router.db_for_write(ProductModel) == DEFAULT_DB_ALIAS
+        _assert_read_from_primary(router)
+
+    _in_request(check)
+    # The next request reads from replicas again:
+    _in_request(lambda: _assert_read_from_replica(router))
+
+
+@override_settings(DATABASE_REPLICAS=_REPLICAS)
+def test_async_requests_reset_pinning() -> None:
+    """Ensures that async requests are pinned without a thread hop."""
+    router = GameReplicaRouter()
+
+    def in_async_request(check: Callable[[], None]) -> None:
+        # A coroutine function, so the middleware stays async:
+        async def get_response(request: HttpRequest) -> HttpResponse:  # noqa: RUF029
+            check()
+            return HttpResponse()
+
+        middleware = PrimaryPinningMiddleware(get_response)
+        assert iscoroutinefunction(middleware)
+        async_to_sync(middleware)(RequestFactory().get("/"))
+
+    def check() -> None:
+        assert router.db_for_write(ProductModel) == DEFAULT_DB_ALIAS
+        _assert_read_from_primary(router)
+
+    in_async_request(check)
+    in_async_request(lambda: _assert_read_from_replica(router))
+
+
+@override_settings(DATABASE_REPLICAS=_REPLICAS)
+def test_migrations_skip_replicas() -> None:
+    """Ensures that replicas get their schema only through replication."""
+    router = GameReplicaRouter()
+
+    assert router.allow_migrate("replica_0", "game") is False
+    assert router.allow_migrate(DEFAULT_DB_ALIAS, "game") is None
+
+
+@override_settings(DATABASE_REPLICAS=_REPLICAS)
+def test_related_objects_follow_instance() -> None:
+    """Ensures that related objects are read where the instance was read."""
+    router = GameReplicaRouter()
+
+    def check() -> None:
+        generation = GenerationModel()
+        assert router.db_for_read(ProductModel, instance=generation) is None
+
+    _in_request(check)
+    product, other = ProductModel(), ProductModel()
+    product._state.db = "replica_0"  # noqa: SLF001
+    other._state.db = DEFAULT_DB_ALIAS  # noqa: SLF001
+    related = router.allow_relation(product, other)
+    other._state.db = "archive"  # noqa: SLF001
+
+    assert related is True
+    assert router.allow_relation(product, other) is None
+
+
+def _assert_read_from_primary(router: GameReplicaRouter) -> None:
+    assert router.db_for_read(GenerationModel) is None
+
+
+def _assert_read_from_replica(router: GameReplicaRouter) -> None:
+    assert router.db_for_read(GenerationModel) in _REPLICAS
+
+
+@pytest.mark.django_db(databases="__all__", transaction=True)
+@pytest.mark.usefixtures("game_catalog")
+def test_generation_reads_from_replica(
+    client: Client,
+    settings: LazySettings,
+) -> None:
+    """Ensures that a stored generation is served by replicas only."""
+    settings.DATABASE_REPLICAS = _CONFIGURED_REPLICAS
+    payload = {"seed": str(uuid.uuid4()), "num_iterations": 0}
+    responses = []
+
+    for _ in range(2):
+        with ExitStack() as stack:
+            captured = {
+                alias: stack.enter_context(
+                    CaptureQueriesContext(connections[alias]),
+                )
+                for alias in (DEFAULT_DB_ALIAS, *_CONFIGURED_REPLICAS)
+            }
+            responses.append(
+                client.post(
+                    "/api/game/generateSituation",
+                    payload,
+                    content_type="application/json",
+                ),
+            )
+
+    assert all(response.status_code == HTTPStatus.OK for response in responses)
+    first, second = (response.json() for response in responses)
+    assert first["client"] == second["client"]
+    # The second request found the generation on a replica:
+    assert not captured[DEFAULT_DB_ALIAS].captured_queries
+    assert any(
+        captured[alias].captured_queries for alias in _CONFIGURED_REPLICAS
+    )
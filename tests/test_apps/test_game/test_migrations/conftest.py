@@ -0,0 +1,48 @@
+import uuid
+from collections.abc import Callable
+
+import pytest
+from django.apps.registry import Apps
+
+
+def _create_generation(apps: Apps) -> int:
+    def get(model_name: str, **fields: object) -> object:
+        return apps.get_model("game", model_name).objects.create(**fields)
+
+    age_group = get("AgeGroupModel", name="age")
+    product = get("ProductModel", name="p", link="https://a.ru/p")
+    generation = get(
+        "GenerationModel",
+        seed=uuid.uuid4(),
+        iteration=0,
+        situation=get("SituationModel", male_text="m", female_text="f"),
+        client_gender="male",
+        client_age=age_group,
+        client_job=get("JobSphereModel", name="IT"),
+        client_is_married=False,
+        client_is_have_child=False,
+        client_is_have_real_estate=False,
+        client_city=get("CityModel", name="Москва"),
+        client_sprite=get(
+            "SpriteModel",
+            image="sprites/male.png",
+            gender="male",
+            age_group=age_group,
+        ),
+        client_first_name=get("FirstNameModel", content="имя", gender="male"),
+        client_last_name=get("LastNameModel", content="фам", gender="male"),
+        hint=get("HintModel", product=product, text="hint"),
+    )
+    get(
+        "GenerationAnswerModel",
+        generation=generation,
+        product=product,
+        is_correct=True,
+    )
+    return generation.pk  # type: ignore[attr-defined, no-any-return]
+
+
+@pytest.fixture
+def create_generation() -> Callable[[Apps], int]:
+    """Creates a generation with one correct answer row in a migration state."""
+    return _create_generation
@@ -0,0 +1,42 @@
+import datetime
+from collections.abc import Callable
+
+from django.apps.registry import Apps
+from django_test_migrations.migrator import Migrator
+
+
+def test_first_generations_are_kept(
+    migrator: Migrator,
+    create_generation: Callable[[Apps], int],
+) -> None:
+    """Tests that iterations saved on several days keep the first row."""
+    old_state = migrator.apply_initial_migration(("game", "0013_answer_stats"))
+    generation_pk = create_generation(old_state.apps)
+    generation_model = old_state.apps.get_model("game", "GenerationModel")
+    answer_model = old_state.apps.get_model("game", "GenerationAnswerModel")
+    duplicate = generation_model.objects.get()
+    created_on = duplicate.created_on
+    duplicate.pk = None
+    duplicate.created_on += datetime.timedelta(days=1)
+    duplicate.save()
+    answer_model.objects.create(
+        generation=duplicate,
+        product_id=answer_model.objects.get().product_id,
+        is_correct=True,
+    )
+
+    new_state = migrator.apply_tested_migration(
+        ("game", "0014_generation_key"),
+    )
+    generation_model = new_state.apps.get_model("game", "GenerationModel")
+    answer_model = new_state.apps.get_model("game", "GenerationAnswerModel")
+    key_model = new_state.apps.get_model("game", "GenerationKeyModel")
+
+    assert generation_model.objects.get().pk == generation_pk
+    assert answer_model.objects.get().generation_id == generation_pk
+    key = key_model.objects.get()
+    assert (key.seed, key.iteration, key.created_on) == (
+        duplicate.seed,
+        duplicate.iteration,
+        created_on,
+    )
@@ -0,0 +1,41 @@
+from collections.abc import Callable
+
+from django.apps.registry import Apps
+from django_test_migrations.migrator import Migrator
+
+_PACKED = ("game", "0014_generation_key")
+_ARRAYS = ("game", "0015_generation_product_id_arrays")
+
+
+def test_packed_ids_become_arrays(
+    migrator: Migrator,
+    create_generation: Callable[[Apps], int],
+) -> None:
+    """Tests that packed ids are converted to arrays and back."""
+    old_state = migrator.apply_initial_migration(_PACKED)
+    generation_pk = create_generation(old_state.apps)
+    legacy_pk = create_generation(old_state.apps)
+    generation_model = old_state.apps.get_model("game", "GenerationModel")
+    generation_model.objects.filter(pk=generation_pk).update(
+        correct_product_ids=(1, 70000, 2**31 - 1),
+        incorrect_product_ids=(),
+    )
+
+    new_state = migrator.apply_tested_migration(_ARRAYS)
+    generation_model = new_state.apps.get_model("game", "GenerationModel")
+    generation = generation_model.objects.get(pk=generation_pk)
+    assert generation.correct_product_ids == [1, 70000, 2**31 - 1]
+    assert generation.incorrect_product_ids == []
+    legacy = generation_model.objects.get(pk=legacy_pk)
+    assert legacy.correct_product_ids is None
+    assert generation_model.objects.filter(
+        correct_product_ids__contains=[70000],
+    ).exists()
+
+    old_state = migrator.apply_tested_migration(_PACKED)
+    generation_model = old_state.apps.get_model("game", "GenerationModel")
+    generation = generation_model.objects.get(pk=generation_pk)
+    assert generation.correct_product_ids == (1, 70000, 2**31 - 1)
+    assert generation.incorrect_product_ids == ()
+    legacy = generation_model.objects.get(pk=legacy_pk)
+    assert legacy.correct_product_ids is None
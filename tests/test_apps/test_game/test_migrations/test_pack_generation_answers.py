@@ -0,0 +1,26 @@
+from collections.abc import Callable
+
+from django.apps.registry import Apps
+from django_test_migrations.migrator import Migrator
+
+
+def test_answer_rows_are_packed(
+    migrator: Migrator,
+    create_generation: Callable[[Apps], int],
+) -> None:
+    """Tests that answer rows are copied into packed ids of generations."""
+    old_state = migrator.apply_initial_migration(
+        ("game", "0008_generationmodel_product_ids"),
+    )
+    generation_pk = create_generation(old_state.apps)
+    answer_model = old_state.apps.get_model("game", "GenerationAnswerModel")
+    product_id = answer_model.objects.get().product_id
+
+    new_state = migrator.apply_tested_migration(
+        ("game", "0009_pack_generation_answers"),
+    )
+    generation_model = new_state.apps.get_model("game", "GenerationModel")
+    generation = generation_model.objects.get(pk=generation_pk)
+
+    assert tuple(generation.correct_product_ids) == (product_id,)
+    assert tuple(generation.incorrect_product_ids) == ()
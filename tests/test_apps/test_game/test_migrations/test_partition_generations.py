@@ -0,0 +1,40 @@
+from collections.abc import Callable
+
+from django.apps.registry import Apps
+from django.db import connection
+from django_test_migrations.migrator import Migrator
+
+_BEFORE = ("game", "0009_pack_generation_answers")
+_PARTITIONED = ("game", "0010_partition_generations")
+
+
+def _is_partitioned(table: str) -> bool:
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT relkind FROM pg_class WHERE oid = %s::regclass",
+            [table],
+        )
+        (relkind,) = cursor.fetchone()
+    return relkind == "p"  # type: ignore[no-any-return]
+
+
+def test_partitioning_is_reversible(
+    migrator: Migrator,
+    create_generation: Callable[[Apps], int],
+) -> None:
+    """Tests that generations survive partitioning and merging back."""
+    old_state = migrator.apply_initial_migration(_BEFORE)
+    generation_pk = create_generation(old_state.apps)
+
+    new_state = migrator.apply_tested_migration(_PARTITIONED)
+    generation_model = new_state.apps.get_model("game", "GenerationModel")
+    assert _is_partitioned("game_generationmodel")
+    assert generation_model.objects.get().pk == generation_pk
+
+    old_state = migrator.apply_tested_migration(_BEFORE)
+    answer_model = old_state.apps.get_model("game", "GenerationAnswerModel")
+    assert not _is_partitioned("game_generationmodel")
+    assert not _is_partitioned("game_generationanswermodel")
+    assert answer_model.objects.get().generation_id == generation_pk
+    # The sequence continues after the copied rows:
+    assert create_generation(old_state.apps) > generation_pk
@@ -0,0 +1,154 @@
+import uuid
+from collections import Counter
+from typing import Any
+
+import pytest
+from django.conf import LazySettings
+from django.contrib import admin
+from django.db.models import Sum
+from django.test import Client, RequestFactory
+
+from server.apps.game.models import (
+    GenerationModel,
+    ProductAnswerStatsModel,
+    ProductModel,
+    SituationAnswerStatsModel,
+)
+from server.apps.game.services import answer_stats
+from server.apps.game.services.answer_stats import STATUS_FIELDS
+
+pytestmark = pytest.mark.usefixtures("game_catalog")
+
+
+def _finish(client: Client, payload: dict[str, Any]) -> Any:
+    return client.post(
+        "/api/game/acknowledgeDayFinish",
+        payload,
+        content_type="application/json",
+    ).json()
+
+
+def _product_counts() -> Counter[tuple[int, str]]:
+    counts: Counter[tuple[int, str]] = Counter()
+    for stats in ProductAnswerStatsModel.objects.all():
+        for field in STATUS_FIELDS:
+            counts[stats.product_id, field] += getattr(stats, field)
+    return +counts
+
+
+@pytest.mark.parametrize("use_day_sessions", [False, True])
+def test_day_finish_updates_stats(
+    client: Client,
+    settings: LazySettings,
+    game_catalog: list[ProductModel],
+    use_day_sessions: bool,  # noqa: FBT001
+) -> None:
+    """Ensures that the first result of a day is added to the rollups once."""
+    settings.GAME_DAY_SESSIONS = use_day_sessions
+    day_finish = {
+        "seed": str(uuid.uuid4()),
+        "answers": [
+            {"iteration": 0, "recommended_product_ids": [game_catalog[0].id]},
+            {"iteration": 1, "recommended_product_ids": []},
+        ],
+    }
+
+    result = _finish(client, day_finish)
+    _finish(client, day_finish)
+    _finish(client, {**day_finish, "answers": day_finish["answers"][:1]})
+
+    expected = Counter(
+        (review["answered_product"]["id"], review["answer_status"])
+        for day_review in result["reviews"]
+        for review in day_review["review"]
+    )
+    situation_totals = SituationAnswerStatsModel.objects.aggregate(
+        **{field: Sum(field) for field in STATUS_FIELDS},
+    )
+    assert _product_counts() == expected
+    assert sum(situation_totals.values()) == expected.total()
+
+
+def test_situation_stats_follow_iterations(
+    client: Client,
+    game_catalog: list[ProductModel],
+) -> None:
+    """Ensures that statuses are counted for the situation of each iteration."""
+    seed = str(uuid.uuid4())
+    result = _finish(
+        client,
+        {
+            "seed": seed,
+            "answers": [
+                {
+                    "iteration": 0,
+                    "recommended_product_ids": [game_catalog[0].id],
+                },
+            ],
+        },
+    )
+
+    stats = SituationAnswerStatsModel.objects.get()
+    generation = GenerationModel.objects.get(seed=seed)
+
+    assert stats.situation_id == generation.situation_id
+    assert sum(getattr(stats, field) for field in STATUS_FIELDS) == len(
+        result["reviews"][0]["review"],
+    )
+
+
+def test_days_add_up(
+    client: Client,
+    game_catalog: list[ProductModel],
+) -> None:
+    """Ensures that later days add to the rollup rows of earlier days."""
+    answers = [
+        {"iteration": 0, "recommended_product_ids": [game_catalog[0].id]},
+    ]
+    results = [
+        _finish(client, {"seed": str(uuid.uuid4()), "answers": answers})
+        for _ in range(2)
+    ]
+    _finish(client, {"seed": str(uuid.uuid4()), "answers": []})
+
+    expected = Counter(
+        (review["answered_product"]["id"], review["answer_status"])
+        for result in results
+        for day_review in result["reviews"]
+        for review in day_review["review"]
+    )
+    assert _product_counts() == expected
+
+
+def test_unknown_situation_is_skipped(
+    client: Client,
+    monkeypatch: pytest.MonkeyPatch,
+    game_catalog: list[ProductModel],
+) -> None:
+    """Ensures that products are counted when a situation is unknown."""
+    monkeypatch.setattr(answer_stats, "_situation_ids", lambda data: {})
+
+    _finish(
+        client,
+        {
+            "seed": str(uuid.uuid4()),
+            "answers": [{"iteration": 0, "recommended_product_ids": []}],
+        },
+    )
+
+    assert _product_counts()
+    assert not SituationAnswerStatsModel.objects.exists()
+
+
+@pytest.mark.parametrize(
+    "model",
+    [ProductAnswerStatsModel, SituationAnswerStatsModel],
+)
+def test_stats_admin_is_read_only(model: type[Any]) -> None:
+    """Ensures that the admin cannot add, change or delete rollups."""
+    model_admin = admin.site.get_model_admin(model)
+    request = RequestFactory().get("/")
+
+    assert not model_admin.has_add_permission(request)
+    assert not model_admin.has_change_permission(request)
+    assert not model_admin.has_delete_permission(request)
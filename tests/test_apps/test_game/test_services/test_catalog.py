@@ -0,0 +1,104 @@
+import contextlib
+import time
+from collections.abc import Iterator
+
+import pytest
+from django.conf import LazySettings
+
+from server.apps.game.models import ProductModel, ReviewModel
+from server.apps.game.services import catalog as catalog_module
+from server.apps.game.services.catalog import (
+    Catalog,
+    bump_catalog_version,
+    get_catalog,
+    get_catalog_products,
+)
+
+
+@pytest.mark.django_db
+def test_catalog_groups_reviews() -> None:
+    """Ensures that reviews are grouped by product and answer status."""
+    product = ProductModel.objects.create(name="Вклад", link="https://a.ru")
+    ReviewModel.objects.create(
+        product=None,
+        is_product_in_answer=False,
+        text="ok",
+    )
+    ReviewModel.objects.create(
+        product=product,
+        is_product_in_answer=True,
+        text="incorrect",
+    )
+    ReviewModel.objects.create(
+        product=product,
+        is_product_in_answer=False,
+        text="lost",
+    )
+
+    catalog = get_catalog()
+
+    assert catalog.get_product(product.id).name == "Вклад"
+    assert catalog.get_success_reviews() == ("ok",)
+    assert catalog.get_incorrect_reviews(product.id) == ("incorrect",)
+    assert catalog.get_lost_reviews(product.id) == ("lost",)
+
+
+@pytest.mark.django_db
+def test_catalog_reset_on_change() -> None:
+    """Ensures that catalog changes are visible without a restart."""
+    product = ProductModel.objects.create(name="Вклад", link="https://a.ru")
+    assert get_catalog() is get_catalog()
+
+    product.name = "Кредит"
+    product.save()
+
+    assert get_catalog().get_product(product.id).name == "Кредит"
+
+
+@pytest.mark.django_db
+def test_catalog_follows_shared_version(settings: LazySettings) -> None:
+    """Ensures that a snapshot is kept until the shared version changes."""
+    settings.GAME_CATALOG_TTL = 0
+    catalog = get_catalog()
+
+    unchanged = get_catalog()
+    # Another worker changed the catalog, this one got no signal:
+    bump_catalog_version()
+
+    assert unchanged is catalog
+    assert get_catalog().version == catalog.version + 1
+
+
+@pytest.mark.django_db
+def test_new_products_reload_catalog() -> None:
+    """Ensures that a product missing from the snapshot reloads it once."""
+    catalog = get_catalog()
+    # `bulk_create` sends no signals, as if another worker added it:
+    (product,) = ProductModel.objects.bulk_create([
+        ProductModel(name="Вклад", link="https://a.ru"),
+    ])
+
+    products = get_catalog_products([product.id])
+
+    assert catalog.get_product(product.id) is None
+    assert [found.name for found in products] == ["Вклад"]
+    with pytest.raises(LookupError, match=str(product.id + 1)):
+        get_catalog_products([product.id + 1])
+
+
+@pytest.mark.django_db
+def test_catalog_loaded_meanwhile(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Ensures that racing threads share the snapshot loaded first."""
+    catalog = Catalog.load()
+
+    @contextlib.contextmanager
+    def racing_lock() -> Iterator[None]:
+        # Another thread loaded the snapshot while this one waited:
+        monkeypatch.setattr(catalog_module, "_catalog", catalog)
+        monkeypatch.setattr(catalog_module, "_checked_at", time.monotonic())
+        yield
+
+    monkeypatch.setattr(catalog_module, "_catalog", None)
+    monkeypatch.setattr(catalog_module, "_catalog_lock", racing_lock())
+
+    assert get_catalog() is catalog
@@ -0,0 +1,168 @@
+from pathlib import Path
+
+import pytest
+from django.conf import LazySettings
+
+from server.apps.game.models import HintModel, ProductModel, ReviewModel
+from server.apps.game.services import catalog_file
+from server.apps.game.services.catalog import (
+    Catalog,
+    get_catalog,
+    get_catalog_version,
+)
+from server.apps.game.services.catalog_file import (
+    MappedCatalog,
+    open_shared_catalog,
+    write_catalog_file,
+)
+
+
+@pytest.mark.django_db
+def test_mapped_catalog_matches_memory(tmp_path: Path) -> None:
+    """Ensures that the mapped catalog returns the same data as in memory."""
+    product = ProductModel.objects.create(name="Вклад", link="https://a.ru")
+    HintModel.objects.create(product=product, text="Подсказка")
+    for status in (True, False):
+        ReviewModel.objects.create(
+            product=product,
+            is_product_in_answer=status,
+            text=f"Отзыв {status}",
+        )
+
+    expected = Catalog.load()
+    mapped = open_shared_catalog(tmp_path, get_catalog_version())
+
+    assert mapped.version == expected.version
+    assert mapped.get_product(product.id) == expected.get_product(product.id)
+    assert mapped.get_product(product.id + 1) is None
+    for hint_id in expected.hints:
+        assert mapped.get_hint(hint_id) == expected.get_hint(hint_id)
+    assert list(mapped.get_lost_reviews(product.id)) == ["Отзыв False"]
+    assert list(mapped.get_incorrect_reviews(product.id)) == ["Отзыв True"]
+    assert not mapped.get_success_reviews()
+
+
+@pytest.mark.django_db
+def test_mapped_catalog_swaps_on_version(tmp_path: Path) -> None:
+    """Ensures that a new file replaces the old one on version change."""
+    old = open_shared_catalog(tmp_path, get_catalog_version())
+    product = ProductModel.objects.create(name="Вклад", link="https://a.ru")
+
+    new = open_shared_catalog(tmp_path, get_catalog_version())
+
+    assert new.version > old.version
+    assert old.get_product(product.id) is None
+    assert new.get_product(product.id) is not None
+    assert [path.name for path in tmp_path.iterdir()] == [new.path.name]
+
+
+@pytest.mark.django_db
+@pytest.mark.usefixtures("game_catalog")
+def test_mapped_catalog_client_features(tmp_path: Path) -> None:
+    """Ensures that situations and client features are mapped as well."""
+    expected = Catalog.load()
+    mapped = open_shared_catalog(tmp_path, get_catalog_version())
+
+    for situation_id in expected.situations:
+        assert mapped.get_situation(situation_id) == expected.get_situation(
+            situation_id,
+        )
+    for feature, values in expected.client_features.items():
+        assert values
+        for feature_id, value in values.items():
+            assert mapped.get_client_feature(feature, feature_id) == value
+        missing_id = max(values) + 1
+        assert mapped.get_client_feature(feature, missing_id) is None
+    assert mapped.get_situation(max(expected.situations) + 1) is None
+
+
+@pytest.mark.django_db
+def test_settings_enable_mapped_catalog(
+    settings: LazySettings,
+    tmp_path: Path,
+) -> None:
+    """Ensures that workers share a mapped file once a directory is set."""
+    settings.GAME_CATALOG_MMAP_DIR = str(tmp_path)
+    product = ProductModel.objects.create(name="Вклад", link="https://a.ru")
+
+    first = get_catalog()
+    # Another worker opens the file written by the first one:
+    second = open_shared_catalog(tmp_path, first.version)
+
+    assert isinstance(first, MappedCatalog)
+    assert second.path == first.path
+    assert second.get_product(product.id) == first.get_product(product.id)
+    assert first.get_hint(0) is None
+
+
+@pytest.mark.django_db
+def test_review_columns_are_sequences(tmp_path: Path) -> None:
+    """Ensures that mapped reviews index and slice like lists."""
+    product = ProductModel.objects.create(name="Вклад", link="https://a.ru")
+    texts = ["первый", "второй", "третий"]
+    for text in texts:
+        ReviewModel.objects.create(
+            product=product,
+            is_product_in_answer=False,
+            text=text,
+        )
+
+    reviews = open_shared_catalog(
+        tmp_path,
+        get_catalog_version(),
+    ).get_lost_reviews(product.id)
+
+    assert reviews[-1] == texts[-1]
+    assert reviews[1:] == texts[1:]
+    with pytest.raises(IndexError):
+        reviews[len(texts)]
+
+
+def test_unsupported_file_is_rejected(tmp_path: Path) -> None:
+    """Ensures that a file of another format is not read as a catalog."""
+    path = tmp_path / "catalog-1.bin"
+    path.write_bytes(bytes(4096))
+
+    with pytest.raises(ValueError, match="Unsupported catalog file"):
+        MappedCatalog(path)
+
+
+@pytest.mark.django_db
+def test_failed_write_leaves_no_file(
+    monkeypatch: pytest.MonkeyPatch,
+    tmp_path: Path,
+) -> None:
+    """Ensures that an interrupted write removes its temporary file."""
+
+    def fail(fd: int) -> None:
+        raise OSError("disk full")
+
+    monkeypatch.setattr(catalog_file.os, "fsync", fail)
+
+    with pytest.raises(OSError, match="disk full"):
+        write_catalog_file(Catalog.load(), tmp_path)
+
+    assert not list(tmp_path.iterdir())
+
+
+@pytest.mark.django_db
+def test_file_removed_meanwhile_is_rebuilt(
+    monkeypatch: pytest.MonkeyPatch,
+    tmp_path: Path,
+) -> None:
+    """Ensures that a file removed right before it is opened is rebuilt."""
+    first = open_shared_catalog(tmp_path, get_catalog_version())
+    mapped_catalog = catalog_file.MappedCatalog
+
+    def racing_open(path: Path) -> MappedCatalog:
+        # A worker with a newer version removes stale files meanwhile:
+        path.unlink()
+        monkeypatch.setattr(catalog_file, "MappedCatalog", mapped_catalog)
+        return mapped_catalog(path)
+
+    monkeypatch.setattr(catalog_file, "MappedCatalog", racing_open)
+
+    second = open_shared_catalog(tmp_path, first.version)
+
+    assert second.version == first.version
+    assert second.path.exists()
@@ -0,0 +1,157 @@
+import uuid
+from typing import Any
+
+import pytest
+from django.conf import LazySettings
+from django.contrib import admin
+from django.contrib.auth.models import User
+from django.core import serializers
+from django.db import transaction
+from django.db.models import ProtectedError
+from django.test import Client, RequestFactory
+
+from server.apps.game.fields import PackedIdsField, pack_ids
+from server.apps.game.models import (
+    GenerationAnswerModel,
+    GenerationModel,
+    ProductModel,
+)
+from server.apps.game.services.dto import (
+    AcknowledgeDayFinish,
+    GenerateSituationParams,
+    Situation,
+)
+from server.apps.game.services.generation import (
+    acknowledge_day_finish,
+    generate_situation,
+)
+
+pytestmark = pytest.mark.usefixtures("game_catalog")
+
+
+def _render(params: GenerateSituationParams) -> dict[str, Any]:
+    situation = Situation.from_generation_model(
+        generate_situation(params),
+    ).model_dump(mode="json")
+    situation["answers"].sort(key=lambda answer: answer["product"]["id"])
+    return situation
+
+
+def test_answer_rows_match_packed_ids(game_catalog: list[ProductModel]) -> None:
+    """Ensures that older generations with answer rows are read the same."""
+    params = GenerateSituationParams(seed=uuid.uuid4(), num_iterations=0)
+    day_finish = AcknowledgeDayFinish(
+        seed=params.seed,
+        answers=[
+            {"iteration": 0, "recommended_product_ids": [game_catalog[0].id]},
+        ],
+    )
+    packed = (_render(params), acknowledge_day_finish(day_finish))
+
+    GenerationModel.objects.filter(seed=params.seed).update(
+        correct_product_ids=None,
+        incorrect_product_ids=None,
+    )
+
+    assert (_render(params), acknowledge_day_finish(day_finish)) == packed
+
+
+def test_compact_answers_skip_rows(
+    client: Client,
+    settings: LazySettings,
+) -> None:
+    """Ensures that compact mode serves answers without writing rows."""
+    settings.GAME_COMPACT_ANSWERS = True
+    params = GenerateSituationParams(seed=uuid.uuid4(), num_iterations=0)
+
+    response = client.post(
+        "/api/game/generateSituation",
+        params.model_dump(mode="json"),
+        content_type="application/json",
+    )
+
+    assert response.status_code == 200
+    generation = GenerationModel.objects.get(seed=params.seed)
+    assert sorted(
+        answer["product"]["id"] for answer in response.json()["answers"]
+    ) == sorted(
+        generation.correct_product_ids + generation.incorrect_product_ids,
+    )
+    assert not GenerationAnswerModel.objects.filter(
+        generation=generation,
+    ).exists()
+
+
+def _answer_with_new_product(settings: LazySettings) -> ProductModel:
+    settings.GAME_COMPACT_ANSWERS = True
+    generation = generate_situation(
+        GenerateSituationParams(seed=uuid.uuid4(), num_iterations=0),
+    )
+    product = ProductModel.objects.create(name="new", link="https://a.ru/new")
+    GenerationModel.objects.filter(pk=generation.pk).update(
+        incorrect_product_ids=(*generation.incorrect_product_ids, product.pk),
+    )
+    return product
+
+
+def test_packed_answers_protect_products(settings: LazySettings) -> None:
+    """Ensures that a product of stored packed answers is not deleted."""
+    product = _answer_with_new_product(settings)
+
+    with pytest.raises(ProtectedError), transaction.atomic():
+        product.delete()
+
+    GenerationModel.objects.all().delete()
+    product.delete()
+    assert not ProductModel.objects.filter(pk=product.pk).exists()
+
+
+def test_admin_shows_packed_answers(
+    admin_user: User,
+    rf: RequestFactory,
+    settings: LazySettings,
+) -> None:
+    """Ensures that the admin refuses to delete an answered product."""
+    product = _answer_with_new_product(settings)
+    spare = ProductModel.objects.create(name="spare", link="https://a.ru/s")
+    request = rf.post(f"/admin/game/productmodel/{product.pk}/delete/")
+    request.user = admin_user
+
+    *_, protected = admin.site.get_model_admin(
+        ProductModel,
+    ).get_deleted_objects([product, spare], request)
+
+    assert len(protected) == 1
+
+
+@pytest.mark.parametrize(
+    ("value", "expected"),
+    [
+        (None, None),
+        ((1, 2), (1, 2)),
+        ([1, 2], (1, 2)),
+        (pack_ids([1, 2]), (1, 2)),
+    ],
+)
+def test_packed_ids_to_python(
+    value: object,
+    expected: tuple[int, ...] | None,
+) -> None:
+    """Ensures that packed ids of old migrations are read from any value."""
+    assert PackedIdsField().to_python(value) == expected
+
+
+def test_product_ids_survive_fixtures(settings: LazySettings) -> None:
+    """Ensures that answer product ids are dumped and loaded."""
+    settings.GAME_COMPACT_ANSWERS = True
+    generation = generate_situation(
+        GenerateSituationParams(seed=uuid.uuid4(), num_iterations=0),
+    )
+
+    dumped = serializers.serialize("json", [generation])
+    (loaded,) = serializers.deserialize("json", dumped)
+
+    assert loaded.object.correct_product_ids == generation.correct_product_ids
+    assert loaded.object.incorrect_product_ids == (
+        generation.incorrect_product_ids
+    )
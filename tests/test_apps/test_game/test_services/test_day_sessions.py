@@ -0,0 +1,162 @@
+import uuid
+from collections.abc import Callable
+from typing import Any
+
+import pytest
+from django.conf import LazySettings
+from django.test import Client
+from pytest_django import DjangoAssertNumQueries
+
+from server.apps.game.models import (
+    DayResultModel,
+    DaySessionModel,
+    ProductModel,
+)
+from server.apps.game.services import day_sessions
+from server.apps.game.services.catalog import CatalogReader, get_catalog
+from server.apps.game.services.dto import GenerateSituationParams
+from server.apps.game.services.generation import build_generation
+
+pytestmark = pytest.mark.usefixtures("game_catalog")
+
+
+def _post(client: Client, route: str, payload: dict[str, Any]) -> Any:
+    response = client.post(
+        f"/api/game/{route}",
+        payload,
+        content_type="application/json",
+    )
+    assert response.status_code == 200
+    return response.json()
+
+
+def _sorted_answers(situation: dict[str, Any]) -> dict[str, Any]:
+    return {
+        **situation,
+        "answers": sorted(
+            situation["answers"],
+            key=lambda answer: answer["product"]["id"],
+        ),
+    }
+
+
+def test_day_sessions_match_generation_rows(
+    client: Client,
+    settings: LazySettings,
+    game_catalog: list[ProductModel],
+) -> None:
+    """Ensures that both storage layouts return the same game day."""
+    seed = str(uuid.uuid4())
+    day_finish = {
+        "seed": seed,
+        "answers": [
+            {"iteration": 0, "recommended_product_ids": [game_catalog[0].id]},
+            {"iteration": 1, "recommended_product_ids": []},
+        ],
+    }
+    responses = []
+
+    for use_day_sessions in (False, True):
+        settings.GAME_DAY_SESSIONS = use_day_sessions
+        # Otherwise the second layout would just read the stored result:
+        DayResultModel.objects.all().delete()
+        responses.append((
+            _sorted_answers(
+                _post(
+                    client,
+                    "generateSituation",
+                    {"seed": seed, "num_iterations": 1},
+                ),
+            ),
+            _post(client, "getHint", {"seed": seed, "num_iterations": 2}),
+            _post(client, "getHints", {"seed": seed, "iterations": [2, 0]}),
+            _post(client, "acknowledgeDayFinish", day_finish),
+        ))
+
+    assert responses[0] == responses[1]
+    stored = DaySessionModel.objects.get(seed=seed)
+    assert set(stored.iterations) == {"0", "1", "2"}
+
+
+def test_day_is_read_in_one_query(
+    client: Client,
+    settings: LazySettings,
+    django_assert_num_queries: DjangoAssertNumQueries,
+) -> None:
+    """Ensures that a stored day is served by a single lookup."""
+    settings.GAME_DAY_SESSIONS = True
+    seed = str(uuid.uuid4())
+    chunk = {"seed": seed, "total_iterations": 3}
+    _post(client, "generateChunkSituations", chunk)
+
+    with django_assert_num_queries(1):
+        situations = _post(client, "generateChunkSituations", chunk)
+
+    assert [
+        situation["generation_params"]["num_iterations"]
+        for situation in situations
+    ] == [0, 1, 2]
+
+
+def test_append_keeps_stored_iterations() -> None:
+    """Ensures that appending never replaces an already stored iteration."""
+    seed = uuid.uuid4()
+    records = [
+        day_sessions.GenerationRecord.from_generation(
+            build_generation(
+                GenerateSituationParams(seed=seed, num_iterations=iteration),
+            ),
+        )
+        for iteration in range(2)
+    ]
+
+    day_sessions.append_day_records(seed, {0: records[0]})
+    day_sessions.append_day_records(seed, {0: records[1], 1: records[1]})
+
+    assert day_sessions.get_day_records(seed) == {0: records[0], 1: records[1]}
+
+
+def test_pregenerate_situation() -> None:
+    """Ensures that pregeneration stores a missing iteration only once."""
+    generation_params = GenerateSituationParams(
+        seed=uuid.uuid4(),
+        num_iterations=3,
+    )
+
+    created = day_sessions.pregenerate_situation(generation_params)
+    repeated = day_sessions.pregenerate_situation(generation_params)
+
+    assert created
+    assert not repeated
+    assert list(day_sessions.get_day_records(generation_params.seed)) == [3]
+
+
+class _StaleCatalog:
+    """A snapshot taken before any catalog row existed."""
+
+    def __getattr__(self, name: str) -> Callable[..., None]:
+        return lambda *args: None
+
+
+def test_stale_catalog_is_reloaded(
+    client: Client,
+    settings: LazySettings,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """Ensures that a snapshot missing a generated record is reloaded."""
+    settings.GAME_DAY_SESSIONS = True
+    snapshots: list[CatalogReader] = [_StaleCatalog()]  # type: ignore[list-item]
+    monkeypatch.setattr(
+        day_sessions,
+        "get_catalog",
+        lambda: snapshots.pop() if snapshots else get_catalog(),
+    )
+
+    hint = _post(
+        client,
+        "getHint",
+        {"seed": str(uuid.uuid4()), "num_iterations": 0},
+    )
+
+    assert not snapshots
+    assert hint["product"]["id"]
@@ -0,0 +1,58 @@
+import uuid
+
+import pytest
+from pydantic import BaseModel
+
+from server.apps.game.models import GenerationModel, ProductModel
+from server.apps.game.services.dto import (
+    AcknowledgeDayFinish,
+    AcknowledgeDayFinishResponse,
+    GenerateSituationParams,
+    Situation,
+)
+from server.apps.game.services.generation import (
+    acknowledge_day_finish,
+    generate_situation,
+)
+
+pytestmark = pytest.mark.usefixtures("game_catalog")
+
+
+def _validated_json(model: BaseModel) -> str:
+    return (
+        type(model)
+        .model_validate_json(model.model_dump_json())
+        .model_dump_json()
+    )
+
+
+@pytest.mark.parametrize("packed", [True, False])
+def test_trusted_models_match_validated(
+    game_catalog: list[ProductModel],
+    packed: bool,  # noqa: FBT001
+) -> None:
+    """Ensures that trusted construction renders the same JSON as validation."""
+    params = GenerateSituationParams(seed=uuid.uuid4(), num_iterations=0)
+    generate_situation(params)
+    if not packed:
+        GenerationModel.objects.filter(seed=params.seed).update(
+            correct_product_ids=None,
+            incorrect_product_ids=None,
+        )
+
+    situation = Situation.from_generation_model(generate_situation(params))
+    day_finish = acknowledge_day_finish(
+        AcknowledgeDayFinish(
+            seed=params.seed,
+            answers=[
+                {
+                    "iteration": 0,
+                    "recommended_product_ids": [game_catalog[0].id],
+                },
+            ],
+        ),
+    )
+
+    assert situation.model_dump_json() == _validated_json(situation)
+    assert isinstance(day_finish, AcknowledgeDayFinishResponse)
+    assert day_finish.model_dump_json() == _validated_json(day_finish)
@@ -0,0 +1,138 @@
+import csv
+import sys
+import uuid
+from pathlib import Path
+
+import pytest
+from django.core.management import CommandError, call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from server.apps.game.models import GenerationModel
+from server.apps.game.services.dto import GenerateSituationParams
+from server.apps.game.services.generation import generate_situation
+
+pytestmark = pytest.mark.usefixtures("game_catalog")
+
+
+def _generate(seed: uuid.UUID, iterations: range) -> list[GenerationModel]:
+    return [
+        generate_situation(
+            GenerateSituationParams(seed=seed, num_iterations=iteration),
+        )
+        for iteration in iterations
+    ]
+
+
+def _read(output_dir: Path) -> list[dict[str, str]]:
+    rows = []
+    for path in sorted(output_dir.glob("*.csv")):
+        with path.open(encoding="utf-8") as csv_file:
+            rows.extend(csv.DictReader(csv_file))
+    return rows
+
+
+def test_export_resumes_after_last_file(tmp_path: Path) -> None:
+    """Ensures that a resumed export only writes new generations."""
+    seed = uuid.uuid4()
+    generations = _generate(seed, range(3))
+    call_command("export_generations", tmp_path, "--rows-per-file=2")
+    generations += _generate(seed, range(3, 5))
+
+    call_command("export_generations", tmp_path, "--resume")
+
+    assert len(list(tmp_path.glob("*.csv"))) == 3
+    assert not list(tmp_path.glob("*.part"))
+    rows = _read(tmp_path)
+    assert [int(row["id"]) for row in rows] == [
+        generation.pk for generation in generations
+    ]
+    assert [
+        list(map(int, row["correct_product_ids"].split())) for row in rows
+    ] == [list(generation.correct_product_ids) for generation in generations]
+
+
+def test_export_pages_by_id(tmp_path: Path) -> None:
+    """Ensures that generations are read in bounded pages after the last id."""
+    generations = _generate(uuid.uuid4(), range(5))
+
+    with CaptureQueriesContext(connection) as queries:
+        call_command("export_generations", tmp_path, "--chunk-size=2")
+
+    assert [int(row["id"]) for row in _read(tmp_path)] == [
+        generation.pk for generation in generations
+    ]
+    pages = [
+        query["sql"]
+        for query in queries.captured_queries
+        if "LIMIT 2" in query["sql"]
+    ]
+    # Two full pages, the last row and an empty page:
+    assert len(pages) == 4
+
+
+def test_export_reads_answer_rows(tmp_path: Path) -> None:
+    """Ensures that generations without packed ids export their answer rows."""
+    seed = uuid.uuid4()
+    (generation,) = _generate(seed, range(1))
+    GenerationModel.objects.filter(pk=generation.pk).update(
+        correct_product_ids=None,
+        incorrect_product_ids=None,
+    )
+
+    call_command(
+        "export_generations",
+        tmp_path,
+        f"--seed-from={seed}",
+        f"--seed-to={seed}",
+    )
+
+    (row,) = _read(tmp_path)
+    assert row["seed"] == str(seed)
+    assert sorted(map(int, row["correct_product_ids"].split())) == sorted(
+        generation.correct_product_ids,
+    )
+    assert sorted(map(int, row["incorrect_product_ids"].split())) == sorted(
+        generation.incorrect_product_ids,
+    )
+
+
+def test_export_parquet_row_groups(tmp_path: Path) -> None:
+    """Ensures that each chunk of a Parquet export is a row group."""
+    parquet = pytest.importorskip("pyarrow.parquet")
+    generations = _generate(uuid.uuid4(), range(3))
+    today = timezone.localdate()
+
+    call_command(
+        "export_generations",
+        tmp_path,
+        "--format=parquet",
+        "--chunk-size=2",
+        f"--since={today}",
+        f"--until={today}",
+    )
+
+    (path,) = tmp_path.glob("*.parquet")
+    parquet_file = parquet.ParquetFile(path)
+    assert parquet_file.metadata.num_row_groups == 2
+    table = parquet_file.read()
+    assert table.column("id").to_pylist() == [
+        generation.pk for generation in generations
+    ]
+    assert table.column("correct_product_ids").to_pylist() == [
+        list(generation.correct_product_ids) for generation in generations
+    ]
+
+
+def test_export_parquet_requires_pyarrow(
+    tmp_path: Path,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """Ensures that a Parquet export without pyarrow fails early."""
+    monkeypatch.setitem(sys.modules, "pyarrow", None)
+
+    with pytest.raises(CommandError, match="pyarrow"):
+        call_command("export_generations", tmp_path, "--format=parquet")
+
+    assert not list(tmp_path.iterdir())
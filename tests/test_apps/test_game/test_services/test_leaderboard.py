@@ -0,0 +1,122 @@
+import datetime
+import io
+import uuid
+from http import HTTPStatus
+
+import pytest
+from django.core.management import call_command
+from django.test import Client
+from django.utils import timezone
+
+from server.apps.game.models import LeaderboardEntryModel, ProductModel
+from server.apps.game.services import leaderboard
+from server.apps.game.services.dto import LeaderboardPeriod
+
+pytestmark = pytest.mark.django_db
+
+
+def _record(*ratings: int) -> list[uuid.UUID]:
+    seeds = [uuid.uuid4() for _ in ratings]
+    for seed, rating in zip(seeds, ratings, strict=True):
+        assert leaderboard.record_rating(seed, rating)
+    return seeds
+
+
+def test_rank_counts_better_players() -> None:
+    """Ensures that ranks follow ratings and ties share a place."""
+    seeds = _record(30, 50, 30, 10)
+
+    ranks = [
+        leaderboard.get_rank(seed, LeaderboardPeriod.DAY).rank  # type: ignore[union-attr]
+        for seed in seeds
+    ]
+    top = leaderboard.get_top(LeaderboardPeriod.ALL, limit=3)
+
+    assert ranks == [2, 1, 2, 4]
+    assert top.players == len(seeds)
+    assert top.period_start is None
+    assert [(entry.rating, entry.rank) for entry in top.top] == [
+        (50, 1),
+        (30, 2),
+        (30, 2),
+    ]
+
+
+def test_rating_is_recorded_once() -> None:
+    """Ensures that a seed cannot improve its place by finishing again."""
+    (seed,) = _record(10)
+
+    assert not leaderboard.record_rating(seed, 100)
+    assert leaderboard.get_top(LeaderboardPeriod.WEEK, limit=10).players == 1
+
+
+def test_periods_are_separate() -> None:
+    """Ensures that older days count for all time but not for today."""
+    (old_seed,) = _record(90)
+    old_day = timezone.localdate() - datetime.timedelta(weeks=2)
+    LeaderboardEntryModel.objects.filter(seed=old_seed).update(
+        day=old_day,
+        week=leaderboard.period_start(LeaderboardPeriod.WEEK, old_day),
+    )
+    (seed,) = _record(20)
+
+    assert leaderboard.get_rank(seed, LeaderboardPeriod.ALL).rank == 2  # type: ignore[union-attr]
+    assert [
+        entry.seed
+        for entry in leaderboard.get_top(LeaderboardPeriod.ALL, limit=10).top
+    ] == [old_seed, seed]
+    assert [
+        entry.seed
+        for entry in leaderboard.get_top(LeaderboardPeriod.DAY, limit=10).top
+    ] == [seed]
+
+
+@pytest.mark.usefixtures("game_catalog")
+@pytest.mark.parametrize("prefix", ["/api/game", "/api/game/async"])
+def test_day_finish_is_ranked(
+    client: Client,
+    game_catalog: list[ProductModel],
+    prefix: str,
+) -> None:
+    """Ensures that finished days appear on the leaderboard routes."""
+    seed = str(uuid.uuid4())
+    result = client.post(
+        f"{prefix}/acknowledgeDayFinish",
+        {
+            "seed": seed,
+            "answers": [
+                {
+                    "iteration": 0,
+                    "recommended_product_ids": [game_catalog[0].id],
+                },
+            ],
+        },
+        content_type="application/json",
+    ).json()
+
+    rank = client.get(f"{prefix}/leaderboard/day/{seed}")
+    top = client.get(f"{prefix}/leaderboard/all", {"limit": 5})
+    missing = client.get(f"{prefix}/leaderboard/week/{uuid.uuid4()}")
+
+    assert rank.json()["rating"] == result["total_rating"]
+    assert rank.json()["rank"] == 1
+    assert top.json()["top"] == [
+        {"seed": seed, "rating": result["total_rating"], "rank": 1},
+    ]
+    assert missing.status_code == HTTPStatus.NOT_FOUND
+
+
+def test_bench_leaderboard() -> None:
+    """Ensures that the benchmark measures every period and rolls back."""
+    stdout = io.StringIO()
+
+    call_command(
+        "bench_leaderboard",
+        results=10,
+        batch_size=4,
+        queries=2,
+        stdout=stdout,
+    )
+
+    assert len(stdout.getvalue().splitlines()) == 1 + len(LeaderboardPeriod)
+    assert not LeaderboardEntryModel.objects.exists()
@@ -0,0 +1,67 @@
+import threading
+
+import pytest
+from django.core.cache import DEFAULT_CACHE_ALIAS, caches
+from django.core.cache.backends.redis import RedisCache
+from django.core.management import call_command
+
+from server.apps.game.services import metrics
+
+
+def test_concurrent_increments_are_kept() -> None:
+    """Ensures that racing first increments of a counter are not lost."""
+    barrier = threading.Barrier(8)
+
+    def increment() -> None:
+        barrier.wait()
+        metrics.incr(metrics.PREFETCH_HIT, 2)
+
+    threads = [threading.Thread(target=increment) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert metrics.get_counters()[metrics.PREFETCH_HIT] == 16
+
+
+@pytest.mark.usefixtures("redis_server")
+def test_counters_are_shared_by_workers() -> None:
+    """Ensures that counters of separate redis connections are summed."""
+    metrics.incr(metrics.PREFETCH_MISS)
+    # A connection of its own, as another worker process would have:
+    caches[DEFAULT_CACHE_ALIAS] = caches.create_connection(DEFAULT_CACHE_ALIAS)
+    metrics.incr(metrics.PREFETCH_MISS, 2)
+
+    assert isinstance(caches[DEFAULT_CACHE_ALIAS], RedisCache)
+    assert metrics.get_counters()[metrics.PREFETCH_MISS] == 3
+
+
+def test_game_metrics_warns_about_local_cache(
+    capsys: pytest.CaptureFixture[str],
+) -> None:
+    """Ensures that per-process counters are reported as such."""
+    metrics.incr(metrics.PREFETCH_HIT)
+
+    call_command("game_metrics", "--reset")
+    captured = capsys.readouterr()
+
+    assert "prefetch_hit=1" in captured.out
+    assert "DJANGO_REDIS_URL" in captured.err
+    assert metrics.get_counters()[metrics.PREFETCH_HIT] == 0
+
+
+@pytest.mark.usefixtures("redis_server")
+def test_game_metrics_without_prefetch(
+    capsys: pytest.CaptureFixture[str],
+) -> None:
+    """Ensures that shared counters are printed without a hit rate."""
+    metrics.incr(metrics.RATE_LIMIT_REJECTED)
+
+    call_command("game_metrics")
+    captured = capsys.readouterr()
+
+    assert "rate_limit_rejected=1" in captured.out
+    assert "prefetch_hit_rate" not in captured.out
+    assert not captured.err
+    assert metrics.get_counters()[metrics.RATE_LIMIT_REJECTED] == 1
@@ -0,0 +1,136 @@
+import datetime
+import io
+import uuid
+
+import pytest
+from django.core.management import call_command
+from django.db import connection
+from django.utils import timezone
+
+from server.apps.game.models import (
+    GenerationAnswerModel,
+    GenerationKeyModel,
+    GenerationModel,
+)
+from server.apps.game.services import partitions
+from server.apps.game.services.dto import GenerateSituationParams
+from server.apps.game.services.generation import build_generation
+from server.apps.game.services.write_behind import save_generation
+
+pytestmark = [
+    # Deferred foreign key checks of rows inserted in the same transaction
+    # would block dropping their partition:
+    pytest.mark.django_db(transaction=True),
+    pytest.mark.usefixtures("game_catalog"),
+]
+
+
+def _save(
+    created_on: datetime.date,
+    seed: uuid.UUID | None = None,
+) -> GenerationModel:
+    situation_generation = build_generation(
+        GenerateSituationParams(seed=seed or uuid.uuid4(), num_iterations=0),
+    )
+    situation_generation.generation.created_on = created_on
+    for answer in situation_generation.answers:
+        answer.created_on = created_on
+    save_generation(situation_generation)
+    return situation_generation.generation
+
+
+def test_iteration_is_saved_once() -> None:
+    """Ensures that an iteration is not saved again on another day."""
+    seed = uuid.uuid4()
+    today = timezone.localdate()
+    _save(today, seed)
+    _save(today + datetime.timedelta(weeks=1), seed)
+
+    assert GenerationModel.objects.get(seed=seed).created_on == today
+    assert GenerationKeyModel.objects.get(seed=seed).created_on == today
+
+
+def test_old_partitions_are_dropped() -> None:
+    """Ensures that weeks past the retention period are dropped whole."""
+    today = timezone.localdate()
+    old_day = today - datetime.timedelta(weeks=8)
+    partitions.create_partitions(since=old_day, until=old_day)
+    old_generation = _save(old_day)
+    new_generation = _save(today)
+
+    call_command("rotate_generation_partitions", retention_days=28)
+
+    assert list(GenerationModel.objects.values_list("pk", flat=True)) == [
+        new_generation.pk,
+    ]
+    assert not GenerationAnswerModel.objects.filter(
+        generation_id=old_generation.pk,
+    ).exists()
+    assert list(GenerationKeyModel.objects.values_list("seed", flat=True)) == [
+        new_generation.seed,
+    ]
+    table = GenerationModel._meta.db_table  # noqa: SLF001
+    weeks = partitions.get_partitions(table)
+    assert partitions.week_start(old_day) not in weeks
+    assert partitions.week_start(today) in weeks
+
+
+def _default_rows(model: type[GenerationModel | GenerationAnswerModel]) -> int:
+    table = model._meta.db_table  # noqa: SLF001
+    name = partitions.default_partition_name(table)
+    with connection.cursor() as cursor:
+        cursor.execute(f"SELECT count(*) FROM {name}")  # noqa: S608
+        (rows,) = cursor.fetchone()
+    return rows  # type: ignore[no-any-return]
+
+
+def test_new_partition_takes_default_rows() -> None:
+    """Ensures that rows of a new week move out of the default partition."""
+    later_day = timezone.localdate() + datetime.timedelta(weeks=10)
+    generation = _save(later_day)
+    assert _default_rows(GenerationModel) == 1
+
+    partitions.create_partitions(since=later_day, until=later_day)
+
+    assert _default_rows(GenerationModel) == 0
+    assert _default_rows(GenerationAnswerModel) == 0
+    assert GenerationModel.objects.get(pk=generation.pk).created_on == later_day
+    assert GenerationAnswerModel.objects.filter(
+        generation_id=generation.pk,
+    ).exists()
+
+
+def test_old_default_rows_are_purged() -> None:
+    """Ensures that rotation deletes old rows of the default partition."""
+    today = timezone.localdate()
+    old_generation = _save(today - datetime.timedelta(weeks=8))
+    new_generation = _save(today)
+
+    call_command("rotate_generation_partitions", retention_days=28)
+
+    assert list(GenerationModel.objects.values_list("pk", flat=True)) == [
+        new_generation.pk,
+    ]
+    assert not GenerationAnswerModel.objects.filter(
+        generation_id=old_generation.pk,
+    ).exists()
+    assert list(GenerationKeyModel.objects.values_list("seed", flat=True)) == [
+        new_generation.seed,
+    ]
+    assert _default_rows(GenerationModel) == 0
+
+
+def test_rotation_creates_weeks_ahead() -> None:
+    """Ensures that rotation creates partitions of the upcoming weeks."""
+    table = GenerationModel._meta.db_table  # noqa: SLF001
+    last_week = partitions.week_start(
+        timezone.localdate() + datetime.timedelta(weeks=4),
+    )
+    stdout = io.StringIO()
+
+    call_command("rotate_generation_partitions", weeks_ahead=4, stdout=stdout)
+
+    assert last_week in partitions.get_partitions(table)
+    assert f"Created {partitions.partition_name(table, last_week)}" in (
+        stdout.getvalue()
+    )
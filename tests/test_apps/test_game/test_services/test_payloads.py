@@ -0,0 +1,79 @@
+import uuid
+from typing import Any
+
+import pytest
+from django.core.management import call_command
+from django.test import Client
+from pytest_django import DjangoAssertNumQueries
+
+from server.apps.game.models import GenerationModel
+from server.apps.game.services.catalog import (
+    bump_catalog_version,
+    get_catalog_version,
+    reset_catalog,
+)
+from server.apps.game.services.dto import GenerateSituationParams, Situation
+from server.apps.game.services.generation import generate_situation
+
+pytestmark = pytest.mark.usefixtures("game_catalog")
+
+
+def _generate(
+    client: Client,
+    params: GenerateSituationParams,
+    prefix: str = "/api/game",
+) -> Any:
+    response = client.post(
+        f"{prefix}/generateSituation",
+        params.model_dump(mode="json"),
+        content_type="application/json",
+    )
+    assert response.status_code == 200
+    return response.json()
+
+
+def _sorted_answers(situation: dict[str, Any]) -> dict[str, Any]:
+    return {
+        **situation,
+        "answers": sorted(
+            situation["answers"],
+            key=lambda answer: answer["product"]["id"],
+        ),
+    }
+
+
+def _rendered(params: GenerateSituationParams) -> dict[str, Any]:
+    return Situation.from_generation_model(
+        generate_situation(params),
+    ).model_dump(mode="json")
+
+
+def test_repeat_request_reads_payload(
+    client: Client,
+    django_assert_num_queries: DjangoAssertNumQueries,
+) -> None:
+    """Ensures that a stored payload is served by one lookup, as rendered."""
+    params = GenerateSituationParams(seed=uuid.uuid4(), num_iterations=0)
+    first = _generate(client, params)
+
+    with django_assert_num_queries(1):
+        second = _generate(client, params)
+
+    assert _sorted_answers(first) == _sorted_answers(second)
+    assert _sorted_answers(second) == _sorted_answers(_rendered(params))
+
+
+@pytest.mark.parametrize("prefix", ["/api/game", "/api/game/async"])
+def test_stale_payload_is_rebuilt(client: Client, prefix: str) -> None:
+    """Ensures that catalog changes are rendered until payloads are rebuilt."""
+    params = GenerateSituationParams(seed=uuid.uuid4(), num_iterations=0)
+    _generate(client, params, prefix)
+    bump_catalog_version()
+    reset_catalog()
+
+    situation = _generate(client, params, prefix)
+    call_command("rebuild_situation_payloads")
+
+    assert _sorted_answers(situation) == _sorted_answers(_rendered(params))
+    stored = GenerationModel.objects.get(seed=params.seed)
+    assert stored.payload["catalog_version"] == get_catalog_version()
@@ -0,0 +1,104 @@
+import logging
+import threading
+import uuid
+from collections.abc import Iterator
+from http import HTTPStatus
+
+import pytest
+from django.conf import LazySettings
+from django.core.cache import cache
+from django.test import Client
+
+from server.apps.game.models import GenerationModel
+from server.apps.game.services import generation, metrics, prefetch
+from server.apps.game.services.dto import GenerateSituationParams
+
+pytestmark = [
+    pytest.mark.django_db(transaction=True),
+    pytest.mark.usefixtures("game_catalog"),
+]
+
+
+@pytest.fixture(autouse=True)
+def _prefetch(settings: LazySettings) -> Iterator[None]:
+    """Prefetches two iterations ahead with clean counters."""
+    settings.GAME_PREFETCH_AHEAD = 2
+    cache.clear()
+    yield
+    prefetch.shutdown_prefetcher()
+
+
+def _post_situation(client: Client, seed: uuid.UUID, iteration: int) -> None:
+    response = client.post(
+        "/api/game/generateSituation",
+        {"seed": str(seed), "num_iterations": iteration},
+        content_type="application/json",
+    )
+    assert response.status_code == HTTPStatus.OK
+
+
+def test_next_iterations_are_prefetched(client: Client) -> None:
+    """Ensures that upcoming iterations are generated in the background."""
+    seed = uuid.uuid4()
+
+    _post_situation(client, seed, 0)
+    prefetch.shutdown_prefetcher()
+
+    assert set(
+        GenerationModel.objects.filter(seed=seed).values_list(
+            "iteration",
+            flat=True,
+        ),
+    ) == {0, 1, 2}
+    assert metrics.get_counters()[metrics.PREFETCH_GENERATED] == 2
+
+
+def test_prefetch_hit_rate(client: Client) -> None:
+    """Ensures that requests for prefetched iterations count as hits."""
+    seed = uuid.uuid4()
+
+    _post_situation(client, seed, 0)
+    prefetch.shutdown_prefetcher()
+    _post_situation(client, seed, 1)
+    # Skips iteration 2, so the request for iteration 4 is a miss:
+    _post_situation(client, seed, 4)
+
+    counters = metrics.get_counters()
+    assert counters[metrics.PREFETCH_HIT] == 1
+    assert counters[metrics.PREFETCH_MISS] == 1
+
+
+def test_busy_prefetcher_skips_iterations(
+    settings: LazySettings,
+    monkeypatch: pytest.MonkeyPatch,
+    caplog: pytest.LogCaptureFixture,
+) -> None:
+    """Ensures that a full queue skips iterations and failures are logged."""
+    settings.GAME_PREFETCH_QUEUE_SIZE = 1
+    release = threading.Event()
+
+    def pregenerate_situation(
+        generation_params: GenerateSituationParams,
+    ) -> bool:
+        release.wait(10)
+        raise RuntimeError
+
+    monkeypatch.setattr(
+        generation,
+        "pregenerate_situation",
+        pregenerate_situation,
+    )
+    params = GenerateSituationParams(seed=uuid.uuid4(), num_iterations=0)
+
+    with caplog.at_level(logging.ERROR, logger=prefetch.__name__):
+        prefetch.on_situation_served(params)
+        # Iteration 1 is still being generated and is not scheduled twice:
+        prefetch.on_situation_served(params)
+        release.set()
+        prefetch.shutdown_prefetcher()
+
+    counters = metrics.get_counters()
+    assert counters[metrics.PREFETCH_SCHEDULED] == 1
+    assert counters[metrics.PREFETCH_SKIPPED] == 2
+    assert counters[metrics.PREFETCH_GENERATED] == 0
+    assert len(caplog.records) == 1
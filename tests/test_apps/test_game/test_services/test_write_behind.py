@@ -0,0 +1,238 @@
+import contextlib
+import logging
+import time
+import uuid
+from collections.abc import Callable, Iterator
+from typing import Any
+
+import pytest
+from asgiref.sync import async_to_sync
+from django.conf import LazySettings
+from django.db import DatabaseError
+
+from server.apps.game.models import GenerationAnswerModel, GenerationModel
+from server.apps.game.services import write_behind
+from server.apps.game.services.dto import GenerateSituationParams
+from server.apps.game.services.generation import (
+    agenerate_situation,
+    build_generation,
+    generate_situation,
+    get_situation_ids,
+    pregenerate_situation,
+)
+
+pytestmark = [
+    pytest.mark.django_db(transaction=True),
+    pytest.mark.usefixtures("game_catalog"),
+]
+
+
+@pytest.fixture
+def _write_behind(settings: LazySettings) -> Iterator[None]:
+    """Enables write-behind mode with a fresh queue."""
+    settings.GAME_WRITE_BEHIND = True
+    write_behind.close_generation_writer()
+    yield
+    write_behind.close_generation_writer()
+
+
+@pytest.fixture
+def _unstarted_writer(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Keeps generations queued, nothing is written until ``close``."""
+    monkeypatch.setattr(
+        write_behind.GenerationWriter,
+        "_ensure_started",
+        lambda writer: None,
+    )
+
+
+@pytest.mark.usefixtures("_write_behind")
+@pytest.mark.parametrize(
+    "generate",
+    [generate_situation, async_to_sync(agenerate_situation)],
+)
+def test_generation_is_written_later(generate: Callable[..., Any]) -> None:
+    """Ensures that queued generations are served and written on close."""
+    params = GenerateSituationParams(seed=uuid.uuid4(), num_iterations=0)
+
+    generation = generate(params)
+    same_generation = generate(params)
+    write_behind.close_generation_writer()
+
+    assert same_generation.client_first_name == generation.client_first_name
+    stored = GenerationModel.objects.get(seed=params.seed, iteration=0)
+    assert stored.situation_id == generation.situation.id
+    assert GenerationAnswerModel.objects.filter(
+        generation=stored,
+    ).count() == len(generation.prefetched_answers)
+
+
+@pytest.mark.usefixtures("_write_behind", "_unstarted_writer")
+def test_queued_generation_is_not_prefetched() -> None:
+    """Ensures that prefetching skips iterations waiting to be written."""
+    params = GenerateSituationParams(seed=uuid.uuid4(), num_iterations=1)
+
+    assert pregenerate_situation(params)
+    assert not pregenerate_situation(params)
+
+
+@pytest.mark.usefixtures("_write_behind", "_unstarted_writer")
+def test_queued_generation_has_situation() -> None:
+    """Ensures that answer stats see iterations waiting to be written."""
+    params = GenerateSituationParams(seed=uuid.uuid4(), num_iterations=0)
+
+    generation = generate_situation(params)
+
+    assert not GenerationModel.objects.filter(seed=params.seed).exists()
+    assert get_situation_ids(params.seed, [0, 1]) == {
+        0: generation.situation_id,
+    }
+
+
+def test_full_queue_falls_back(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Ensures that a full queue makes the caller save synchronously."""
+    writer = write_behind.GenerationWriter(
+        queue_size=1,
+        batch_size=10,
+        flush_interval=0.1,
+    )
+    # Keep the queue full, nothing consumes it until `close`:
+    monkeypatch.setattr(writer, "_ensure_started", lambda: None)
+    seed = uuid.uuid4()
+    generations = [
+        build_generation(
+            GenerateSituationParams(seed=seed, num_iterations=iteration),
+        )
+        for iteration in range(2)
+    ]
+
+    assert writer.put(generations[0]) is generations[0].generation
+    assert writer.put(generations[1]) is None
+    assert writer.get(seed, 0) is generations[0].generation
+    # The same iteration built again is served from the queue:
+    rebuilt = build_generation(
+        GenerateSituationParams(seed=seed, num_iterations=0),
+    )
+    assert writer.put(rebuilt) is generations[0].generation
+
+    writer.close()
+
+    assert writer.get(seed, 0) is None
+    assert writer.put(generations[1]) is None
+    assert GenerationModel.objects.filter(seed=seed).count() == 1
+
+
+def test_duplicate_generations_are_skipped() -> None:
+    """Ensures that a batch skips iterations stored by another worker."""
+    seed = uuid.uuid4()
+    stored = build_generation(
+        GenerateSituationParams(seed=seed, num_iterations=0),
+    )
+    write_behind.save_generation(stored)
+
+    write_behind.save_generations([
+        build_generation(
+            GenerateSituationParams(seed=seed, num_iterations=iteration),
+        )
+        for iteration in range(2)
+    ])
+
+    assert GenerationModel.objects.filter(seed=seed).count() == 2
+
+
+def _generations(seed: uuid.UUID, count: int) -> list[Any]:
+    return [
+        build_generation(
+            GenerateSituationParams(seed=seed, num_iterations=iteration),
+        )
+        for iteration in range(count)
+    ]
+
+
+def test_writer_thread_writes_batches() -> None:
+    """Ensures that the background thread writes generations in batches."""
+    writer = write_behind.GenerationWriter(
+        queue_size=10,
+        batch_size=2,
+        flush_interval=0.05,
+    )
+    seed = uuid.uuid4()
+
+    for situation_generation in _generations(seed, 3):
+        writer.put(situation_generation)
+    deadline = time.monotonic() + 10
+    while writer.get(seed, 2) is not None and time.monotonic() < deadline:
+        time.sleep(0.05)
+    # Let the idle thread wait for the queue at least once:
+    time.sleep(0.1)
+    writer.close()
+
+    assert GenerationModel.objects.filter(seed=seed).count() == 3
+
+
+def test_batch_is_cut_at_deadline(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Ensures that a batch is not collected past the flush interval."""
+    writer = write_behind.GenerationWriter(
+        queue_size=10,
+        batch_size=10,
+        flush_interval=0,
+    )
+    monkeypatch.setattr(writer, "_ensure_started", lambda: None)
+    first, second = _generations(uuid.uuid4(), 2)
+    writer.put(second)
+
+    assert writer._collect(first) == [first]  # noqa: SLF001
+
+    writer.close()
+
+
+def test_failed_write_is_logged(
+    monkeypatch: pytest.MonkeyPatch,
+    caplog: pytest.LogCaptureFixture,
+) -> None:
+    """Ensures that a failed batch is logged and no longer served."""
+    writer = write_behind.GenerationWriter(
+        queue_size=10,
+        batch_size=1,
+        flush_interval=0.1,
+    )
+    monkeypatch.setattr(writer, "_ensure_started", lambda: None)
+
+    def save_generations(batch: list[Any]) -> None:
+        raise DatabaseError
+
+    monkeypatch.setattr(write_behind, "save_generations", save_generations)
+    seed = uuid.uuid4()
+    for situation_generation in _generations(seed, 2):
+        writer.put(situation_generation)
+
+    with caplog.at_level(logging.ERROR, logger=write_behind.__name__):
+        writer.close()
+
+    assert writer.get(seed, 0) is None
+    assert len(caplog.records) == 2
+    assert not GenerationModel.objects.filter(seed=seed).exists()
+
+
+def test_writer_created_meanwhile(
+    settings: LazySettings,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """Ensures that racing threads share the writer created first."""
+    settings.GAME_WRITE_BEHIND = True
+    writer = write_behind.GenerationWriter(
+        queue_size=1,
+        batch_size=1,
+        flush_interval=0.1,
+    )
+
+    @contextlib.contextmanager
+    def racing_lock() -> Iterator[None]:
+        # Another thread created the writer while this one waited:
+        monkeypatch.setattr(write_behind, "_writer", writer)
+        yield
+
+    monkeypatch.setattr(write_behind, "_writer", None)
+    monkeypatch.setattr(write_behind, "_writer_lock", racing_lock())
+
+    assert write_behind.get_generation_writer() is writer
@@ -0,0 +1,186 @@
+import io
+import uuid
+from http import HTTPStatus
+from typing import Any
+
+import pytest
+from asgiref.sync import async_to_sync
+from django.conf import LazySettings
+from django.core.management import call_command
+from django.test import AsyncClient, Client
+
+from server.apps.game.models import GenerationModel, ProductModel
+from server.apps.game.services import generation
+from server.apps.game.services.catalog import reset_catalog
+from server.apps.game.services.dto import GenerateSituationParams
+from server.apps.game.services.write_behind import save_generation
+
+
+@pytest.mark.usefixtures("game_catalog")
+@pytest.mark.parametrize(
+    "route",
+    ["generateSituation", "getHint"],
+)
+def test_async_routes_match_sync(
+    client: Client,
+    async_client: AsyncClient,
+    route: str,
+) -> None:
+    """Ensures that async routes return the same data as sync ones."""
+    payload = {"seed": str(uuid.uuid4()), "num_iterations": 3}
+
+    async_response = async_to_sync(async_client.post)(
+        f"/api/game/async/{route}",
+        payload,
+        content_type="application/json",
+    )
+    sync_response = client.post(
+        f"/api/game/{route}",
+        payload,
+        content_type="application/json",
+    )
+
+    assert async_response.status_code == HTTPStatus.OK
+    assert _without_answers(async_response.json()) == _without_answers(
+        sync_response.json(),
+    )
+
+
+def test_async_day_finish(
+    async_client: AsyncClient,
+    game_catalog: list[ProductModel],
+) -> None:
+    """Ensures that async day acknowledgement generates missing iterations."""
+    response = async_to_sync(async_client.post)(
+        "/api/game/async/acknowledgeDayFinish",
+        {
+            "seed": str(uuid.uuid4()),
+            "answers": [
+                {
+                    "iteration": 0,
+                    "recommended_product_ids": [game_catalog[0].id],
+                },
+                {"iteration": 1, "recommended_product_ids": []},
+            ],
+        },
+        content_type="application/json",
+    )
+
+    assert response.status_code == HTTPStatus.OK
+    assert len(response.json()["reviews"]) == 2
+
+
+@pytest.mark.usefixtures("game_catalog")
+@pytest.mark.parametrize("prefix", ["/api/game", "/api/game/async"])
+def test_concurrent_generation_is_reused(
+    client: Client,
+    monkeypatch: pytest.MonkeyPatch,
+    prefix: str,
+) -> None:
+    """Ensures that an iteration saved by another request meanwhile is used."""
+    generation_params = {"seed": str(uuid.uuid4()), "num_iterations": 0}
+
+    def racing_save(situation_generation: Any) -> bool:
+        # Another request saves the same iteration first:
+        save_generation(
+            generation.build_generation(
+                GenerateSituationParams.model_validate(generation_params),
+            ),
+        )
+        return False
+
+    monkeypatch.setattr(generation, "save_generation", racing_save)
+
+    response = client.post(
+        f"{prefix}/generateSituation",
+        generation_params,
+        content_type="application/json",
+    )
+
+    assert response.status_code == HTTPStatus.OK
+    assert GenerationModel.objects.count() == 1
+
+
+@pytest.mark.usefixtures("game_catalog")
+def test_chunk_with_cold_catalog(
+    client: Client,
+    async_client: AsyncClient,
+) -> None:
+    """Ensures that stored chunk iterations load a reset catalog in a thread."""
+    payload = {"seed": str(uuid.uuid4()), "total_iterations": 2}
+    client.post(
+        "/api/game/generateChunkSituations",
+        payload,
+        content_type="application/json",
+    )
+    reset_catalog()
+
+    response = async_to_sync(async_client.post)(
+        "/api/game/async/generateChunkSituations",
+        payload,
+        content_type="application/json",
+    )
+
+    assert response.status_code == HTTPStatus.OK
+    assert len(response.json()) == 2
+
+
+@pytest.mark.usefixtures("game_catalog")
+def test_stale_payload_with_cold_catalog(
+    async_client: AsyncClient,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """Ensures that a stale payload is rebuilt with a reset catalog."""
+    payload = {"seed": str(uuid.uuid4()), "num_iterations": 0}
+    generation.generate_situation(
+        GenerateSituationParams.model_validate(payload),
+    )
+    GenerationModel.objects.update(payload=None)
+
+    def cold_catalog(*args: Any) -> dict[str, Any]:
+        # The snapshot is reset right after its version was read:
+        reset_catalog()
+        return situation_data(*args)
+
+    situation_data = generation._situation_data  # noqa: SLF001
+    monkeypatch.setattr(generation, "_situation_data", cold_catalog)
+
+    response = async_to_sync(async_client.post)(
+        "/api/game/async/generateSituation",
+        payload,
+        content_type="application/json",
+    )
+
+    assert response.status_code == HTTPStatus.OK
+    assert response.json()["answers"]
+
+
+@pytest.mark.django_db(transaction=True)
+@pytest.mark.usefixtures("game_catalog")
+@pytest.mark.parametrize("prefetch_ahead", [0, 1])
+def test_bench_day_simulation(
+    settings: LazySettings,
+    prefetch_ahead: int,
+) -> None:
+    """Ensures that the simulation plays days in both modes and reports."""
+    settings.GAME_PREFETCH_AHEAD = prefetch_ahead
+    stdout = io.StringIO()
+
+    call_command(
+        "bench_day_simulation",
+        players=2,
+        iterations=2,
+        repeat=True,
+        stdout=stdout,
+    )
+
+    modes = [line.split()[0] for line in stdout.getvalue().splitlines()]
+    rounds = ["sync", "sync", "async", "async"]
+    if prefetch_ahead:
+        rounds = [mode for name in rounds for mode in (name, "prefetch")]
+    assert modes == rounds
+
+
+def _without_answers(situation: dict[str, Any]) -> dict[str, Any]:
+    # Answers are shuffled on every response:
+    return {key: value for key, value in situation.items() if key != "answers"}
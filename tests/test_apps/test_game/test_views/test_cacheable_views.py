@@ -0,0 +1,99 @@
+import uuid
+from http import HTTPStatus
+from types import SimpleNamespace
+
+import pytest
+from django.conf import LazySettings
+from django.test import Client
+
+from server.apps.game import caching
+from server.apps.game.models import GenerationModel, SpriteModel
+from server.apps.game.services.payloads import sprite_url
+
+pytestmark = pytest.mark.usefixtures("game_catalog")
+
+
+@pytest.mark.parametrize("day_sessions", [True, False])
+@pytest.mark.parametrize("prefix", ["/api/game", "/api/game/async"])
+@pytest.mark.parametrize("route", ["situation", "hint"])
+def test_get_is_cacheable(
+    client: Client,
+    settings: LazySettings,
+    prefix: str,
+    route: str,
+    day_sessions: bool,  # noqa: FBT001
+) -> None:
+    """Ensures that GET routes return stable bytes and honor If-None-Match."""
+    settings.GAME_DAY_SESSIONS = day_sessions
+    url = f"{prefix}/{route}/{uuid.uuid4()}/2"
+
+    response = client.get(url)
+    repeated = client.get(url)
+    not_modified = client.get(url, headers={"If-None-Match": response["ETag"]})
+
+    assert response.status_code == HTTPStatus.OK
+    assert response.content == repeated.content
+    assert response["ETag"] == repeated["ETag"]
+    assert "immutable" in response["Cache-Control"]
+    assert not_modified.status_code == HTTPStatus.NOT_MODIFIED
+
+
+@pytest.mark.parametrize("prefix", ["/api/game", "/api/game/async"])
+@pytest.mark.parametrize("route", ["situation", "hint"])
+@pytest.mark.parametrize("iteration", [-1, 3])
+def test_iteration_outside_day(
+    client: Client,
+    settings: LazySettings,
+    prefix: str,
+    route: str,
+    iteration: int,
+) -> None:
+    """Ensures that iterations outside the longest day are not generated."""
+    settings.GAME_DAY_MAX_ITERATIONS = 3
+
+    response = client.get(f"{prefix}/{route}/{uuid.uuid4()}/{iteration}")
+
+    assert response.status_code == HTTPStatus.NOT_FOUND
+    assert not GenerationModel.objects.exists()
+
+
+def test_answer_order_follows_seed(client: Client) -> None:
+    """Ensures that answers are shuffled the same way for the same iteration."""
+    payload = {"seed": str(uuid.uuid4()), "num_iterations": 1}
+
+    answers = [
+        client.post(
+            "/api/game/generateSituation",
+            payload,
+            content_type="application/json",
+        ).json()["answers"]
+        for _ in range(2)
+    ]
+    situation = client.get(
+        f"/api/game/situation/{payload['seed']}/{payload['num_iterations']}",
+    ).json()
+
+    assert answers[0] == answers[1] == situation["answers"]
+
+
+def test_sprite_redirect(client: Client) -> None:
+    """Ensures that stable sprite links redirect to the storage."""
+    situation = client.get(f"/api/game/situation/{uuid.uuid4()}/0").json()
+
+    response = client.get(situation["client"]["sprite"])
+    missing = client.get("/api/game/sprite/sprites/missing.png")
+
+    assert response.status_code == HTTPStatus.FOUND
+    assert response["Location"] == sprite_url(
+        situation["client"]["sprite"].split("/api/game/sprite/")[1],
+    )
+    assert missing.status_code == HTTPStatus.NOT_FOUND
+
+
+def test_signed_sprite_max_age(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Ensures that a redirect to a signed link is cached half its life."""
+    field = SpriteModel._meta.get_field("image")  # noqa: SLF001
+    storage = SimpleNamespace(querystring_auth=True, querystring_expire=3600)
+    monkeypatch.setattr(field, "storage", storage)
+
+    assert caching.sprite_max_age() == 1800
@@ -0,0 +1,67 @@
+import uuid
+from http import HTTPStatus
+
+import pytest
+from asgiref.sync import async_to_sync
+from django.db import connection
+from django.test import AsyncClient, Client
+
+pytestmark = [
+    pytest.mark.django_db(transaction=True),
+    pytest.mark.usefixtures("game_catalog"),
+    pytest.mark.skipif(
+        connection.vendor != "postgresql"
+        or not connection.settings_dict["OPTIONS"].get("pool"),
+        reason="requires the psycopg connection pool",
+    ),
+]
+
+
+def _post_situation(prefix: str) -> dict[str, object]:
+    return {
+        "path": f"{prefix}/generateSituation",
+        "data": {"seed": str(uuid.uuid4()), "num_iterations": 0},
+        "content_type": "application/json",
+    }
+
+
+def _assert_pool_reused(requests_before: int, total_requests: int) -> None:
+    stats = connection.pool.get_stats()
+    # Every request borrowed a connection from the pool:
+    assert stats["requests_num"] - requests_before == total_requests
+    # And every connection went back, without growing the pool:
+    assert stats["pool_available"] == stats["pool_size"]
+    assert stats["pool_size"] <= connection.pool.max_size
+
+
+def test_pool_sync_view(client: Client) -> None:
+    """Ensures that sync views borrow and return pooled connections."""
+    connection.close()
+    requests_before = connection.pool.get_stats().get("requests_num", 0)
+
+    for _ in range(3):
+        response = client.post(**_post_situation("/api/game"))
+        # Test client does not fire `close_old_connections`, servers do:
+        connection.close()
+
+        assert response.status_code == HTTPStatus.OK
+        assert connection.connection is None
+
+    _assert_pool_reused(requests_before, 3)
+
+
+def test_pool_async_view(async_client: AsyncClient) -> None:
+    """Ensures that async views borrow and return pooled connections."""
+    connection.close()
+    requests_before = connection.pool.get_stats().get("requests_num", 0)
+
+    for _ in range(3):
+        response = async_to_sync(async_client.post)(
+            **_post_situation("/api/game/async"),
+        )
+        connection.close()
+
+        assert response.status_code == HTTPStatus.OK
+        assert connection.connection is None
+
+    _assert_pool_reused(requests_before, 3)
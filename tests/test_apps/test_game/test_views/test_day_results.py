@@ -0,0 +1,177 @@
+import threading
+import time
+import uuid
+from typing import Any
+
+import pytest
+from django.db import DEFAULT_DB_ALIAS, connection
+from django.http import HttpRequest, HttpResponse
+from django.test import Client, RequestFactory, override_settings
+from pytest_django import DjangoAssertNumQueries
+
+from server.apps.game.db_routers import PrimaryPinningMiddleware
+from server.apps.game.models import DayResultModel, ProductModel, ReviewModel
+from server.apps.game.services import day_results, dto, generation
+from server.apps.game.services.catalog import get_catalog
+from server.apps.game.services.dto import (
+    AcknowledgeDayFinish,
+    AnswerStatusEnum,
+    GenerateSituationParams,
+)
+
+pytestmark = pytest.mark.usefixtures("game_catalog")
+
+
+def _day_finish(game_catalog: list[ProductModel]) -> dict[str, Any]:
+    return {
+        "seed": str(uuid.uuid4()),
+        "answers": [
+            {"iteration": 0, "recommended_product_ids": [game_catalog[0].id]},
+            {"iteration": 1, "recommended_product_ids": []},
+        ],
+    }
+
+
+@pytest.mark.parametrize("prefix", ["/api/game", "/api/game/async"])
+def test_retry_reads_stored_result(
+    client: Client,
+    django_assert_num_queries: DjangoAssertNumQueries,
+    game_catalog: list[ProductModel],
+    prefix: str,
+) -> None:
+    """Ensures that a repeated day finish is one lookup of the stored result."""
+    day_finish = _day_finish(game_catalog)
+    url = f"{prefix}/acknowledgeDayFinish"
+    response = client.post(url, day_finish, content_type="application/json")
+
+    with django_assert_num_queries(1):
+        repeated = client.post(url, day_finish, content_type="application/json")
+
+    assert repeated.json() == response.json()
+    assert response.json()["total_rating"] == sum(
+        review["rating"] for review in response.json()["reviews"]
+    )
+
+
+@override_settings(DATABASE_REPLICAS=("replica_0", "replica_1"))
+def test_stored_result_is_read_from_primary(
+    game_catalog: list[ProductModel],
+) -> None:
+    """Ensures that a retry does not miss a result not yet replicated."""
+    data = AcknowledgeDayFinish.model_validate(_day_finish(game_catalog))
+    databases = []
+
+    def get_response(request: HttpRequest) -> HttpResponse:
+        query = day_results._stored_query(  # noqa: SLF001
+            data,
+            day_results.answers_hash(data),
+        )
+        databases.append(query.db)
+        return HttpResponse()
+
+    # A new request, the catalog writes above pinned this one:
+    PrimaryPinningMiddleware(get_response)(RequestFactory().post("/"))
+
+    assert databases == [DEFAULT_DB_ALIAS]
+
+
+def test_other_answers_get_own_result(
+    client: Client,
+    game_catalog: list[ProductModel],
+) -> None:
+    """Ensures that changed answers are reviewed instead of reusing a result."""
+    day_finish = _day_finish(game_catalog)
+    changed = {
+        **day_finish,
+        "answers": [{"iteration": 0, "recommended_product_ids": []}],
+    }
+
+    responses = [
+        client.post(
+            "/api/game/acknowledgeDayFinish",
+            payload,
+            content_type="application/json",
+        ).json()
+        for payload in (day_finish, changed)
+    ]
+
+    assert responses[0] != responses[1]
+    assert DayResultModel.objects.filter(seed=day_finish["seed"]).count() == 2
+
+
+@pytest.mark.django_db(transaction=True)
+def test_concurrent_duplicates_are_coalesced(
+    monkeypatch: pytest.MonkeyPatch,
+    game_catalog: list[ProductModel],
+) -> None:
+    """Ensures that simultaneous duplicates compute the result once."""
+    data = AcknowledgeDayFinish.model_validate(_day_finish(game_catalog))
+    compute = day_results._compute  # noqa: SLF001
+    computed = []
+
+    def slow_compute(data: AcknowledgeDayFinish) -> dict[str, Any]:
+        computed.append(data.seed)
+        time.sleep(0.2)
+        return compute(data)
+
+    monkeypatch.setattr(day_results, "_compute", slow_compute)
+    results = []
+
+    def acknowledge() -> None:
+        try:
+            results.append(day_results.acknowledge_day_finish(data))
+        finally:
+            connection.close()
+
+    threads = [threading.Thread(target=acknowledge) for _ in range(2)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(computed) == 1
+    assert results[0] == results[1]
+
+
+def test_reviews_products_added_meanwhile() -> None:
+    """Ensures that products missing from the snapshot reload it once."""
+    params = GenerateSituationParams(seed=uuid.uuid4(), num_iterations=0)
+    client = dto.Client.from_generation(generation.generate_situation(params))
+    catalog = get_catalog()
+    # `bulk_create` sends no signals, as if another worker added them:
+    lost, incorrect = ProductModel.objects.bulk_create([
+        ProductModel(name=name, link=f"https://a.ru/{name}")
+        for name in ("lost", "incorrect")
+    ])
+    ReviewModel.objects.bulk_create([
+        ReviewModel(product=product, is_product_in_answer=status, text=text)
+        for product, status, text in (
+            (lost, False, "lost review"),
+            (incorrect, True, "incorrect review"),
+        )
+    ])
+
+    review = generation.review_answers(
+        params,
+        [lost.id],
+        client,
+        # An unknown product is skipped, as before:
+        [incorrect.id, incorrect.id + 1],
+        catalog,
+    )
+
+    assert {
+        (item.answered_product.id, item.answer_status, item.review)
+        for item in review.review
+    } == {
+        (
+            lost.id,
+            AnswerStatusEnum.CORRECT_BUT_NOT_SELECTED,
+            "lost review",
+        ),
+        (
+            incorrect.id,
+            AnswerStatusEnum.INCORRECT_BUT_SELECTED,
+            "incorrect review",
+        ),
+    }
@@ -0,0 +1,76 @@
+import uuid
+from http import HTTPStatus
+from typing import Any
+
+import pytest
+from django.conf import LazySettings
+from django.test import Client
+from pytest_django import DjangoAssertNumQueries
+
+pytestmark = pytest.mark.usefixtures("game_catalog")
+
+
+def _post(client: Client, url: str, payload: dict[str, Any]) -> Any:
+    return client.post(url, payload, content_type="application/json")
+
+
+@pytest.mark.parametrize("day_sessions", [True, False])
+@pytest.mark.parametrize("prefix", ["/api/game", "/api/game/async"])
+def test_hints_match_single_hints(
+    client: Client,
+    settings: LazySettings,
+    prefix: str,
+    day_sessions: bool,  # noqa: FBT001
+) -> None:
+    """Ensures that batch hints equal single hints in the requested order."""
+    settings.GAME_DAY_SESSIONS = day_sessions
+    seed = str(uuid.uuid4())
+    stored = _post(
+        client,
+        f"{prefix}/getHint",
+        {"seed": seed, "num_iterations": 1},
+    ).json()
+
+    response = _post(
+        client,
+        f"{prefix}/getHints",
+        {"seed": seed, "iterations": [2, 1, 0]},
+    )
+
+    assert response.status_code == HTTPStatus.OK
+    assert response.json()[1] == stored
+    assert response.json() == [
+        _post(
+            client,
+            f"{prefix}/getHint",
+            {"seed": seed, "num_iterations": iteration},
+        ).json()
+        for iteration in (2, 1, 0)
+    ]
+
+
+def test_stored_hints_single_query(
+    client: Client,
+    django_assert_num_queries: DjangoAssertNumQueries,
+) -> None:
+    """Ensures that stored hints are read with one query."""
+    payload = {"seed": str(uuid.uuid4()), "iterations": [0, 1, 2]}
+    _post(client, "/api/game/getHints", payload)
+
+    with django_assert_num_queries(1):
+        response = _post(client, "/api/game/getHints", payload)
+
+    assert len(response.json()) == len(payload["iterations"])
+
+
+def test_hints_are_capped(client: Client, settings: LazySettings) -> None:
+    """Ensures that one request cannot ask for more hints than a chunk."""
+    settings.GAME_CHUNK_MAX_ITERATIONS = 2
+
+    response = _post(
+        client,
+        "/api/game/getHints",
+        {"seed": str(uuid.uuid4()), "iterations": [0, 1, 2]},
+    )
+
+    assert response.status_code == HTTPStatus.UNPROCESSABLE_ENTITY
@@ -0,0 +1,76 @@
+import io
+from http import HTTPStatus
+
+import pytest
+from django.core.management import call_command
+from django.http import HttpRequest, HttpResponse
+from django.test import Client, RequestFactory
+
+from server.apps.game.middleware import (
+    AuthenticationMiddleware,
+    MessageMiddleware,
+    SessionMiddleware,
+)
+
+_SITE_ATTRIBUTES = ("session", "user", "_messages")
+
+
+def _site_attributes(path: str) -> set[str]:
+    seen = set()
+
+    def get_response(request: HttpRequest) -> HttpResponse:
+        seen.update(name for name in _SITE_ATTRIBUTES if hasattr(request, name))
+        return HttpResponse()
+
+    handler = SessionMiddleware(
+        AuthenticationMiddleware(MessageMiddleware(get_response)),
+    )
+    handler(RequestFactory().get(path))
+    return seen
+
+
+def test_stateless_paths_skip_site_middleware() -> None:
+    """Ensures that game requests get no session, user or messages."""
+    assert not _site_attributes("/api/game/leaderboard/all")
+    assert _site_attributes("/admin/") == set(_SITE_ATTRIBUTES)
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize("prefix", ["/api/game", "/api/game/async"])
+def test_game_responses_do_not_vary_by_client(
+    client: Client,
+    prefix: str,
+) -> None:
+    """Ensures that game responses do not depend on cookies or language."""
+    response = client.get(
+        f"{prefix}/leaderboard/all",
+        HTTP_ACCEPT_LANGUAGE="en",
+        HTTP_COOKIE=f"sessionid=abc; csrftoken={'a' * 32}",
+    )
+
+    assert response.status_code == HTTPStatus.OK
+    assert "Cookie" not in response["Vary"]
+    assert "Accept-Language" not in response["Vary"]
+    assert not response.has_header("Content-Language")
+    assert response["X-Frame-Options"] == "DENY"
+
+
+@pytest.mark.django_db
+def test_site_keeps_sessions_and_csrf(client: Client) -> None:
+    """Ensures that the admin still gets sessions, CSRF and the language."""
+    response = client.get("/admin/login/", HTTP_ACCEPT_LANGUAGE="en")
+
+    assert response.status_code == HTTPStatus.OK
+    assert "csrftoken" in response.cookies
+    assert response["Content-Language"] == "en"
+    assert "Cookie" in response["Vary"]
+
+
+def test_bench_middleware() -> None:
+    """Ensures that the benchmark compares both middleware chains."""
+    stdout = io.StringIO()
+
+    call_command("bench_middleware", requests=10, stdout=stdout)
+
+    lines = stdout.getvalue().splitlines()
+    assert [line.split()[0] for line in lines] == ["stock", "lean", "saved"]
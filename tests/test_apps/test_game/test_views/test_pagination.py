@@ -0,0 +1,116 @@
+import uuid
+from http import HTTPStatus
+from typing import Any
+
+import pytest
+from django.conf import LazySettings
+from django.test import Client
+
+from server.apps.game.models import GenerationModel
+
+pytestmark = pytest.mark.usefixtures("game_catalog")
+
+_CURSOR_HEADER = "X-Next-Cursor"
+
+
+def _chunk(client: Client, **payload: Any) -> Any:
+    return client.post(
+        "/api/game/generateChunkSituations",
+        payload,
+        content_type="application/json",
+    )
+
+
+def _iterations(response: Any) -> list[int]:
+    return [
+        situation["generation_params"]["num_iterations"]
+        for situation in response.json()
+    ]
+
+
+def test_cursor_pages_through_day(client: Client) -> None:
+    """Ensures that cursors walk a day in windows and write only the window."""
+    seed = str(uuid.uuid4())
+    pages = []
+    cursor = None
+
+    while True:
+        response = _chunk(
+            client,
+            seed=seed,
+            total_iterations=5,
+            limit=2,
+            **({"cursor": cursor} if cursor else {}),
+        )
+        assert response.status_code == HTTPStatus.OK
+        pages.append(_iterations(response))
+        if len(pages) == 1:
+            assert GenerationModel.objects.filter(seed=seed).count() == 2
+        cursor = response.get(_CURSOR_HEADER)
+        if cursor is None:
+            break
+
+    assert pages == [[0, 1], [2, 3], [4]]
+
+
+def test_limit_is_capped(client: Client, settings: LazySettings) -> None:
+    """Ensures that a chunk never exceeds the server maximum."""
+    settings.GAME_CHUNK_MAX_ITERATIONS = 2
+
+    response = _chunk(
+        client,
+        seed=str(uuid.uuid4()),
+        total_iterations=100,
+        start_iteration=3,
+        limit=50,
+    )
+
+    assert _iterations(response) == [3, 4]
+    assert _CURSOR_HEADER in response
+
+
+def test_day_is_capped(client: Client, settings: LazySettings) -> None:
+    """Ensures that a chunk cannot ask for a day longer than the maximum."""
+    settings.GAME_DAY_MAX_ITERATIONS = 3
+
+    response = _chunk(client, seed=str(uuid.uuid4()), total_iterations=4)
+
+    assert response.status_code == HTTPStatus.UNPROCESSABLE_ENTITY
+
+
+@pytest.mark.parametrize("cursor", ["garbage", "foreign"])
+def test_invalid_cursor(client: Client, cursor: str) -> None:
+    """Ensures that forged cursors and cursors of other seeds are rejected."""
+    if cursor == "foreign":
+        cursor = _chunk(
+            client,
+            seed=str(uuid.uuid4()),
+            total_iterations=2,
+            limit=1,
+        )[_CURSOR_HEADER]
+
+    response = _chunk(
+        client,
+        seed=str(uuid.uuid4()),
+        total_iterations=2,
+        cursor=cursor,
+    )
+
+    assert response.status_code == HTTPStatus.UNPROCESSABLE_ENTITY
+
+
+@pytest.mark.parametrize("prefix", ["/api/game", "/api/game/async"])
+@pytest.mark.parametrize(
+    "route",
+    ["generateChunkSituations", "streamChunkSituations"],
+)
+def test_routes_return_cursor(client: Client, prefix: str, route: str) -> None:
+    """Ensures that every chunk route returns the cursor of the next window."""
+    response = client.post(
+        f"{prefix}/{route}",
+        {"seed": str(uuid.uuid4()), "total_iterations": 3, "limit": 2},
+        content_type="application/json",
+    )
+
+    assert response.status_code == HTTPStatus.OK
+    assert _CURSOR_HEADER in response
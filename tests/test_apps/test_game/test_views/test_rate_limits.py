@@ -0,0 +1,211 @@
+import uuid
+from http import HTTPStatus
+from typing import Any
+
+import pytest
+from django.conf import LazySettings
+from django.http import HttpResponse
+from django.test import Client
+from ninja.conf import settings as ninja_settings
+
+from server.apps.game.services import metrics
+
+pytestmark = pytest.mark.usefixtures("game_catalog")
+
+
+@pytest.fixture(autouse=True)
+def _limits(settings: LazySettings) -> None:
+    """Allows a burst of ten iterations that refills very slowly."""
+    settings.GAME_RATE_LIMIT_CLIENT_RATE = 0.01
+    settings.GAME_RATE_LIMIT_CLIENT_BURST = 10
+    settings.GAME_RATE_LIMIT_SEED_RATE = 0
+
+
+def _chunk(
+    client: Client,
+    prefix: str,
+    iterations: int,
+    seed: uuid.UUID | None = None,
+    **extra: Any,
+) -> HttpResponse:
+    return client.post(  # type: ignore[no-any-return]
+        f"{prefix}/generateChunkSituations",
+        {"seed": str(seed or uuid.uuid4()), "total_iterations": iterations},
+        content_type="application/json",
+        **extra,
+    )
+
+
+@pytest.mark.parametrize("prefix", ["/api/game", "/api/game/async"])
+def test_client_is_limited_by_cost(client: Client, prefix: str) -> None:
+    """Ensures that a client gets 429 once its iterations are spent."""
+    admitted = _chunk(client, prefix, 8)
+    rejected = _chunk(client, prefix, 8)
+    # A rejected request does not spend the remaining iterations:
+    cheaper = _chunk(client, prefix, 2)
+    counters = metrics.get_counters()
+
+    assert admitted.status_code == HTTPStatus.OK
+    assert rejected.status_code == HTTPStatus.TOO_MANY_REQUESTS
+    assert rejected["Retry-After"] == "600"
+    assert cheaper.status_code == HTTPStatus.OK
+    assert counters[metrics.RATE_LIMIT_ADMITTED_COST] == 10
+    assert counters[metrics.RATE_LIMIT_REJECTED_COST] == 8
+    assert counters[metrics.RATE_LIMIT_REJECTED] == 1
+
+
+def test_expensive_endpoints_share_budget(client: Client) -> None:
+    """Ensures that hints and day results spend the same iterations."""
+    seed = str(uuid.uuid4())
+    hints = client.post(
+        "/api/game/getHints",
+        {"seed": seed, "iterations": list(range(6))},
+        content_type="application/json",
+    )
+    day_finish = client.post(
+        "/api/game/acknowledgeDayFinish",
+        {
+            "seed": seed,
+            "answers": [
+                {"iteration": iteration, "recommended_product_ids": []}
+                for iteration in range(6)
+            ],
+        },
+        content_type="application/json",
+    )
+
+    assert hints.status_code == HTTPStatus.OK
+    assert day_finish.status_code == HTTPStatus.TOO_MANY_REQUESTS
+
+
+@pytest.mark.parametrize("prefix", ["/api/game", "/api/game/async"])
+def test_cacheable_routes_cost_one(client: Client, prefix: str) -> None:
+    """Ensures that each cacheable GET spends one iteration of the client."""
+    seed = uuid.uuid4()
+    admitted = _chunk(client, prefix, 8)
+    situation = client.get(f"{prefix}/situation/{seed}/0")
+    hint = client.get(f"{prefix}/hint/{seed}/0")
+    rejected = client.get(f"{prefix}/situation/{seed}/1")
+
+    assert admitted.status_code == HTTPStatus.OK
+    assert situation.status_code == HTTPStatus.OK
+    assert hint.status_code == HTTPStatus.OK
+    assert rejected.status_code == HTTPStatus.TOO_MANY_REQUESTS
+    assert metrics.get_counters()[metrics.RATE_LIMIT_ADMITTED_COST] == 10
+
+
+def test_clients_are_separate(client: Client) -> None:
+    """Ensures that addresses get buckets of their own, tokens do not."""
+    responses = [
+        _chunk(client, "/api/game", 10, REMOTE_ADDR="10.0.0.1"),
+        _chunk(client, "/api/game", 10, REMOTE_ADDR="10.0.0.2"),
+        _chunk(
+            client,
+            "/api/game",
+            1,
+            REMOTE_ADDR="10.0.0.1",
+            HTTP_AUTHORIZATION="Bearer unverified",
+        ),
+    ]
+
+    assert [response.status_code for response in responses] == [
+        HTTPStatus.OK,
+        HTTPStatus.OK,
+        HTTPStatus.TOO_MANY_REQUESTS,
+    ]
+
+
+def test_clients_behind_proxy(
+    client: Client,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """Ensures that the address appended by the proxy identifies clients."""
+    monkeypatch.setattr(ninja_settings, "NUM_PROXIES", 1)
+    proxy = {"REMOTE_ADDR": "172.18.0.2"}
+
+    first = _chunk(
+        client,
+        "/api/game",
+        10,
+        HTTP_X_FORWARDED_FOR="10.0.0.1",
+        **proxy,
+    )
+    second = _chunk(
+        client,
+        "/api/game",
+        10,
+        HTTP_X_FORWARDED_FOR="10.0.0.1, 10.0.0.2",
+        **proxy,
+    )
+    spoofed = _chunk(
+        client,
+        "/api/game",
+        1,
+        HTTP_X_FORWARDED_FOR="10.0.0.3, 10.0.0.2",
+        **proxy,
+    )
+
+    assert first.status_code == HTTPStatus.OK
+    assert second.status_code == HTTPStatus.OK
+    assert spoofed.status_code == HTTPStatus.TOO_MANY_REQUESTS
+
+
+@pytest.mark.usefixtures("redis_server")
+@pytest.mark.parametrize("prefix", ["/api/game", "/api/game/async"])
+def test_redis_buckets(
+    client: Client,
+    settings: LazySettings,
+    prefix: str,
+) -> None:
+    """Ensures that the Lua script charges both buckets or neither."""
+    settings.GAME_RATE_LIMIT_SEED_RATE = 0.01
+    settings.GAME_RATE_LIMIT_SEED_BURST = 12
+    seed = uuid.uuid4()
+
+    admitted = _chunk(client, prefix, 8, seed, REMOTE_ADDR="10.0.0.1")
+    rejected = _chunk(client, prefix, 8, seed, REMOTE_ADDR="10.0.0.1")
+    # The seed is short, the second client is not charged:
+    seed_spent = _chunk(client, prefix, 6, seed, REMOTE_ADDR="10.0.0.2")
+    other_seed = _chunk(client, prefix, 10, REMOTE_ADDR="10.0.0.2")
+    cheaper = _chunk(client, prefix, 2, seed, REMOTE_ADDR="10.0.0.1")
+
+    assert admitted.status_code == HTTPStatus.OK
+    assert rejected.status_code == HTTPStatus.TOO_MANY_REQUESTS
+    assert rejected["Retry-After"] == "600"
+    assert seed_spent.status_code == HTTPStatus.TOO_MANY_REQUESTS
+    assert other_seed.status_code == HTTPStatus.OK
+    assert cheaper.status_code == HTTPStatus.OK
+    assert metrics.get_counters()[metrics.RATE_LIMIT_ADMITTED_COST] == 20
+
+
+def test_seed_is_limited_across_clients(
+    client: Client,
+    settings: LazySettings,
+) -> None:
+    """Ensures that many clients cannot exhaust one seed together."""
+    settings.GAME_RATE_LIMIT_CLIENT_RATE = 0
+    settings.GAME_RATE_LIMIT_SEED_RATE = 1
+    settings.GAME_RATE_LIMIT_SEED_BURST = 10
+    seed = uuid.uuid4()
+
+    first = _chunk(client, "/api/game", 10, seed, REMOTE_ADDR="10.0.0.1")
+    second = _chunk(client, "/api/game", 5, seed, REMOTE_ADDR="10.0.0.2")
+    other_seed = _chunk(client, "/api/game", 10, REMOTE_ADDR="10.0.0.2")
+
+    assert first.status_code == HTTPStatus.OK
+    assert second.status_code == HTTPStatus.TOO_MANY_REQUESTS
+    assert int(second["Retry-After"]) == 5
+    assert other_seed.status_code == HTTPStatus.OK
+
+
+def test_disabled_limits_admit_everything(
+    client: Client,
+    settings: LazySettings,
+) -> None:
+    """Ensures that requests are not counted when both limits are off."""
+    settings.GAME_RATE_LIMIT_CLIENT_RATE = 0
+
+    responses = [_chunk(client, "/api/game", 10) for _ in range(3)]
+
+    assert all(response.status_code == HTTPStatus.OK for response in responses)
+    assert metrics.get_counters()[metrics.RATE_LIMIT_ADMITTED_COST] == 0
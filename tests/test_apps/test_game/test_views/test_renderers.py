@@ -0,0 +1,101 @@
+import io
+import json
+import uuid
+from http import HTTPStatus
+
+import msgpack
+import pytest
+from django.core.management import call_command
+from django.test import Client
+from ninja.renderers import JSONRenderer
+
+from server.apps.game.renderers import (
+    MSGPACK_MEDIA_TYPE,
+    NegotiatingRenderer,
+    ORJSONRenderer,
+)
+from server.apps.game.services.dto import GenerateChunkSituation, Situation
+from server.apps.game.services.generation import generate_chunk_iterations
+
+
+@pytest.mark.usefixtures("game_catalog")
+def test_chunk_matches_stock_renderer() -> None:
+    """Ensures that the orjson renderer returns what the stock one does."""
+    chunk = [
+        Situation.from_generation_model(generation_instance).model_dump()
+        for generation_instance in generate_chunk_iterations(
+            GenerateChunkSituation(seed=uuid.uuid4(), total_iterations=3),
+        )
+    ]
+
+    rendered = ORJSONRenderer().render(
+        None,  # type: ignore[arg-type]
+        chunk,
+        response_status=HTTPStatus.OK,
+    )
+
+    stock = JSONRenderer().render(
+        None,  # type: ignore[arg-type]
+        chunk,
+        response_status=HTTPStatus.OK,
+    )
+    # Without a request there is nothing to negotiate:
+    negotiated = NegotiatingRenderer().render(
+        None,  # type: ignore[arg-type]
+        chunk,
+        response_status=HTTPStatus.OK,
+    )
+    assert json.loads(rendered) == json.loads(stock)
+    assert negotiated == rendered
+
+
+def test_malformed_body(client: Client) -> None:
+    """Ensures that a malformed body is still rejected with 400."""
+    response = client.post(
+        "/api/game/getHint",
+        b"{",
+        content_type="application/json",
+    )
+
+    assert response.status_code == HTTPStatus.BAD_REQUEST
+
+
+@pytest.mark.usefixtures("game_catalog")
+@pytest.mark.parametrize("route", ["generateSituation", "getHint"])
+def test_msgpack_negotiation(client: Client, route: str) -> None:
+    """Ensures that msgpack is used for bodies and responses when asked."""
+    payload = {"seed": str(uuid.uuid4()), "num_iterations": 0}
+
+    response = client.post(
+        f"/api/game/{route}",
+        msgpack.packb(payload),
+        content_type=MSGPACK_MEDIA_TYPE,
+        headers={"Accept": MSGPACK_MEDIA_TYPE},
+    )
+    json_response = client.post(
+        f"/api/game/{route}",
+        payload,
+        content_type="application/json",
+    )
+
+    assert response.status_code == HTTPStatus.OK
+    assert response["Content-Type"] == MSGPACK_MEDIA_TYPE
+    assert "Accept" in response["Vary"]
+    assert json_response["Content-Type"].startswith("application/json")
+    situation = msgpack.unpackb(response.content)
+    expected = json_response.json()
+    for data in (situation, expected):
+        data.get("answers", []).sort(key=lambda answer: answer["product"]["id"])
+    assert situation == expected
+
+
+@pytest.mark.usefixtures("game_catalog")
+def test_bench_renderers() -> None:
+    """Ensures that the benchmark reports every flavour and size."""
+    stdout = io.StringIO()
+
+    call_command("bench_renderers", sizes=[1, 2], repeat=1, stdout=stdout)
+
+    lines = stdout.getvalue().splitlines()
+    assert len(lines) == 6
+    assert lines[0].split()[:2] == ["stock", "situations=1"]
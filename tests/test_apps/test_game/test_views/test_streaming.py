@@ -0,0 +1,92 @@
+import uuid
+from collections.abc import AsyncIterator
+from http import HTTPStatus
+from typing import Any
+
+import orjson
+import pytest
+from asgiref.sync import async_to_sync
+from django.conf import LazySettings
+from django.test import AsyncClient, Client
+
+pytestmark = pytest.mark.usefixtures("game_catalog")
+
+
+def _lines(content: bytes) -> list[Any]:
+    return [orjson.loads(line) for line in content.splitlines()]
+
+
+async def _read(stream: AsyncIterator[bytes]) -> bytes:
+    return b"".join([chunk async for chunk in stream])
+
+
+def test_stream_matches_situations(client: Client) -> None:
+    """Ensures that every streamed line is the situation of its iteration."""
+    payload = {"seed": str(uuid.uuid4()), "total_iterations": 3}
+
+    response = client.post(
+        "/api/game/streamChunkSituations",
+        payload,
+        content_type="application/json",
+    )
+
+    assert response.status_code == HTTPStatus.OK
+    assert response.streaming
+    assert response["Content-Type"] == "application/x-ndjson"
+    assert _lines(b"".join(response.streaming_content)) == [
+        client.post(
+            "/api/game/generateSituation",
+            {"seed": payload["seed"], "num_iterations": iteration},
+            content_type="application/json",
+        ).json()
+        for iteration in range(payload["total_iterations"])
+    ]
+
+
+def test_async_stream_matches_sync(
+    client: Client,
+    async_client: AsyncClient,
+) -> None:
+    """Ensures that the async stream returns the same lines as the sync one."""
+    payload = {"seed": str(uuid.uuid4()), "total_iterations": 3}
+
+    async_response = async_to_sync(async_client.post)(
+        "/api/game/async/streamChunkSituations",
+        payload,
+        content_type="application/json",
+    )
+    sync_response = client.post(
+        "/api/game/streamChunkSituations",
+        payload,
+        content_type="application/json",
+    )
+
+    assert async_response.is_async
+    assert _lines(
+        async_to_sync(_read)(async_response.streaming_content),
+    ) == _lines(b"".join(sync_response.streaming_content))
+
+
+@pytest.mark.parametrize("prefix", ["/api/game", "/api/game/async"])
+def test_stream_day_sessions(
+    client: Client,
+    settings: LazySettings,
+    prefix: str,
+) -> None:
+    """Ensures that the day is streamed as the situations of the chunk."""
+    settings.GAME_DAY_SESSIONS = True
+    payload = {"seed": str(uuid.uuid4()), "total_iterations": 3}
+
+    response = client.post(
+        f"{prefix}/streamChunkSituations",
+        payload,
+        content_type="application/json",
+    )
+    chunk = client.post(
+        f"{prefix}/generateChunkSituations",
+        payload,
+        content_type="application/json",
+    )
+
+    assert response.status_code == HTTPStatus.OK
+    assert _lines(b"".join(response.streaming_content)) == chunk.json()
@@ -0,0 +1,204 @@
+import uuid
+from typing import Any
+
+import pytest
+from django.conf import LazySettings
+from django.test import Client
+from pytest_django import DjangoAssertNumQueries
+
+from server.apps.game.models import (
+    DaySessionModel,
+    GenerationModel,
+    ProductModel,
+)
+from server.apps.game.services import answer_cache, write_behind
+from server.apps.game.services.dto import GenerateSituationParams
+
+pytestmark = pytest.mark.usefixtures("game_catalog")
+
+
+def _post(client: Client, url: str, payload: dict[str, Any]) -> Any:
+    response = client.post(url, payload, content_type="application/json")
+    assert response.status_code == 200
+    return response.json()
+
+
+@pytest.mark.parametrize("prefix", ["/api/game", "/api/game/async"])
+@pytest.mark.parametrize("use_day_sessions", [False, True])
+def test_validate_answer(
+    client: Client,
+    settings: LazySettings,
+    prefix: str,
+    use_day_sessions: bool,  # noqa: FBT001
+) -> None:
+    """Ensures that every answer of a situation is validated as generated."""
+    settings.GAME_DAY_SESSIONS = use_day_sessions
+    generation_params = {"seed": str(uuid.uuid4()), "num_iterations": 3}
+    situation = _post(client, f"{prefix}/generateSituation", generation_params)
+
+    validated = {
+        answer["product"]["id"]: _post(
+            client,
+            f"{prefix}/validateAnswer",
+            {
+                "generation_params": generation_params,
+                "recommended_product_id": answer["product"]["id"],
+            },
+        )["is_success"]
+        for answer in situation["answers"]
+    }
+
+    assert validated == {
+        answer["product"]["id"]: answer["is_correct"]
+        for answer in situation["answers"]
+    }
+
+
+def test_warm_answer_skips_database(
+    client: Client,
+    django_assert_num_queries: DjangoAssertNumQueries,
+) -> None:
+    """Ensures that a cached iteration is validated without queries."""
+    generation_params = {"seed": str(uuid.uuid4()), "num_iterations": 0}
+    _post(client, "/api/game/generateSituation", generation_params)
+    payload = {
+        "generation_params": generation_params,
+        "recommended_product_id": 0,
+    }
+    _post(client, "/api/game/validateAnswer", payload)
+
+    with django_assert_num_queries(0):
+        response = _post(client, "/api/game/validateAnswer", payload)
+
+    assert response == {"is_success": False}
+
+
+@pytest.mark.parametrize("prefix", ["/api/game", "/api/game/async"])
+@pytest.mark.parametrize("use_day_sessions", [False, True])
+def test_unserved_iteration_is_not_generated(
+    client: Client,
+    settings: LazySettings,
+    game_catalog: list[ProductModel],
+    prefix: str,
+    use_day_sessions: bool,  # noqa: FBT001
+) -> None:
+    """Ensures that validating an unknown iteration writes nothing."""
+    settings.GAME_DAY_SESSIONS = use_day_sessions
+    generation_params = {"seed": str(uuid.uuid4()), "num_iterations": 0}
+
+    responses = [
+        _post(
+            client,
+            f"{prefix}/validateAnswer",
+            {
+                "generation_params": generation_params,
+                "recommended_product_id": product.id,
+            },
+        )
+        for product in game_catalog
+    ]
+
+    assert not any(response["is_success"] for response in responses)
+    assert not GenerationModel.objects.exists()
+    assert not DaySessionModel.objects.exists()
+    # The miss is not remembered, the served iteration is validated:
+    situation = _post(client, f"{prefix}/generateSituation", generation_params)
+    correct = next(
+        answer for answer in situation["answers"] if answer["is_correct"]
+    )
+    assert _post(
+        client,
+        f"{prefix}/validateAnswer",
+        {
+            "generation_params": generation_params,
+            "recommended_product_id": correct["product"]["id"],
+        },
+    ) == {"is_success": True}
+
+
+def test_pending_iteration_is_validated(
+    client: Client,
+    settings: LazySettings,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """Ensures that an iteration still queued for writing is validated."""
+    settings.GAME_WRITE_BEHIND = True
+    write_behind.close_generation_writer()
+    writer = write_behind.get_generation_writer()
+    # Nothing writes the queue until `close`:
+    monkeypatch.setattr(writer, "_ensure_started", lambda: None)
+    generation_params = {"seed": str(uuid.uuid4()), "num_iterations": 0}
+    situation = _post(client, "/api/game/generateSituation", generation_params)
+
+    validated = {
+        answer["product"]["id"]: _post(
+            client,
+            "/api/game/validateAnswer",
+            {
+                "generation_params": generation_params,
+                "recommended_product_id": answer["product"]["id"],
+            },
+        )["is_success"]
+        for answer in situation["answers"]
+    }
+    unserved = _post(
+        client,
+        "/api/game/validateAnswer",
+        {
+            "generation_params": {**generation_params, "num_iterations": 1},
+            "recommended_product_id": 0,
+        },
+    )
+    write_behind.close_generation_writer()
+
+    assert validated == {
+        answer["product"]["id"]: answer["is_correct"]
+        for answer in situation["answers"]
+    }
+    assert unserved == {"is_success": False}
+
+
+def test_unpacked_answers_are_validated(client: Client) -> None:
+    """Ensures that generations without packed ids use answer rows."""
+    generation_params = {"seed": str(uuid.uuid4()), "num_iterations": 0}
+    situation = _post(client, "/api/game/generateSituation", generation_params)
+    GenerationModel.objects.update(correct_product_ids=None)
+    correct = next(
+        answer for answer in situation["answers"] if answer["is_correct"]
+    )
+
+    response = _post(
+        client,
+        "/api/game/validateAnswer",
+        {
+            "generation_params": generation_params,
+            "recommended_product_id": correct["product"]["id"],
+        },
+    )
+
+    assert response == {"is_success": True}
+
+
+def test_answer_cache_is_bounded(
+    client: Client,
+    settings: LazySettings,
+) -> None:
+    """Ensures that the least recently validated iteration is forgotten."""
+    settings.GAME_ANSWER_CACHE_SIZE = 1
+    seed = uuid.uuid4()
+    for iteration in range(2):
+        generation_params = {"seed": str(seed), "num_iterations": iteration}
+        _post(client, "/api/game/generateSituation", generation_params)
+        _post(
+            client,
+            "/api/game/validateAnswer",
+            {
+                "generation_params": generation_params,
+                "recommended_product_id": 0,
+            },
+        )
+
+    forgotten = GenerateSituationParams(seed=seed, num_iterations=0)
+    remembered = GenerateSituationParams(seed=seed, num_iterations=1)
+    assert answer_cache.get_cached(forgotten) is None
+    assert answer_cache.get_cached(remembered) is not None
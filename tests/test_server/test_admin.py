@@ -8,11 +8,18 @@ from django.db.models import Model
 from django.test import Client
 from django.urls import reverse
 
+from server.apps.game.models import (
+    ProductAnswerStatsModel,
+    SituationAnswerStatsModel,
+)
+
 # Models that should have restricted (FORBIDDEN) admin add pages
 _RESTRICTED_ADMIN_ADD_MODELS = frozenset((
     AccessAttempt,
     AccessLog,
     AccessFailureLog,
+    ProductAnswerStatsModel,
+    SituationAnswerStatsModel,
 ))
 
 # Creates a list of tuples containing all registered admin sites,
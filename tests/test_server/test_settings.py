@@ -0,0 +1,71 @@
+import runpy
+from pathlib import Path
+from typing import Any, Final
+
+import pytest
+
+_SETTINGS: Final = Path(__file__).parents[2] / "server" / "settings"
+
+
+def _component(name: str) -> dict[str, Any]:
+    return runpy.run_path(str(_SETTINGS / "components" / f"{name}.py"))
+
+
+def _environment(name: str) -> dict[str, Any]:
+    return runpy.run_path(str(_SETTINGS / "environments" / f"{name}.py"))
+
+
+def test_pgbouncer_database(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Ensures that PgBouncer mode drops what transaction pooling breaks."""
+    monkeypatch.setenv("DJANGO_DATABASE_PGBOUNCER", "1")
+
+    database = _component("common")["DATABASES"]["default"]
+
+    assert database["DISABLE_SERVER_SIDE_CURSORS"]
+    assert "options" not in database["OPTIONS"]
+    assert "pool" not in database["OPTIONS"]
+
+
+def test_database_without_pool(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Ensures that the pool can be turned off for persistent connections."""
+    monkeypatch.setenv("DJANGO_DATABASE_POOL", "0")
+
+    database = _component("common")["DATABASES"]["default"]
+
+    assert "pool" not in database["OPTIONS"]
+    assert database["CONN_MAX_AGE"]
+
+
+def test_replica_hosts(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Ensures that every replica host gets an alias mirroring the primary."""
+    monkeypatch.setenv("DJANGO_DATABASE_REPLICA_HOSTS", "db-1:6432,db-2")
+
+    settings = _component("common")
+
+    assert settings["DATABASE_REPLICAS"] == ("replica_0", "replica_1")
+    databases = settings["DATABASES"]
+    assert databases["replica_0"]["HOST"] == "db-1"
+    assert databases["replica_0"]["PORT"] == 6432
+    assert databases["replica_1"]["PORT"] == databases["default"]["PORT"]
+    assert databases["replica_1"]["TEST"] == {"MIRROR": "default"}
+
+
+def test_redis_cache(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Ensures that a redis URL makes the cache shared by all workers."""
+    monkeypatch.setenv("DJANGO_REDIS_URL", "redis://redis:6379/0")
+
+    cache = _component("caches")["CACHES"]["default"]
+
+    assert cache["BACKEND"] == "django.core.cache.backends.redis.RedisCache"
+    assert cache["LOCATION"] == "redis://redis:6379/0"
+
+
+def test_production_requires_redis(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Ensures that production counters and limits are shared in redis."""
+    monkeypatch.setenv("DOMAIN_NAME", "example.com")
+    monkeypatch.setenv("DJANGO_REDIS_URL", "redis://redis:6379/0")
+
+    cache = _environment("production")["CACHES"]["default"]
+
+    assert cache["BACKEND"] == "django.core.cache.backends.redis.RedisCache"
+    assert cache["LOCATION"] == "redis://redis:6379/0"